@@ -6,10 +6,13 @@ __version__ = "0.5.3"
 __date__ = "2026-03-07"
 
 from .address import EURID, BaseAddress, BroadcastAddress, SenderAddress
-from .device import Device
+from .device import Device, DeviceHandle, DeviceRegistration
+from .dispatch import PacketTypeStats
 from .eep.id import EEP
 from .eep.profile import DeviceDescriptor
 from .gateway import Gateway
+from .link import LinkStats
+from .reconnect import ConnectionStats, ReconnectPolicy
 from .semantics.entity_type import EntityType
 from .semantics.instructable import Instructable
 from .semantics.instruction import Instruction
@@ -27,30 +30,67 @@ from .semantics.instructions.switch import (
 )
 from .semantics.observable import Observable
 from .semantics.observation import Observation, ObservationCallback, ObservationSource
+from .semantics.observers.filter import EmitFilter
 from .semantics.value_kind import ValueKind
+from .sender import SenderIdAllocator
+from .state import EntityState, StateStore
+from .timing import Clock, SystemClock, VirtualClock
+from .transmit import (
+    BulkSendResult,
+    LatencyHistogram,
+    LatencyTracker,
+    RetryPolicy,
+    SendOutcome,
+    SendPriority,
+    SendQueueStats,
+    SendResult,
+)
 
 __all__ = [
     # Gateway
     "Gateway",
+    "ConnectionStats",
+    "LinkStats",
+    "PacketTypeStats",
+    "ReconnectPolicy",
+    # Time
+    "Clock",
+    "SystemClock",
+    "VirtualClock",
     # Addresses
     "BaseAddress",
     "BroadcastAddress",
     "EURID",
     "SenderAddress",
+    "SenderIdAllocator",
     # Device
     "Device",
     "DeviceDescriptor",
+    "DeviceHandle",
+    "DeviceRegistration",
     "EEP",
     # Receive side
+    "EmitFilter",
     "EntityType",
     "Observable",
     "Observation",
     "ObservationCallback",
     "ObservationSource",
     "ValueKind",
+    # State
+    "EntityState",
+    "StateStore",
     # Send side
     "Instructable",
     "Instruction",
+    "BulkSendResult",
+    "LatencyHistogram",
+    "LatencyTracker",
+    "RetryPolicy",
+    "SendOutcome",
+    "SendPriority",
+    "SendQueueStats",
+    "SendResult",
     "Dim",
     "QueryActuatorMeasurement",
     "QueryActuatorStatus",
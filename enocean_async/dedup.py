@@ -0,0 +1,91 @@
+"""Suppression of duplicate telegrams (copies delivered by repeaters or received more than once)."""
+
+from collections import OrderedDict
+import time
+from typing import Callable
+
+from .address import EURID, BaseAddress
+from .protocol.erp1.telegram import ERP1Telegram
+
+_REPEATER_COUNT_MASK = 0x0F
+
+
+class _Entry:
+    __slots__ = ("key", "received", "best_rssi")
+
+    def __init__(self, key: tuple, received: float, rssi: int | None) -> None:
+        self.key = key
+        self.received = received
+        self.best_rssi = rssi
+
+
+class DuplicateFilter:
+    """Recognises copies of the last telegram of every sender that arrive within a short window.
+
+    A telegram can reach the gateway several times, e.g. directly and once per repeater level. The copies only
+    differ in the repeater count of the status byte, so a telegram is a duplicate if it equals the last telegram
+    of its sender in RORG, payload and status (ignoring the repeater count) and arrives less than window seconds
+    after it. Only the last telegram per sender is compared, so a message that is genuinely sent again (e.g. a
+    button pressed twice, with a release in between) is not dropped. Senders not heard within the window are
+    forgotten.
+
+    The first copy is processed right away; the best (lowest) RSSI of all copies is kept with the entry, and
+    on_stronger_copy is called with every dropped copy that was received with a better RSSI than the copies before.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        on_stronger_copy: Callable[[ERP1Telegram], None] | None = None,
+    ) -> None:
+        self.window = window
+        """Time in seconds within which a copy of a telegram is considered a duplicate."""
+
+        self.on_stronger_copy = on_stronger_copy
+
+        self._clock = clock
+        # last telegram per sender heard within the window, oldest first
+        self._entries: OrderedDict[EURID | BaseAddress, _Entry] = OrderedDict()
+
+        self.received: int = 0
+        """Number of telegrams checked."""
+
+        self.dropped: int = 0
+        """Number of telegrams recognised as duplicates."""
+
+    def is_duplicate(self, erp1: ERP1Telegram) -> bool:
+        """Return True if the telegram is a copy of one received shortly before; otherwise remember it and return False."""
+        now = self._clock()
+        self.received += 1
+        self.__evict(now)
+        key = (erp1.rorg, erp1.telegram_data, erp1.status & ~_REPEATER_COUNT_MASK)
+        entry = self._entries.get(erp1.sender)
+        if entry is not None and entry.key == key:
+            self.dropped += 1
+            if erp1.rssi is not None and (
+                entry.best_rssi is None or erp1.rssi < entry.best_rssi
+            ):
+                entry.best_rssi = erp1.rssi
+                if self.on_stronger_copy is not None:
+                    self.on_stronger_copy(erp1)
+            return True
+
+        self._entries[erp1.sender] = _Entry(key, now, erp1.rssi)
+        self._entries.move_to_end(erp1.sender)
+        return False
+
+    def best_rssi(self, sender: EURID | BaseAddress) -> int | None:
+        """Return the best RSSI of all copies of the sender's last telegram within the window (as positive value, e.g. 0x55 for -85 dBm)."""
+        entry = self._entries.get(sender)
+        if entry is None or self._clock() - entry.received >= self.window:
+            return None
+        return entry.best_rssi
+
+    def __evict(self, now: float) -> None:
+        """Forget the senders whose last telegram is older than the window."""
+        while self._entries:
+            sender, entry = next(iter(self._entries.items()))
+            if now - entry.received < self.window:
+                return
+            del self._entries[sender]
@@ -1,11 +1,19 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Mapping, NamedTuple, Sequence
 
 from .address import EURID, BaseAddress, SenderAddress
+from .eep.handler import EEPHandler
 from .eep.id import EEP
+from .eep.profile import InstructionEncoder
+from .protocol.esp3.packet import ESP3Packet
+from .semantics.instructable import Instructable
+from .semantics.instruction import Instruction
 from .semantics.observers.observer import Observer
+from .transmit.result import SendResult
+from .transmit.scheduler import CoalesceKey, SendPriority, default_priority
 
 
-@dataclass
+@dataclass(slots=True)
 class Device:
     """Representation of an EnOcean device."""
 
@@ -14,4 +22,136 @@ class Device:
     name: str
     sender: SenderAddress | None = None
     telegrams_received: int = 0
-    capabilities: list[Observer] = field(default_factory=list)
+    capabilities: Sequence[Observer] = ()
+    """The observers decoding this device's messages; shared with all other devices of the same EEP (do not modify)."""
+    observers_created: bool = False
+    """False until the device's observers have been created (devices registered in bulk get them on their first telegram)."""
+
+
+class DeviceRegistration(NamedTuple):
+    """A device to register via Gateway.add_devices()."""
+
+    address: EURID | BaseAddress
+    eep: EEP
+    sender: SenderAddress | None = None
+    name: str | None = None
+
+
+class ResolvedDevice(NamedTuple):
+    """Everything needed to encode commands for a device, as resolved by the gateway."""
+
+    eep: EEP
+    handler: EEPHandler
+    encoders: Mapping[Instructable, InstructionEncoder]
+    sender: SenderAddress
+
+
+type DeviceResolver = Callable[[EURID | BaseAddress], Awaitable[ResolvedDevice]]
+type PacketSender = Callable[
+    [ESP3Packet, SendPriority, CoalesceKey | None, bool], Awaitable[SendResult]
+]
+
+
+class DeviceHandle:
+    """Pre-resolved send path to one registered device, for latency-sensitive callers.
+
+    Obtained via Gateway.device_handle(). The device's EEP handler, instruction encoders and sender address are
+    resolved once, and encoded frames are cached per instruction value, so that repeating a command (e.g. switching
+    a light on from a push button) goes straight from the cache to the send queue. Any change to the device registry
+    (adding or removing devices, changing the base ID) invalidates the handle; the next send() resolves the device
+    again, or raises ValueError if it is no longer registered.
+    """
+
+    MAX_CACHED_FRAMES = 16
+    """Number of encoded frames kept per handle (oldest are dropped first)."""
+
+    __slots__ = (
+        "address",
+        "__resolve",
+        "__send",
+        "__registry_generation",
+        "__generation",
+        "__device",
+        "__frames",
+    )
+
+    def __init__(
+        self,
+        address: EURID | BaseAddress,
+        resolve: DeviceResolver,
+        send: PacketSender,
+        registry_generation: Callable[[], int],
+    ) -> None:
+        self.address = address
+        self.__resolve = resolve
+        self.__send = send
+        self.__registry_generation = registry_generation
+        self.__generation: int | None = None
+        self.__device: ResolvedDevice | None = None
+        self.__frames: dict[Hashable, ESP3Packet] = {}
+
+    @property
+    def valid(self) -> bool:
+        """False if the registry changed since the handle was last resolved."""
+        return self.__generation == self.__registry_generation()
+
+    @property
+    def eep(self) -> EEP | None:
+        """The device's EEP (None until resolved)."""
+        return self.__device.eep if self.__device is not None else None
+
+    @property
+    def sender(self) -> SenderAddress | None:
+        """The sender address used for commands (None until resolved)."""
+        return self.__device.sender if self.__device is not None else None
+
+    async def resolve(self) -> None:
+        """Resolve the device from the registry (done automatically by send() when the handle is invalid).
+
+        Raises:
+            ValueError: If the device is not registered or its EEP is not supported.
+        """
+        generation = self.__registry_generation()
+        self.__device = await self.__resolve(self.address)
+        self.__frames.clear()
+        self.__generation = generation
+
+    async def send(
+        self, command: Instruction, priority: SendPriority | None = None
+    ) -> SendResult:
+        """Send a typed command to the device; equivalent to Gateway.send_command() with the device's default sender.
+
+        Raises:
+            ValueError: If the device is no longer registered, or the command is not supported by its EEP.
+        """
+        if self.__generation != self.__registry_generation():
+            await self.resolve()
+        device = self.__device
+
+        try:
+            key = (type(command), *vars(command).values())
+            packet = self.__frames.get(key)
+        except TypeError:  # unhashable field value: encode without caching
+            key, packet = None, None
+
+        if packet is None:
+            encoder = device.encoders.get(command.action)
+            if encoder is None:
+                raise ValueError(
+                    f"Command '{command.action}' is not supported for EEP {device.eep}"
+                )
+            message = encoder(command)
+            message.sender = device.sender
+            message.destination = self.address
+            packet = device.handler.encode(message).to_esp3()
+            if key is not None:
+                if len(self.__frames) >= self.MAX_CACHED_FRAMES:
+                    del self.__frames[next(iter(self.__frames))]
+                self.__frames[key] = packet
+
+        return await self.__send(
+            packet,
+            priority if priority is not None else default_priority(command),
+            (self.address, command.entity_id, command.action),
+            command.idempotent,
+        )
@@ -0,0 +1,104 @@
+"""Dispatch of received ESP3 packets to handlers by packet type."""
+
+from dataclasses import dataclass
+import logging
+from typing import Callable
+
+from .protocol.esp3.packet import ESP3Packet, ESP3PacketType
+
+type PacketHandler = Callable[[ESP3Packet], None]
+
+
+@dataclass
+class PacketTypeStats:
+    """Statistics of the received packets of one packet type."""
+
+    received: int = 0
+    """Number of packets received."""
+
+    handled: int = 0
+    """Number of packets processed by the registered handler without error."""
+
+    failed: int = 0
+    """Number of packets whose handler raised an exception (e.g. because the packet was malformed)."""
+
+    ignored: int = 0
+    """Number of packets received while no handler was registered for their type."""
+
+
+class _Route:
+    __slots__ = ("handler", "stats")
+
+    def __init__(self) -> None:
+        self.handler: PacketHandler | None = None
+        self.stats = PacketTypeStats()
+
+
+class PacketDispatcher:
+    """Routes received ESP3 packets to one handler per packet type and counts them per type.
+
+    Dispatching costs one dict lookup per packet. Handlers can be registered, replaced and removed at runtime,
+    e.g. for vendor-specific or experimental processing. A handler signals that it could not process a packet by
+    raising an exception; the exception is logged and the packet counted as failed.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None) -> None:
+        self.__routes: dict[ESP3PacketType, _Route] = {
+            packet_type: _Route() for packet_type in ESP3PacketType
+        }
+        self._logger = logger or logging.getLogger(__name__)
+
+    def register(
+        self,
+        packet_type: ESP3PacketType,
+        handler: PacketHandler,
+        replace: bool = False,
+    ) -> None:
+        """Register the handler for received packets of the given type.
+
+        Raises:
+            ValueError: If a handler is already registered for the packet type and replace is False.
+        """
+        route = self.__routes[packet_type]
+        if route.handler is not None and not replace:
+            raise ValueError(
+                f"A handler for {packet_type.name} packets is already registered; pass replace=True to replace it"
+            )
+        route.handler = handler
+
+    def unregister(self, packet_type: ESP3PacketType) -> PacketHandler | None:
+        """Remove the handler for the given packet type (packets of this type are ignored afterwards); returns the removed handler."""
+        route = self.__routes[packet_type]
+        handler, route.handler = route.handler, None
+        return handler
+
+    def handler(self, packet_type: ESP3PacketType) -> PacketHandler | None:
+        """Return the handler registered for the given packet type, or None."""
+        return self.__routes[packet_type].handler
+
+    def dispatch(self, packet: ESP3Packet) -> None:
+        """Pass a received packet to the handler of its type."""
+        route = self.__routes[packet.packet_type]
+        stats = route.stats
+        stats.received += 1
+        handler = route.handler
+        if handler is None:
+            stats.ignored += 1
+            return
+        try:
+            handler(packet)
+        except Exception as e:
+            stats.failed += 1
+            self._logger.debug(
+                f"Failed to process {packet.packet_type.name} packet {packet}: {e!r}"
+            )
+        else:
+            stats.handled += 1
+
+    def stats(self) -> dict[ESP3PacketType, PacketTypeStats]:
+        """Return a copy of the statistics of all packet types received so far."""
+        return {
+            packet_type: PacketTypeStats(**vars(route.stats))
+            for packet_type, route in self.__routes.items()
+            if route.stats.received
+        }
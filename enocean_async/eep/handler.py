@@ -20,6 +20,7 @@ class EEPHandler:
             rssi=telegram.rssi,
             values={},
             entities={},
+            received=telegram.received,
         )
 
         if telegram.destination is not None and not telegram.destination.is_broadcast():
@@ -3,6 +3,7 @@ from typing import Any, Dict, NamedTuple
 
 from ..address import EURID, Address, BaseAddress, BroadcastAddress
 from ..eep.id import EEP
+from ..protocol.esp3.packet import ReceiveTime
 from ..semantics.observable import Observable
 
 
@@ -76,6 +77,9 @@ class EEPMessage:
     Values are EntityValue tuples containing (value, unit).
     """
 
+    received: ReceiveTime | None = field(default=None, compare=False)
+    """Time at which the telegram of the message was received (None for messages created locally)."""
+
     def __repr__(self) -> str:
         msg = f"EEPMessage(sender={self.sender.to_string()}, eep={self.eep}, message_type={self.message_type if self.message_type else 'default'}"
         if self.destination is not None and not self.destination.is_broadcast():
@@ -1,19 +1,31 @@
 import asyncio
 from dataclasses import dataclass
 import logging
+import os
 import time
-from typing import Callable, Optional
+from typing import Callable, Iterable, Sequence
 
 import serial_asyncio_fast as serial_asyncio
 
 from .address import EURID, BaseAddress, SenderAddress
-from .device import Device
+from .dedup import DuplicateFilter
+from .device import Device, DeviceHandle, DeviceRegistration, ResolvedDevice
+from .dispatch import PacketDispatcher, PacketHandler, PacketTypeStats
 from .eep import EEP_SPECIFICATIONS
 from .eep.handler import EEPHandler
 from .eep.id import EEP
 from .eep.manufacturer import Manufacturer
 from .eep.message import EEPMessage
 from .eep.profile import DeviceDescriptor
+from .link import ESP3_FRAME_OVERHEAD, LinkMonitor, LinkStats
+from .module_info import ModuleInfo, read_module_info, write_module_info
+from .persistence import (
+    ObserverStates,
+    SnapshotFormatError,
+    read_snapshot,
+    write_snapshot,
+)
+from .protocol.erp1.chaining import ChainReassembler
 from .protocol.erp1.telegram import RORG, ERP1Telegram, FourBSTeachInTelegram
 from .protocol.erp1.ute import (
     EEPTeachInResponseMessageExpectation,
@@ -21,22 +33,57 @@ from .protocol.erp1.ute import (
     UTEQueryRequestType,
     UTEResponseType,
 )
-from .protocol.esp3.common_command import CommonCommandTelegram
+from .protocol.erp2.telegram import erp2_from_erp1, parse_erp2
+from .protocol.esp3.common_command import (
+    BAUDRATES,
+    CommonCommandCode,
+    CommonCommandTelegram,
+    FilterOperator,
+    FilterType,
+    RadioMode,
+    parse_filters,
+)
+from .protocol.esp3.event import EventCode, EventTelegram
 from .protocol.esp3.packet import ESP3Packet, ESP3PacketType
 from .protocol.esp3.protocol import EnOceanSerialProtocol3
 from .protocol.esp3.response import ResponseCode, ResponseTelegram
 from .protocol.version import VersionIdentifier, VersionInfo
+from .reconnect import ConnectionStats, ReconnectPolicy
 from .semantics.instruction import Instruction
+from .semantics.observable import Observable
 from .semantics.observation import Observation, ObservationCallback
+from .semantics.observers.filter import EmitFilter
 from .semantics.observers.metadata import MetaDataObserver
+from .semantics.observers.observer import Observer
+from .semantics.observers.pipeline import ObserverPipeline
+from .semantics.observers.scalar import ScalarObserver
+from .sender import BASE_ID_RANGE, SenderIdAllocator
+from .state import StateStore
+from .timing.clock import Clock, SystemClock, VirtualClock
+from .timing.latency import ReceiveLatencyTracker, ReceiveStage
+from .timing.wheel import TimingWheel
+from .transmit.duty_cycle import RADIO_PACKET_TYPES, DutyCycleLimiter
+from .transmit.latency import SPEC_TIMEOUT, LatencyTracker
+from .transmit.result import BulkSendResult, SendOutcome, SendResult
+from .transmit.retry import RetryPolicy
+from .transmit.scheduler import (
+    CoalesceKey,
+    SendPriority,
+    SendQueueStats,
+    SendScheduler,
+    default_priority,
+)
 
 type RSSI = int
 
+FILTER_SYNC_DELAY = 0.2
+"""Seconds to wait after a registry change before updating the module's filters (to batch bursts of changes)."""
 
-@dataclass
-class SendResult:
-    response: Optional[ResponseTelegram]
-    duration_ms: Optional[float]
+TRANSMIT_EVENT_TIMEOUT = 0.2
+"""Seconds to wait for CO_TX_DONE / CO_TRANSMIT_FAILED after the module confirmed a radio packet."""
+
+MAX_MISSED_TRANSMIT_EVENTS = 3
+"""Consecutive radio packets without transmit event after which the gateway stops waiting for them."""
 
 
 # callback types
@@ -45,6 +92,7 @@ type ERP1Callback = Callable[[ERP1Telegram], None]
 type EEPMessageCallback = Callable[[EEPMessage], None]
 type UTECallback = Callable[[UTEMessage], None]
 type ResponseCallback = Callable[[ResponseTelegram], None]
+type EventCallback = Callable[[EventTelegram], None]
 type NewDeviceCallback = Callable[[SenderAddress], None]
 type ParsingFailedCallback = Callable[[str], None]
 type TeachInCallback = Callable[[FourBSTeachInTelegram], None]
@@ -73,26 +121,133 @@ class BaseIDChangeError(Exception):
 class Gateway:
     """EnOcean gateway that connects to a serial port and processes incoming ESP3 packets."""
 
-    def __init__(self, port: str, baudrate: int = 57600):
-        """Create an instance of an EnOcean gateway that connects to the supplied port at supplied baudrate (optional) and processes incoming ESP3 packets."""
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 57600,
+        state_store: StateStore | None = None,
+        state_file: str | None = None,
+        state_save_interval: float | None = 300.0,
+        duty_cycle: float | None = 0.01,
+        retry_policy: RetryPolicy | None = RetryPolicy(),
+        adaptive_timeout: bool = True,
+        module_info_file: str | None = None,
+        reconnect_policy: ReconnectPolicy = ReconnectPolicy(),
+        offline_buffer: int = 0,
+        offline_ttl: float = 30.0,
+        module_filter: bool = False,
+        filter_capacity: int = 30,
+        max_baudrate: int | None = None,
+        duplicate_window: float | None = 0.5,
+        erp2: bool = False,
+        clock: Clock = SystemClock(),
+    ):
+        """Create an instance of an EnOcean gateway that connects to the supplied port at supplied baudrate (optional) and processes incoming ESP3 packets.
+
+        If a state_store is supplied, the gateway keeps it updated with every emitted Observation, so that the last known state of all entities can be queried at any time.
+
+        If a state_file is supplied, the last known entity state and observer internals are restored from it on start(), saved to it on stop(), and additionally saved every state_save_interval seconds (None disables periodic saving). A StateStore is created automatically if none was supplied.
+
+        Radio transmissions are paced to stay within the given duty_cycle (1% in the 868 MHz band) over a sliding one-hour window, so that the module does not lock transmissions; pass None to disable pacing.
+
+        Packets failing with a transient error (no free buffer, duty-cycle lock, response timeout) are retried according to retry_policy; pass None to disable retries.
+
+        With adaptive_timeout, the time to wait for a response is derived from the observed response latency of each packet type (see LatencyTracker) instead of always waiting the 500 ms allowed by the specification. A timeout is thus reported early, but the next packet is only written once the late response arrived or the 500 ms are over, so that responses are never attributed to the wrong packet.
+
+        On start(), the module's version info and base ID are read in one handshake. If a module_info_file is supplied, the results are cached there (per port), so that a restart can use them immediately while the handshake revalidates them in the background.
+
+        When the connection is lost, reconnect attempts follow the reconnect_policy (exponential backoff by default). While a reconnect is pending, up to offline_buffer packets sent are queued instead of failing immediately, and sent in order after reconnecting unless they are older than offline_ttl seconds by then (0 disables buffering); if auto-reconnect is disabled or gives up, they fail with SendOutcome.NOT_CONNECTED.
+
+        With module_filter, the module's telegram filter list is kept in sync with the registered devices (see sync_module_filters()), so that telegrams from other senders are dropped by the module instead of being transferred and parsed. filter_capacity is the number of filters the module can hold (30 for TCM 310 based modules).
+
+        With max_baudrate, the serial link is switched on start() to the fastest rate up to max_baudrate that the module accepts (see negotiate_baudrate()); baudrate is the module's default rate it starts with.
+
+        Copies of a telegram that arrive within duplicate_window seconds (e.g. via repeaters) are dropped before any processing (see DuplicateFilter); pass None to process every copy.
+
+        The clock provides the time for observation timestamps, observer timers, duplicate suppression, chained messages and reconnect attempts. With a VirtualClock, recorded traffic can be replayed faster than real time: feed the packets with process_esp3_packet() and advance the clock in between.
+
+        With erp2, the module is switched to ERP2 (advanced) mode on start() and after every module reset (see set_radio_mode()). Received RADIO_ERP2 packets are parsed into ERP1Telegrams, and radio telegrams are still built as ERP1 and only converted to ERP2 when they are written to the module.
+        """
 
         # serial connection, transport and protocol parameters
         self.__port: str = port
         self.__baudrate: int = baudrate
         self.__transport: serial_asyncio.SerialTransport | None = None
         self.__protocol: EnOceanSerialProtocol3 | None = None
+        self.__max_baudrate: int | None = max_baudrate
+        self.__link: LinkMonitor = LinkMonitor(baudrate)
 
         # cached information about the connected module (to avoid unnecessary requests for information that doesn't change)
         self.__version_info: VersionInfo | None = None
         self.__base_id_remaining_write_cycles: int | None = None
         self.__base_id: BaseAddress | None = None
+        self.__sender_numbers: tuple[int, int] | None = None
+        self.__sender_allocator: SenderIdAllocator | None = None
+        self.__module_info_file: str | None = module_info_file
+        self.__handshake_task: asyncio.Task | None = None
+
+        # module-side telegram filtering
+        self.__module_filter: bool = module_filter
+        self.__filter_capacity: int = filter_capacity
+        self.__module_filters: set[int] | None = None  # None: module's list unknown
+        self.__module_filter_enabled: bool | None = None  # None: unknown
+        self.__filter_lock: asyncio.Lock = asyncio.Lock()
+        self.__filter_sync_task: asyncio.Task | None = None
+
+        # time source of the receive path (real, or virtual for replays)
+        self.__clock: Clock = clock
+        self.__receive_latency: ReceiveLatencyTracker = ReceiveLatencyTracker(
+            clock.monotonic
+        )
+
+        # suppression of telegram copies
+        self.__duplicates: DuplicateFilter | None = (
+            DuplicateFilter(duplicate_window, clock.monotonic, self.__on_stronger_copy)
+            if duplicate_window is not None
+            else None
+        )
+
+        # radio protocol mode (ERP1 or ERP2) of the module
+        self.__erp2: bool = erp2
+        self.__radio_mode: RadioMode = RadioMode.COMPATIBLE
+        self.__radio_mode_task: asyncio.Task | None = None
+
+        # reassembly of chained messages (CDM telegrams)
+        self.__chains: ChainReassembler = ChainReassembler(clock=clock.monotonic)
 
         # device and EEP management
         self.__known_device_eeps: dict[EURID | BaseAddress, EEP] = {}
         self.__detected_devices: list[EURID | BaseAddress] = []
         self.__eep_handlers: dict[EEP, EEPHandler] = {}
         self.__devices: dict[EURID | BaseAddress, Device] = {}
+        # bumped on every registry change; invalidates DeviceHandles
+        self.__registry_generation: int = 0
+
+        # observers are shared by all devices of an EEP (flyweights keeping per-device state in compact tables)
+        self.__metadata_observer = MetaDataObserver(None, self.__on_observation)
+        self.__metadata_observer.clock = clock
+        # one timing wheel drives the timers of all observers (button hold/release timeouts, cover watchdogs)
+        self.__timers: TimingWheel = TimingWheel(clock=clock.monotonic)
+        if isinstance(clock, VirtualClock):
+            clock.drive(self.__timers)
+        self.__eep_pipelines: dict[EEP, ObserverPipeline] = {}
         self.__observation_callbacks: list[ObservationCallback] = []
+        self.__state_store: StateStore | None = state_store
+
+        # state persistence
+        self.__state_file: str | None = state_file
+        self.__state_save_interval: float | None = state_save_interval
+        self.__state_save_task: asyncio.Task | None = None
+        self.__state_restored: bool = False
+        self.__pending_observer_states: ObserverStates = {}
+        if state_file is not None and state_store is None:
+            self.__state_store = StateStore()
+
+        # emission filters for scalar observers, per EEP and per device (device filters take precedence)
+        self.__eep_emit_filters: dict[EEP, dict[Observable, EmitFilter]] = {}
+        self.__device_emit_filters: dict[
+            EURID | BaseAddress, dict[Observable, EmitFilter]
+        ] = {}
 
         # callbacks
         self.__esp3_receive_callbacks: list[ESP3Callback] = []
@@ -101,14 +256,39 @@ class Gateway:
         self.__eep_receive_callbacks: list[EEPCallbackWithFilter] = []
         self.__parsing_failed_callbacks: list[ParsingFailedCallback] = []
         self.__response_callbacks: list[ResponseCallback] = []
+        self.__event_callbacks: list[EventCallback] = []
 
         self.__new_device_callbacks: list[NewDeviceCallback] = []
 
         self.__esp3_send_callbacks: list[ESP3Callback] = []
 
         # send handling
-        self.__send_lock: asyncio.Lock = asyncio.Lock()
         self.__send_future: asyncio.Future | None = None
+        # after a shortened response timeout, the module may still answer until the deadline (perf_counter)
+        self.__late_response: asyncio.Future | None = None
+        self.__late_response_deadline: float = 0.0
+        self.__duty_cycle: DutyCycleLimiter | None = (
+            DutyCycleLimiter(duty_cycle) if duty_cycle is not None else None
+        )
+        self.__latency: LatencyTracker = LatencyTracker()
+        self.__adaptive_timeout: bool = adaptive_timeout
+        # transmit events are only awaited once the module was seen to send them
+        self.__transmit_events: bool = False
+        self.__transmit_future: asyncio.Future | None = None
+        self.__missed_transmit_events: int = 0
+        self.__send_scheduler: SendScheduler = SendScheduler(
+            self.__transmit,
+            self.__airtime_delay if self.__duty_cycle is not None else None,
+            retry_policy,
+        )
+
+        # handling of EVENT packets, per event code
+        self.__event_handlers: dict[EventCode, Callable[[EventTelegram], None]] = {
+            EventCode.CO_READY: self.__on_module_ready,
+            EventCode.CO_TX_DONE: self.__on_transmit_event,
+            EventCode.CO_TRANSMIT_FAILED: self.__on_transmit_event,
+            EventCode.CO_DUTYCYCLE_LIMIT: self.__on_duty_cycle_limit,
+        }
 
         # learning
         self.__is_learning: bool = False
@@ -119,9 +299,33 @@ class Gateway:
         # logging
         self._logger = logging.getLogger(__name__)
 
+        # handling of received packets, per packet type
+        self.__dispatcher: PacketDispatcher = PacketDispatcher(self._logger)
+        self.__dispatcher.register(
+            ESP3PacketType.RESPONSE, self.__process_response_packet
+        )
+        self.__dispatcher.register(ESP3PacketType.EVENT, self.__process_event)
+        self.__dispatcher.register(
+            ESP3PacketType.RADIO_ERP1, self.__process_erp1_packet
+        )
+        self.__dispatcher.register(
+            ESP3PacketType.RADIO_SUB_TEL, self.__process_erp1_packet
+        )
+        self.__dispatcher.register(
+            ESP3PacketType.RADIO_MESSAGE, self.__process_erp1_packet
+        )
+        self.__dispatcher.register(
+            ESP3PacketType.RADIO_ERP2, self.__process_erp2_packet
+        )
+
         # auto-reconnect
         self.__reconnect_task: asyncio.Task | None = None
         self.__stopped: bool = False
+        self.__reconnect_policy: ReconnectPolicy = reconnect_policy
+        self.__offline_buffer: int = offline_buffer
+        self.__offline_ttl: float = offline_ttl
+        self.__outage_start: float | None = None
+        self.__connection_stats: ConnectionStats = ConnectionStats()
 
         self.auto_reconnect: bool = True
         """If True (default), automatically attempt to reconnect when the connection is lost. Set to False to disable reconnection entirely."""
@@ -174,6 +378,10 @@ class Gateway:
     def add_response_callback(self, cb: ResponseCallback):
         self.__response_callbacks.append(cb)
 
+    def add_event_callback(self, cb: EventCallback):
+        """Add a callback that will be called for every EVENT packet received from the EnOcean module (e.g. CO_READY after a module reset)."""
+        self.__event_callbacks.append(cb)
+
     def add_observation_callback(self, cb: ObservationCallback) -> None:
         """Add a callback that is called for every Observation emitted by a device observer."""
         self.__observation_callbacks.append(cb)
@@ -191,6 +399,17 @@ class Gateway:
         self.__stopped = False
         self.auto_reconnect = auto_reconnect
         loop = asyncio.get_running_loop()
+        cached = (
+            read_module_info(self.__module_info_file, self.__port)
+            if self.__module_info_file is not None
+            else None
+        )
+        # the module keeps a negotiated baud rate until it is power-cycled
+        baudrate = self.__link.baudrate
+        if self.__max_baudrate is None:
+            baudrate = self.__baudrate
+        elif cached is not None and cached.baudrate is not None:
+            baudrate = cached.baudrate
         try:
             (
                 self.__transport,
@@ -199,12 +418,57 @@ class Gateway:
                 loop,
                 lambda: EnOceanSerialProtocol3(self),
                 self.__port,
-                baudrate=self.__baudrate,
+                baudrate=baudrate,
             )
+            self.__link.baudrate = baudrate
 
             self._logger.info(
-                f"Successfully connected to EnOcean module on {self.__port} at baudrate {self.__baudrate}"
+                f"Successfully connected to EnOcean module on {self.__port} at baudrate {baudrate}"
             )
+            if self.__outage_start is not None:
+                duration = self.__clock.monotonic() - self.__outage_start
+                self.__outage_start = None
+                self.__connection_stats.last_outage_duration = duration
+                self.__connection_stats.total_outage_duration += duration
+                self._logger.info(
+                    f"Connection outage lasted {duration:.1f} s; sending {self.__send_scheduler.depth} queued packets"
+                )
+            self.__send_scheduler.resume()
+            # the module may have been replaced while disconnected
+            self.__version_info = None
+            self.__reset_module_info()
+            if baudrate != self.__baudrate:
+                # the module may have been power-cycled and be back at its default rate
+                if not await self.__handshake():
+                    self._logger.info(
+                        f"EnOcean module does not answer at {baudrate} baud; falling back to {self.__baudrate} baud"
+                    )
+                    self.__set_link_baudrate(self.__baudrate)
+                    await self.__handshake()
+            elif cached is not None:
+                self.__apply_module_info(cached)
+                self.__handshake_task = asyncio.create_task(self.__handshake())
+            else:
+                await self.__handshake()
+            if (
+                self.__max_baudrate is not None
+                and self.__link.baudrate < self.__max_baudrate
+            ):
+                await self.negotiate_baudrate(self.__max_baudrate)
+            self.__radio_mode = RadioMode.COMPATIBLE
+            if self.__erp2:
+                await self.set_radio_mode(RadioMode.ADVANCED)
+            self.__module_filters = None
+            self.__module_filter_enabled = None
+            self.__schedule_filter_sync()
+
+            if self.__state_file is not None:
+                if not self.__state_restored:
+                    self.restore_state()
+                if self.__state_save_interval and self.__state_save_task is None:
+                    self.__state_save_task = asyncio.create_task(
+                        self.__save_state_periodically(self.__state_save_interval)
+                    )
         except Exception as e:
             self._logger.error(
                 f"Failed to connect to EnOcean module on {self.__port} at baudrate {self.__baudrate}: {e}"
@@ -216,9 +480,25 @@ class Gateway:
     def stop(self) -> None:
         """Close the serial connection to the EnOcean module."""
         self.__stopped = True
+        if self.__handshake_task is not None:
+            self.__handshake_task.cancel()
+            self.__handshake_task = None
+        if self.__filter_sync_task is not None:
+            self.__filter_sync_task.cancel()
+            self.__filter_sync_task = None
+        if self.__radio_mode_task is not None:
+            self.__radio_mode_task.cancel()
+            self.__radio_mode_task = None
         if self.__reconnect_task is not None:
             self.__reconnect_task.cancel()
             self.__reconnect_task = None
+        if self.__state_save_task is not None:
+            self.__state_save_task.cancel()
+            self.__state_save_task = None
+        self.__timers.close()
+        self.__send_scheduler.close()
+        if self.__state_file is not None:
+            self.save_state()
         if self.__transport is not None:
             self.__transport.close()
             self.__transport = None
@@ -226,22 +506,159 @@ class Gateway:
                 f"Serial connection to EnOcean module on {self.__port} closed"
             )
 
+    async def __handshake(self) -> bool:
+        """Read version info and base ID from the module, queued back to back, and update the module info cache.
+
+        Failures are logged only (and False is returned); the information is then fetched lazily on first use.
+        """
+        futures = self.__send_scheduler.submit_batch(
+            [
+                CommonCommandTelegram.CO_RD_VERSION().to_esp3_packet(),
+                CommonCommandTelegram.CO_RD_IDBASE().to_esp3_packet(),
+            ]
+        )
+        try:
+            version_result, base_id_result = await asyncio.gather(*futures)
+        except ConnectionError:
+            return False
+        finally:
+            # start() also awaits the handshake directly, while a background handshake may be running
+            if self.__handshake_task is asyncio.current_task():
+                self.__handshake_task = None
+
+        version_info = self.__parse_version_info(version_result.response)
+        base_id = self.__parse_base_id(base_id_result.response)
+        if version_info is None or base_id is None:
+            self._logger.warning(
+                "EnOcean module did not answer the start-up handshake; module information will be read on first use"
+            )
+            return False
+
+        info = ModuleInfo(
+            version_info,
+            base_id[0],
+            base_id[1],
+        )
+        if (
+            self.__version_info is not None
+            and self.__base_id is not None
+            and (
+                self.__version_info.eurid != info.eurid
+                or self.__base_id != info.base_id
+            )
+        ):
+            self._logger.info(
+                f"EnOcean module changed since last start (now EURID {info.eurid}, base ID {info.base_id}); cached module information replaced"
+            )
+            self.__reset_module_info()
+        self.__apply_module_info(info)
+        self._logger.info(
+            f"EnOcean module {info.eurid}: base ID {info.base_id}, firmware {version_info.app_version.version_string} ({version_info.app_description})"
+        )
+        self.__save_module_info()
+        return True
+
+    def __apply_module_info(self, info: ModuleInfo) -> None:
+        self.__version_info = info.version
+        self.__base_id = info.base_id
+        self.__base_id_remaining_write_cycles = info.base_id_remaining_write_cycles
+
+    def __save_module_info(self) -> None:
+        if (
+            self.__module_info_file is None
+            or self.__version_info is None
+            or self.__base_id is None
+        ):
+            return
+        try:
+            write_module_info(
+                self.__module_info_file,
+                self.__port,
+                ModuleInfo(
+                    self.__version_info,
+                    self.__base_id,
+                    self.__base_id_remaining_write_cycles,
+                    self.__link.baudrate
+                    if self.__link.baudrate != self.__baudrate
+                    else None,
+                ),
+            )
+        except OSError as e:
+            self._logger.warning(
+                f"Failed to write module info file {self.__module_info_file}: {e}"
+            )
+
     @property
     async def valid_senders(self) -> list[SenderAddress]:
         """Return the list of valid sender addresses for this gateway, which includes the gateway's EURID and the range of Base IDs derived from the gateway's base ID."""
-        base_id = await self.base_id
-        senders = [await self.eurid, base_id]
-
-        base_id_number = base_id.to_number()
-        for i in range(1, 128):
-            senders.append(BaseAddress(base_id_number + i))
-
+        eurid, base = await self.__sender_range()
+        senders: list[SenderAddress] = [EURID(eurid)] if eurid is not None else []
+        if base is not None:
+            senders.extend(BaseAddress(base + i) for i in range(BASE_ID_RANGE))
         return senders
 
     async def is_valid_sender(self, sender: SenderAddress) -> bool:
         """Check if the sender address is a valid sender for this gateway (i.e. is either the gateway's EURID, or a BaseAddress in the range of the gateway's base ID)."""
-        valid_senders = await self.valid_senders
-        return sender in valid_senders
+        eurid, base = await self.__sender_range()
+        number = sender.to_number()
+        if isinstance(sender, EURID):
+            return number == eurid
+        return base is not None and base <= number < base + BASE_ID_RANGE
+
+    async def __sender_range(self) -> tuple[int | None, int | None]:
+        """Return the module's chip ID and base ID as numbers; cached until the base ID changes or the gateway reconnects."""
+        if self.__sender_numbers is None:
+            eurid = await self.eurid
+            base_id = await self.base_id
+            numbers = (
+                eurid.to_number() if eurid is not None else None,
+                base_id.to_number() if base_id is not None else None,
+            )
+            if None in numbers:
+                return numbers  # not connected; do not cache
+            self.__sender_numbers = numbers
+        return self.__sender_numbers
+
+    @property
+    async def sender_allocator(self) -> SenderIdAllocator:
+        """The allocator of sender IDs in the module's base ID range (e.g. to give every actuator its own sender ID).
+
+        Senders of registered devices that lie in the range are marked as used. The allocator is replaced when the base ID changes or the gateway reconnects.
+
+        Raises:
+            ConnectionError: If the base ID cannot be read from the module.
+        """
+        if self.__sender_allocator is None:
+            base_id = await self.base_id
+            if base_id is None:
+                raise ConnectionError("Could not read base ID from EnOcean module")
+            allocator = SenderIdAllocator(base_id)
+            for address, device in self.__devices.items():
+                if device.sender is not None:
+                    self.__claim_sender(allocator, address, device.sender)
+            self.__sender_allocator = allocator
+        return self.__sender_allocator
+
+    def __claim_sender(
+        self,
+        allocator: SenderIdAllocator,
+        address: EURID | BaseAddress,
+        sender: SenderAddress,
+    ) -> None:
+        if allocator.offset(sender) is None:
+            return
+        try:
+            allocator.claim(address, sender)
+        except ValueError as e:
+            self._logger.warning(f"Sender of device {address}: {e}")
+
+    def __reset_module_info(self) -> None:
+        """Forget cached module information (after a base ID change or reconnect)."""
+        self.__base_id = None
+        self.__base_id_remaining_write_cycles = None
+        self.__sender_numbers = None
+        self.__sender_allocator = None
+        self.__registry_generation += 1  # handles may have resolved the old base ID
 
     async def start_learning(
         self,
@@ -274,6 +691,9 @@ class Gateway:
         self.__sender_id_for_learning = (
             sender_id if sender_id is not None else await self.base_id
         )
+        if self.__module_filter:
+            # teach-in telegrams come from unregistered senders
+            await self.sync_module_filters()
 
         self._logger.info(
             f"Learning mode started. Will automatically stop after {timeout_seconds} seconds."
@@ -291,6 +711,7 @@ class Gateway:
         if self.__learning_timeout_task is not None:
             self.__learning_timeout_task.cancel()
             self.__learning_timeout_task = None
+        self.__schedule_filter_sync()
 
     async def __learning_timeout(self, timeout_seconds: int):
         try:
@@ -300,57 +721,509 @@ class Gateway:
         except asyncio.CancelledError:
             pass
 
+    # ------------------------------------------------------------------
+    # module-side telegram filtering
+    # ------------------------------------------------------------------
+    async def sync_module_filters(self) -> bool:
+        """Bring the module's filter list in line with the registered devices, so that the module only passes telegrams sent by them.
+
+        Only the difference to the filters set before is transferred. Filtering is switched off instead (all telegrams are passed, as without filters) while learning mode is active, when no device or more devices than filter_capacity are registered, and when the module rejects a filter. Called automatically after connecting and whenever devices are added or removed if the gateway was created with module_filter=True.
+
+        Returns:
+            True if the module filters telegrams afterwards, False otherwise.
+
+        Raises:
+            ConnectionError: If not connected to the EnOcean module.
+        """
+        async with self.__filter_lock:
+            if self.__transport is None:
+                raise ConnectionError("Not connected to EnOcean module")
+
+            desired = {address.to_number() for address in self.__known_device_eeps}
+            if self.__is_learning or not desired:
+                await self.__disable_module_filters(clear=False)
+                return False
+            if len(desired) > self.__filter_capacity:
+                if self.__module_filter_enabled is not False:
+                    self._logger.warning(
+                        f"{len(desired)} devices registered, but the EnOcean module only holds {self.__filter_capacity} filters; module-side filtering disabled"
+                    )
+                await self.__disable_module_filters(clear=True)
+                return False
+
+            telegrams: list[CommonCommandTelegram] = []
+            if self.__module_filters is None:
+                # the module may hold filters of an earlier session
+                telegrams.append(CommonCommandTelegram.CO_WR_FILTER_DEL_ALL())
+                current: set[int] = set()
+            else:
+                current = self.__module_filters
+            removed = sorted(current - desired)
+            added = sorted(desired - current)
+            telegrams.extend(
+                CommonCommandTelegram.CO_WR_FILTER_DEL(FilterType.SOURCE_ID, number)
+                for number in removed
+            )
+            telegrams.extend(
+                CommonCommandTelegram.CO_WR_FILTER_ADD(FilterType.SOURCE_ID, number)
+                for number in added
+            )
+            if self.__module_filter_enabled is not True:
+                telegrams.append(
+                    CommonCommandTelegram.CO_WR_FILTER_ENABLE(True, FilterOperator.OR)
+                )
+
+            codes = await self.__send_filter_commands(telegrams)
+            if any(code == ResponseCode.NOT_SUPPORTED for code in codes):
+                self._logger.warning(
+                    "EnOcean module does not support telegram filters; module-side filtering disabled"
+                )
+                self.__module_filter = False
+                self.__module_filter_enabled = False
+                return False
+            if any(code != ResponseCode.OK for code in codes):
+                self._logger.warning(
+                    f"EnOcean module rejected a filter command ({[c.name if c is not None else 'no response' for c in codes]}); module-side filtering disabled"
+                )
+                self.__module_filters = None
+                await self.__disable_module_filters(clear=True)
+                return False
+
+            self.__module_filters = desired
+            self.__module_filter_enabled = True
+            if removed or added:
+                self._logger.debug(
+                    f"Module filters updated: {len(added)} added, {len(removed)} removed, {len(desired)} active"
+                )
+            return True
+
+    async def __disable_module_filters(self, clear: bool) -> None:
+        """Switch module-side filtering off; with clear, also delete all filters from the module."""
+        telegrams: list[CommonCommandTelegram] = []
+        if self.__module_filter_enabled is not False:
+            telegrams.append(CommonCommandTelegram.CO_WR_FILTER_ENABLE(False))
+        if clear and self.__module_filters != set():
+            telegrams.append(CommonCommandTelegram.CO_WR_FILTER_DEL_ALL())
+        if not telegrams:
+            return
+        codes = await self.__send_filter_commands(telegrams)
+        if codes[0] == ResponseCode.OK:
+            self.__module_filter_enabled = False
+        if clear:
+            self.__module_filters = set() if codes[-1] == ResponseCode.OK else None
+
+    async def __send_filter_commands(
+        self, telegrams: list[CommonCommandTelegram]
+    ) -> list[ResponseCode | None]:
+        """Send filter commands back to back and return the return code of each (None if unanswered)."""
+        futures = self.__send_scheduler.submit_batch(
+            [telegram.to_esp3_packet() for telegram in telegrams]
+        )
+        results = await asyncio.gather(*futures)
+        return [
+            result.response.return_code if result.response is not None else None
+            for result in results
+        ]
+
+    def __schedule_filter_sync(self) -> None:
+        """Sync the module's filters shortly, so that a burst of registry changes results in one update."""
+        if (
+            not self.__module_filter
+            or self.__transport is None
+            or self.__filter_sync_task is not None
+        ):
+            return
+        self.__filter_sync_task = asyncio.create_task(self.__sync_module_filters_soon())
+
+    async def __sync_module_filters_soon(self) -> None:
+        try:
+            await asyncio.sleep(FILTER_SYNC_DELAY)
+            self.__filter_sync_task = None
+            await self.sync_module_filters()
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def module_filter_active(self) -> bool:
+        """Whether the module currently drops telegrams of unregistered senders."""
+        return self.__module_filter_enabled is True
+
+    async def read_module_filters(self) -> list[tuple[FilterType, int]] | None:
+        """Read the filter list of the connected module as (filter type, value) pairs; None if the module did not answer.
+
+        Raises:
+            ConnectionError: If not connected to the EnOcean module.
+        """
+        if self.__transport is None:
+            raise ConnectionError("Not connected to EnOcean module")
+        result = await self.send_esp3_packet(
+            CommonCommandTelegram.CO_RD_FILTER().to_esp3_packet()
+        )
+        if result.response is None or result.response.return_code != ResponseCode.OK:
+            return None
+        return parse_filters(result.response.response_data)
+
     # ------------------------------------------------------------------
     # sending commands and receiving responses
     # ------------------------------------------------------------------
-    async def send_esp3_packet(self, packet: ESP3Packet) -> SendResult:
-        """Send an ESP3 packet to the EnOcean module and wait up to 500ms for a response (as per ESP3 specification).
+    async def send_esp3_packet(
+        self,
+        packet: ESP3Packet,
+        priority: SendPriority = SendPriority.COMMAND,
+        coalesce_key: CoalesceKey | None = None,
+        idempotent: bool = True,
+    ) -> SendResult:
+        """Send an ESP3 packet to the EnOcean module and wait up to 500ms (as per ESP3 specification; less with the adaptive response timeout) for a response.
 
-        This method is thread-safe and can be called from multiple coroutines concurrently; the send operations will be serialized using an internal lock, and each call will wait for its corresponding response before allowing the next send operation to proceed. The method returns a SendResult object containing the received response (if any) and the duration in milliseconds between sending the request and receiving the response.
+        This method can be called from multiple coroutines concurrently; packets are queued and sent one at a time, highest priority first, and each send waits for its corresponding response before the next packet is sent. If a coalesce_key is given, a still-queued packet with the same key is replaced by this one, unless either is not idempotent (see SendScheduler). Transient errors are retried according to the gateway's retry policy; after a response timeout, only idempotent packets are retried. The method returns a SendResult object containing the received response (if any), the duration in milliseconds between sending the request and receiving the response, the number of attempts and the final outcome.
         """
 
         if not self.__transport:
+            if self.__send_scheduler.paused:
+                return await self.__send_buffered(
+                    packet, priority, coalesce_key, idempotent
+                )
             self._logger.error(
                 "Cannot send: gateway is not connected to an EnOcean module."
             )
-            return SendResult(None, None)
+            return SendResult(None, None, outcome=SendOutcome.NOT_CONNECTED)
 
-        async with self.__send_lock:
-            self.__send_future = asyncio.get_running_loop().create_future()
+        return await self.__send_scheduler.submit(
+            packet, priority, coalesce_key, idempotent
+        )
 
-            try:
-                # emit to the send callbacks; we do this before sending the packet (WHY?)
-                self.__emit(self.__esp3_send_callbacks, packet)
+    async def __send_buffered(
+        self,
+        packet: ESP3Packet,
+        priority: SendPriority,
+        coalesce_key: CoalesceKey | None,
+        idempotent: bool,
+    ) -> SendResult:
+        """Queue a packet while the connection is down, to be sent after reconnecting (within the offline TTL)."""
+        stats = self.__connection_stats
+        if self.__send_scheduler.depth >= self.__offline_buffer:
+            stats.dropped_overflow += 1
+            self._logger.warning(
+                f"Cannot send: gateway is not connected and the offline buffer is full ({self.__offline_buffer} packets); dropping {packet}"
+            )
+            return SendResult(None, None, outcome=SendOutcome.NOT_CONNECTED)
+
+        stats.buffered += 1
+        result = await self.__send_scheduler.submit(
+            packet, priority, coalesce_key, idempotent, ttl=self.__offline_ttl
+        )
+        if result.outcome == SendOutcome.EXPIRED:
+            stats.dropped_expired += 1
+        elif result.outcome != SendOutcome.NOT_CONNECTED:
+            stats.flushed += 1
+        return result
+
+    def send_queue_stats(self) -> dict[SendPriority, SendQueueStats]:
+        """Return queue depth, coalescing and wait time statistics per send priority class."""
+        return self.__send_scheduler.stats()
+
+    @property
+    def receive_latency(self) -> ReceiveLatencyTracker:
+        """Latency statistics of received telegrams per processing stage (see ReceiveLatencyTracker.histograms()), measured from the time the packet was read off the serial port."""
+        return self.__receive_latency
+
+    @property
+    def response_latency(self) -> LatencyTracker:
+        """Response latency statistics per packet type (see LatencyTracker.histograms()), from which the adaptive response timeout is derived."""
+        return self.__latency
+
+    @property
+    def clock(self) -> Clock:
+        """The clock of the receive path (observation timestamps, observer timers, duplicate and chain time windows)."""
+        return self.__clock
+
+    @property
+    def timers(self) -> TimingWheel:
+        """The timing wheel driving the timers of all observers (button hold and release timeouts, cover watchdogs)."""
+        return self.__timers
+
+    @property
+    def chain_reassembler(self) -> ChainReassembler:
+        """The reassembler of chained messages, with its limits and statistics."""
+        return self.__chains
+
+    @property
+    def duplicate_filter(self) -> DuplicateFilter | None:
+        """The filter dropping copies of received telegrams (with its statistics), or None if disabled."""
+        return self.__duplicates
+
+    @property
+    def duty_cycle(self) -> DutyCycleLimiter | None:
+        """The airtime budget used to pace radio transmissions, or None if pacing is disabled."""
+        return self.__duty_cycle
+
+    async def negotiate_baudrate(self, max_baudrate: int = BAUDRATES[-1]) -> int:
+        """Switch the serial link to the fastest baud rate up to max_baudrate that the module accepts, and return the rate in use afterwards.
+
+        Faster rates are tried first. Once the module has acknowledged a change, the port is switched to the new rate and the link is verified by reading the module's version info; if that fails, the previous rate is restored. The rate is stored in the module info file (if any), so that the next start() opens the port at that rate right away.
+
+        Raises:
+            ConnectionError: If not connected to the EnOcean module.
+        """
+        if self.__transport is None:
+            raise ConnectionError("Not connected to EnOcean module")
+
+        previous = self.__link.baudrate
+        for baudrate in sorted(
+            (b for b in BAUDRATES if previous < b <= max_baudrate), reverse=True
+        ):
+            result = await self.send_esp3_packet(
+                CommonCommandTelegram.CO_SET_BAUDRATE(baudrate).to_esp3_packet(),
+                idempotent=False,
+            )
+            if self.__link.baudrate != baudrate:
                 self._logger.debug(
-                    f"Sending ESP3 packet: {packet}. Waiting for response..."
+                    f"EnOcean module did not accept {baudrate} baud ({result.outcome.name})"
+                )
+                continue
+            if await self.__verify_link():
+                self._logger.info(
+                    f"Serial link to EnOcean module switched from {previous} to {baudrate} baud"
                 )
+                self.__save_module_info()
+                return baudrate
+
+            self._logger.warning(
+                f"EnOcean module does not answer at {baudrate} baud; switching back to {previous} baud"
+            )
+            await self.send_esp3_packet(
+                CommonCommandTelegram.CO_SET_BAUDRATE(previous).to_esp3_packet(),
+                idempotent=False,
+            )
+            self.__set_link_baudrate(previous)
+            if not await self.__verify_link():
+                self._logger.error(
+                    f"EnOcean module does not answer at {previous} baud after a failed baud rate change"
+                )
+                break
+        return self.__link.baudrate
+
+    @property
+    def radio_mode(self) -> RadioMode:
+        """The radio protocol mode the module was last switched to (COMPATIBLE = ERP1 until set_radio_mode() succeeded)."""
+        return self.__radio_mode
+
+    async def set_radio_mode(self, mode: RadioMode) -> bool:
+        """Switch the module between ERP1 (compatible) and ERP2 (advanced) mode; return whether the module accepted the change.
+
+        In ERP2 mode, the module reports received telegrams as RADIO_ERP2 packets, and RADIO_ERP1 packets are converted to RADIO_ERP2 before they are written to the module (unless their RORG has no ERP2 telegram type). The mode is not persistent: the module is back in ERP1 mode after a reset.
+
+        Raises:
+            ConnectionError: If not connected to the EnOcean module.
+        """
+        if self.__transport is None:
+            raise ConnectionError("Not connected to EnOcean module")
+        result = await self.send_esp3_packet(
+            CommonCommandTelegram.CO_WR_MODE(mode).to_esp3_packet()
+        )
+        if result.response is None or result.response.return_code != ResponseCode.OK:
+            self._logger.warning(
+                f"EnOcean module did not accept radio mode {mode.name} ({result.outcome.name})"
+            )
+            return False
+        self.__radio_mode = mode
+        self._logger.info(f"EnOcean module switched to radio mode {mode.name}")
+        return True
+
+    async def __restore_radio_mode(self) -> None:
+        try:
+            await self.set_radio_mode(RadioMode.ADVANCED)
+        except ConnectionError:
+            pass
+        finally:
+            self.__radio_mode_task = None
+
+    async def __verify_link(self) -> bool:
+        result = await self.send_esp3_packet(
+            CommonCommandTelegram.CO_RD_VERSION().to_esp3_packet()
+        )
+        return self.__parse_version_info(result.response) is not None
+
+    def __set_link_baudrate(self, baudrate: int) -> None:
+        """Operate the open serial port at the given baud rate."""
+        if self.__transport is not None:
+            self.__transport.serial.baudrate = baudrate
+        self.__link.baudrate = baudrate
 
-                # start a timer before sending the packet, so that we can measure the time it takes to receive the response after sending the packet
-                start = time.perf_counter()
+    def link_stats(self) -> LinkStats:
+        """Return the baud rate of the serial link, the bytes transferred and the link utilisation per direction over the last minute."""
+        return self.__link.stats()
 
-                # send the frame
-                self.__transport.write(packet.to_bytes())
+    async def __transmit(self, packet: ESP3Packet) -> SendResult:
+        """Write a packet to the module and wait for its response (called by the send scheduler, one packet at a time)."""
+        await self.__wait_for_late_response()
+        if not self.__transport:
+            self._logger.error(
+                "Cannot send: gateway is not connected to an EnOcean module."
+            )
+            return SendResult(None, None, outcome=SendOutcome.NOT_CONNECTED)
+
+        radio_packet = self.__radio_packet(packet)
+        if (
+            radio_packet is packet
+            and self.__radio_mode == RadioMode.ADVANCED
+            and packet.packet_type == ESP3PacketType.RADIO_ERP1
+        ):
+            self._logger.warning(
+                f"RORG 0x{packet.data[0]:02X} has no ERP2 telegram type; sending {packet} as ERP1 telegram"
+            )
+        packet = radio_packet
+
+        loop = asyncio.get_running_loop()
+        self.__send_future = loop.create_future()
+        if packet.packet_type in RADIO_PACKET_TYPES:
+            self.__transmit_future = loop.create_future()
+
+        try:
+            # emit to the send callbacks; we do this before sending the packet (WHY?)
+            self.__emit(self.__esp3_send_callbacks, packet)
+            self._logger.debug(
+                f"Sending ESP3 packet: {packet}. Waiting for response..."
+            )
+
+            # start a timer before sending the packet, so that we can measure the time it takes to receive the response after sending the packet
+            start = time.perf_counter()
+
+            # send the frame
+            frame = packet.to_bytes()
+            self.__transport.write(frame)
+            self.__link.record_sent(len(frame))
+            timeout = (
+                self.__latency.timeout(packet)
+                if self.__adaptive_timeout
+                else SPEC_TIMEOUT
+            )
+            try:
                 response: ResponseTelegram | None = await asyncio.wait_for(
-                    self.__send_future, timeout=0.5
+                    self.__send_future, timeout=timeout
                 )
+            except TimeoutError:
+                self.__latency.record_timeout(packet)
+                if timeout < SPEC_TIMEOUT:
+                    # the module may still answer within the specified time (see __wait_for_late_response())
+                    self.__late_response = loop.create_future()
+                    self.__late_response_deadline = start + SPEC_TIMEOUT
+                raise
+
+            # stop the timer and calculate duration
+            end = time.perf_counter()
+            self.__latency.record(packet, (end - start) * 1000)
 
-                # stop the timer and calculate duration
-                end = time.perf_counter()
+            self._logger.debug(
+                f"Received response to sent packet: {response}. Duration: {(end - start) * 1000:.2f} ms"
+            )
 
-                self._logger.debug(
-                    f"Received response to sent packet: {response}. Duration: {(end - start) * 1000:.2f} ms"
-                )
+            if (
+                response is not None
+                and response.return_code == ResponseCode.OK
+                and packet.packet_type == ESP3PacketType.COMMON_COMMAND
+                and packet.data[0] == CommonCommandCode.CO_SET_BAUDRATE
+            ):
+                # switch before the next packet is written; the module changes its rate after answering
+                self.__set_link_baudrate(BAUDRATES[packet.data[1]])
+
+            transmitted: bool | None = None
+            transmit_ms: float | None = None
+            if (
+                self.__transmit_future is not None
+                and response is not None
+                and response.return_code == ResponseCode.OK
+                and (self.__transmit_events or self.__transmit_future.done())
+            ):
+                event = await self.__wait_for_transmit_event(self.__transmit_future)
+                if event is not None:
+                    transmitted = event[0].event_code == EventCode.CO_TX_DONE
+                    transmit_ms = (event[1] - start) * 1000
+                    if not transmitted:
+                        failure = event[0].transmit_failure
+                        self._logger.warning(
+                            f"EnOcean module could not transmit {packet} ({failure.name if failure is not None else 'unknown reason'})"
+                        )
+
+            if self.__duty_cycle is not None and response is not None:
+                if response.return_code == ResponseCode.OK:
+                    self.__duty_cycle.record(packet)
+                elif response.return_code == ResponseCode.DUTY_CYCLE_LOCK:
+                    self.__duty_cycle.resync()
+                    self._logger.warning(
+                        f"EnOcean module reported duty-cycle lock; airtime estimate resynchronised ({self.__duty_cycle.used:.2f} s of {self.__duty_cycle.budget:.0f} s used)"
+                    )
+
+            return SendResult(
+                response,
+                (end - start) * 1000,
+                transmitted=transmitted,
+                transmit_ms=transmit_ms,
+            )
+
+        finally:
+            self.__send_future = None
+            self.__transmit_future = None
+
+    def __airtime_delay(self, packet: ESP3Packet) -> float:
+        """Pacer of the send queue: the duty-cycle delay of the packet as written to the module (and recorded after sending)."""
+        return self.__duty_cycle.delay(self.__radio_packet(packet))
+
+    def __radio_packet(self, packet: ESP3Packet) -> ESP3Packet:
+        """Return the packet as written to the module: in ERP2 mode, RADIO_ERP1 packets are converted to RADIO_ERP2 (if their RORG has an ERP2 telegram type)."""
+        if (
+            self.__radio_mode == RadioMode.ADVANCED
+            and packet.packet_type == ESP3PacketType.RADIO_ERP1
+        ):
+            try:
+                return erp2_from_erp1(packet)
+            except ValueError:
+                pass  # sent as ERP1; the module answers NOT_SUPPORTED if it does not accept it
+        return packet
 
-                return SendResult(response, (end - start) * 1000)
+    async def __wait_for_late_response(self) -> None:
+        """After a shortened response timeout, wait until the late response arrived or the time the module may take to answer is over.
 
-            finally:
-                self.__send_future = None
+        Responses carry no reference to their packet, so the next packet is only written once a late response can no
+        longer be taken for its response.
+        """
+        future = self.__late_response
+        if future is None:
+            return
+        try:
+            await asyncio.wait_for(
+                future, max(0.0, self.__late_response_deadline - time.perf_counter())
+            )
+        except TimeoutError:
+            pass  # the response was lost
+        finally:
+            self.__late_response = None
+
+    async def __wait_for_transmit_event(
+        self, future: asyncio.Future
+    ) -> tuple[EventTelegram, float] | None:
+        """Wait for the transmit event of a confirmed radio packet; return it with the time it was received, or None."""
+        try:
+            event = await asyncio.wait_for(future, TRANSMIT_EVENT_TIMEOUT)
+        except TimeoutError:
+            self.__missed_transmit_events += 1
+            if self.__missed_transmit_events >= MAX_MISSED_TRANSMIT_EVENTS:
+                self.__transmit_events = False
+                self._logger.debug(
+                    "EnOcean module stopped reporting radio transmissions; no longer waiting for transmit events"
+                )
+            return None
+        self.__missed_transmit_events = 0
+        return event
 
     async def send_command(
         self,
         destination: EURID | BaseAddress,
         command: Instruction,
         sender: SenderAddress | None = None,
+        priority: SendPriority | None = None,
     ) -> SendResult:
         """Send a typed command to a registered device.
 
@@ -360,6 +1233,8 @@ class Gateway:
             command: A typed Command instance (e.g. SetCoverPosition, Dim).
             sender: Sender address to use. If None, uses the device's registered sender
                     or falls back to the gateway's base ID.
+            priority: Send priority. If None, queries are sent with POLLING priority and all
+                      other commands with COMMAND priority.
 
         Returns:
             SendResult with the response and duration.
@@ -368,38 +1243,203 @@ class Gateway:
             ValueError: If the device is unknown, or the command is not supported by its EEP.
             ConnectionError: If not connected to the EnOcean module.
         """
-        if destination not in self.__known_device_eeps:
-            raise ValueError(f"Unknown device {destination}: call add_device() first")
+        eep_id = self.__command_eep(destination, command)
+
+        # Resolve sender: explicit > device sender > gateway base ID
+        if sender is None:
+            device = self.__devices.get(destination)
+            if device and device.sender:
+                sender = device.sender
+            else:
+                sender = await self.__command_base_id()
+
+        erp1 = self.__encode_command(eep_id, command, sender, destination)
+
+        if priority is None:
+            priority = default_priority(command)
+        # a newer command for the same entity and action supersedes a still-queued one (unless commands are cumulative, like relative dimming)
+        return await self.send_esp3_packet(
+            erp1.to_esp3(),
+            priority,
+            coalesce_key=(destination, command.entity_id, command.action),
+            idempotent=command.idempotent,
+        )
+
+    async def send_commands_bulk(
+        self,
+        targets: Iterable[EURID | BaseAddress],
+        command: Instruction,
+        sender: SenderAddress | None = None,
+        priority: SendPriority | None = None,
+        on_result: Callable[[EURID | BaseAddress, SendResult], None] | None = None,
+    ) -> BulkSendResult:
+        """Send the same typed command to many registered devices, e.g. to switch off all relays.
+
+        All targets are validated and encoded before anything is sent: the command is encoded once per
+        (EEP, sender) combination and the resulting frame is reused for every target, with only the destination
+        address replaced. The packets are queued as one batch in the send queue (see SendScheduler.submit_batch())
+        and are not coalesced with other commands.
+
+        Args:
+            targets: The devices' addresses (each must have been registered via add_device()); duplicates are sent once.
+            command: A typed Command instance (e.g. SetSwitchOutput).
+            sender: Sender address to use for all targets. If None, each device's registered sender is used,
+                    falling back to the gateway's base ID.
+            priority: Send priority; defaults as in send_command().
+            on_result: Called with (target, SendResult) as soon as each target's packet has been confirmed or has failed.
+
+        Returns:
+            BulkSendResult with the result per target, counts of succeeded and failed targets and the total duration.
+
+        Raises:
+            ValueError: If any device is unknown, or the command is not supported by its EEP; nothing is sent then.
+            ConnectionError: If the gateway is stopped while packets are still queued.
+        """
+        destinations = list(dict.fromkeys(targets))
+
+        groups: dict[tuple[EEP, SenderAddress], list[EURID | BaseAddress]] = {}
+        for destination in destinations:
+            eep_id = self.__command_eep(destination, command)
+            target_sender = sender
+            if target_sender is None:
+                device = self.__devices.get(destination)
+                if device and device.sender:
+                    target_sender = device.sender
+                else:
+                    target_sender = await self.__command_base_id()
+            groups.setdefault((eep_id, target_sender), []).append(destination)
+
+        packets: dict[EURID | BaseAddress, ESP3Packet] = {}
+        for (eep_id, group_sender), group in groups.items():
+            template = self.__encode_command(
+                eep_id, command, group_sender, group[0]
+            ).to_esp3()
+            for destination in group:
+                packets[destination] = _with_destination(template, destination)
+
+        start = time.perf_counter()
+        buffered = not self.__transport and self.__send_scheduler.paused
+        if buffered and (
+            self.__send_scheduler.depth + len(destinations) > self.__offline_buffer
+        ):
+            self.__connection_stats.dropped_overflow += len(destinations)
+            buffered = False
+        if not self.__transport and not buffered:
+            self._logger.error(
+                "Cannot send: gateway is not connected to an EnOcean module."
+            )
+            results = [
+                SendResult(None, None, outcome=SendOutcome.NOT_CONNECTED)
+                for _ in destinations
+            ]
+            if on_result is not None:
+                for destination, result in zip(destinations, results):
+                    on_result(destination, result)
+        else:
+            futures = self.__send_scheduler.submit_batch(
+                (packets[destination] for destination in destinations),
+                priority if priority is not None else default_priority(command),
+                command.idempotent,
+                ttl=self.__offline_ttl if buffered else None,
+            )
+            if buffered:
+                self.__connection_stats.buffered += len(futures)
+            if on_result is not None:
+                for destination, future in zip(destinations, futures):
+                    future.add_done_callback(
+                        lambda f, destination=destination: (
+                            on_result(destination, f.result())
+                            if not f.cancelled() and f.exception() is None
+                            else None
+                        )
+                    )
+            results = await asyncio.gather(*futures)
+            if buffered:
+                expired = sum(r.outcome == SendOutcome.EXPIRED for r in results)
+                self.__connection_stats.dropped_expired += expired
+                self.__connection_stats.flushed += len(results) - expired
+
+        bulk = BulkSendResult(
+            dict(zip(destinations, results)), (time.perf_counter() - start) * 1000
+        )
+        self._logger.info(
+            f"Sent {command.action} to {len(destinations)} devices: {bulk.succeeded} succeeded, {bulk.failed} failed, {bulk.attempts} transmissions in {bulk.duration_ms:.0f} ms"
+        )
+        return bulk
+
+    async def device_handle(self, address: EURID | BaseAddress) -> DeviceHandle:
+        """Return a handle for sending commands to a registered device with minimal per-command overhead.
+
+        The handle resolves the device's EEP, encoders and sender once and caches encoded frames; see DeviceHandle.
+        Use it in latency-sensitive paths instead of repeated send_command() calls.
+
+        Raises:
+            ValueError: If the device is unknown, its EEP is not supported, or no sender address can be determined.
+        """
+        handle = DeviceHandle(
+            address,
+            self.__resolve_device,
+            self.send_esp3_packet,
+            lambda: self.__registry_generation,
+        )
+        await handle.resolve()
+        return handle
+
+    async def __resolve_device(self, address: EURID | BaseAddress) -> ResolvedDevice:
+        eep_id = self.__known_device_eeps.get(address)
+        if eep_id is None:
+            raise ValueError(f"Unknown device {address}: call add_device() first")
+        handler = self.__eep_handlers.get(eep_id)
+        if handler is None:
+            raise ValueError(f"No EEP handler loaded for {eep_id}")
 
-        eep_id = self.__known_device_eeps[destination]
+        device = self.__devices.get(address)
+        if device and device.sender:
+            sender = device.sender
+        else:
+            sender = await self.__command_base_id()
+        return ResolvedDevice(
+            eep_id, handler, EEP_SPECIFICATIONS[eep_id].encoders, sender
+        )
+
+    def __command_eep(
+        self, destination: EURID | BaseAddress, command: Instruction
+    ) -> EEP:
+        """Return the EEP of a registered device, checking that it supports the command."""
+        eep_id = self.__known_device_eeps.get(destination)
+        if eep_id is None:
+            raise ValueError(f"Unknown device {destination}: call add_device() first")
 
         if eep_id not in self.__eep_handlers:
             raise ValueError(f"No EEP handler loaded for {eep_id}")
 
-        spec = EEP_SPECIFICATIONS[eep_id]
-        if command.action not in spec.encoders:
+        if command.action not in EEP_SPECIFICATIONS[eep_id].encoders:
             raise ValueError(
                 f"Command '{command.action}' is not supported for EEP {eep_id}"
             )
+        return eep_id
 
-        # Resolve sender: explicit > device sender > gateway base ID
-        if sender is None:
-            device = self.__devices.get(destination)
-            if device and device.sender:
-                sender = device.sender
-            else:
-                sender = await self.base_id
-        if sender is None:
+    async def __command_base_id(self) -> BaseAddress:
+        base_id = await self.base_id
+        if base_id is None:
             raise ValueError(
                 "Could not determine sender address; pass sender= explicitly or connect first"
             )
+        return base_id
 
-        message: EEPMessage = spec.encoders[command.action](command)
+    def __encode_command(
+        self,
+        eep_id: EEP,
+        command: Instruction,
+        sender: SenderAddress,
+        destination: EURID | BaseAddress,
+    ) -> ERP1Telegram:
+        message: EEPMessage = EEP_SPECIFICATIONS[eep_id].encoders[command.action](
+            command
+        )
         message.sender = sender
         message.destination = destination
-
-        erp1 = self.__eep_handlers[eep_id].encode(message)
-        return await self.send_esp3_packet(erp1.to_esp3())
+        return self.__eep_handlers[eep_id].encode(message)
 
     def connection_made(self) -> None:
         pass
@@ -408,10 +1448,13 @@ class Gateway:
         self.__transport = None
         if self.__stopped:
             return
+        self.__connection_stats.outages += 1
+        self.__outage_start = self.__clock.monotonic()
         if not self.auto_reconnect:
             self._logger.error(
                 "Connection to EnOcean module lost and auto-reconnect is disabled. You must manually call start() to reconnect."
             )
+            self.__drop_offline_buffer()
             return
         self._logger.warning(
             "Connection to EnOcean module lost, attempting to reconnect ..."
@@ -419,28 +1462,74 @@ class Gateway:
         if self.__reconnect_task is not None:
             self.__reconnect_task.cancel()
         self.__reconnect_task = asyncio.create_task(self.__try_to_reconnect())
+        if self.__offline_buffer > 0:
+            self.__send_scheduler.pause()
+
+    def __drop_offline_buffer(self) -> None:
+        """Fail the packets queued while disconnected with NOT_CONNECTED and stop buffering new ones."""
+        if not self.__send_scheduler.paused:
+            return
+        dropped = self.__send_scheduler.drop(SendOutcome.NOT_CONNECTED)
+        self.__send_scheduler.resume()
+        if dropped:
+            self._logger.warning(
+                f"Dropped {dropped} packets queued while disconnected, as no reconnect is pending"
+            )
 
     async def __try_to_reconnect(self):
-        for attempt in range(1, 721):
-            await asyncio.sleep(5)
+        policy = self.__reconnect_policy
+        started = self.__clock.monotonic()
+        attempt = 0
+        delay = policy.delay(1)
+        while (
+            policy.max_duration is None
+            or self.__clock.monotonic() - started < policy.max_duration
+        ):
+            attempt += 1
+            if await self.__wait_for_port(delay):
+                self._logger.info(
+                    f"Serial port {self.__port} reappeared; reconnecting immediately"
+                )
             try:
                 self._logger.info(
-                    f"Trying to reconnect to EnOcean Module (attempt #{attempt}/720)"
+                    f"Trying to reconnect to EnOcean Module (attempt #{attempt})"
                 )
-                await self.start()
-                self.__reconnect_task.cancel()
+                self.__connection_stats.reconnect_attempts += 1
+                await self.start(self.auto_reconnect)
                 self.__reconnect_task = None
-                self._logger.info("Reconnect successfull")
+                self._logger.info("Reconnect successful")
                 return
             except Exception:
+                delay = policy.delay(attempt + 1)
                 self._logger.warning(
-                    f"Reconnection attempt #{attempt}/720 failed, retrying again in 5s."
+                    f"Reconnection attempt #{attempt} failed, retrying again in {delay:.1f}s."
                 )
-                continue
 
+        self.__reconnect_task = None
         self._logger.error(
-            "Could not reconnect to EnOcean module after 720 attempts (1 hour). Stopping auto-reconnect."
+            f"Could not reconnect to EnOcean module after {attempt} attempts ({self.__clock.monotonic() - started:.0f} s). Stopping auto-reconnect."
         )
+        self.__drop_offline_buffer()
+
+    async def __wait_for_port(self, delay: float) -> bool:
+        """Wait up to delay seconds; returns True early if the port's device node (re)appears in the meantime."""
+        clock = self.__clock
+        if not self.__port.startswith("/"):
+            await clock.sleep(delay)
+            return False
+
+        deadline = clock.monotonic() + delay
+        present = os.path.exists(self.__port)
+        while (remaining := deadline - clock.monotonic()) > 0:
+            await clock.sleep(min(self.__reconnect_policy.poll_interval, remaining))
+            was_present, present = present, os.path.exists(self.__port)
+            if present and not was_present:
+                return True
+        return False
+
+    def connection_stats(self) -> ConnectionStats:
+        """Return statistics about connection outages, reconnect attempts and packets sent while disconnected."""
+        return ConnectionStats(**vars(self.__connection_stats))
 
     # ------------------------------------------------------------------
     # device registry
@@ -451,12 +1540,21 @@ class Gateway:
         eep: EEP,
         sender: SenderAddress | None = None,
         name: str | None = None,
+        emit_filters: dict[Observable, EmitFilter] | None = None,
     ) -> None:
         """Register a device with its sender address (EURID or Base ID) and its eep.
 
         This allows the gateway to recognize incoming messages from this device and decode them according to the registered EEP (if a handler for that EEP is found).
+
+        If emit_filters is provided, the given EmitFilter is applied to the device's scalar observer for each observable, taking precedence over filters set for the whole EEP via set_emit_filters().
         """
+        self.__forget_device(address)
         self.__known_device_eeps[address] = eep
+        self.__schedule_filter_sync()
+        if emit_filters:
+            self.__device_emit_filters[address] = dict(emit_filters)
+        else:
+            self.__device_emit_filters.pop(address, None)
         self._logger.info(f"Added device with address {address} and eep {eep}")
 
         # get the EEP handler for this eep
@@ -473,41 +1571,179 @@ class Gateway:
         else:
             self._logger.debug(f"EEP handler for eep {eep} already loaded.")
 
-        # build observer list from EEP observers
-        eep = EEP_SPECIFICATIONS[eep]
-        if not eep.observers:
+        if not EEP_SPECIFICATIONS[eep].observers:
             self._logger.debug(
                 f"EEP {eep} has no observers; StateChange processing unavailable for device {address}."
             )
             return
 
-        cb = self.__on_observation
-        capabilities = [MetaDataObserver(device_address=address, on_state_change=cb)]
-        for factory in eep.observers:
-            capabilities.append(factory(address, cb))
-
         device = Device(
             address=address,
             eep=eep,
             name=name or str(address),
             sender=sender,
-            capabilities=capabilities,
         )
+        self.__create_observers(device)
         self.__devices[address] = device
+        if sender is not None and self.__sender_allocator is not None:
+            self.__claim_sender(self.__sender_allocator, address, sender)
         self._logger.debug(
             f"Initialized device {address} with {len(device.capabilities)} capabilities"
         )
 
+    def add_devices(self, devices: Iterable[DeviceRegistration | tuple]) -> int:
+        """Register many devices at once, e.g. at start-up.
+
+        Each entry is a DeviceRegistration or a plain tuple (address, eep[, sender[, name]]). All entries are validated before any of them is registered. Unlike add_device(), the observers of a device are only created when its first telegram arrives, so devices that never transmit cost no more than a registry entry.
+
+        Returns:
+            The number of registered devices whose EEP is supported.
+
+        Raises:
+            ValueError: If an entry is malformed; no device is registered in that case.
+        """
+        registrations: list[DeviceRegistration] = []
+        for i, entry in enumerate(devices):
+            if not 2 <= len(entry) <= 4:
+                raise ValueError(f"Invalid device entry #{i}: {entry!r}")
+            registration = DeviceRegistration(*entry)
+            if not isinstance(registration.address, (EURID, BaseAddress)):
+                raise ValueError(
+                    f"Invalid device entry #{i}: {registration.address!r} is not a EURID or base address"
+                )
+            if not isinstance(registration.eep, EEP):
+                raise ValueError(
+                    f"Invalid device entry #{i}: {registration.eep!r} is not an EEP"
+                )
+            registrations.append(registration)
+
+        self.__schedule_filter_sync()
+        supported = 0
+        unsupported: set[EEP] = set()
+        for address, eep, sender, name in registrations:
+            self.__forget_device(address)
+            self.__known_device_eeps[address] = eep
+            self.__device_emit_filters.pop(address, None)
+
+            spec = EEP_SPECIFICATIONS.get(eep)
+            if spec is None:
+                unsupported.add(eep)
+                continue
+            supported += 1
+            if eep not in self.__eep_handlers:
+                self.__eep_handlers[eep] = EEPHandler(spec)
+            if spec.observers:
+                self.__devices[address] = Device(
+                    address=address,
+                    eep=eep,
+                    name=name or str(address),
+                    sender=sender,
+                )
+                if sender is not None and self.__sender_allocator is not None:
+                    self.__claim_sender(self.__sender_allocator, address, sender)
+
+        for eep in unsupported:
+            self._logger.warning(
+                f"EEP {eep} is not supported. Messages from devices with this EEP will not be decoded."
+            )
+        self._logger.info(
+            f"Added {len(registrations)} devices ({len(registrations) - supported} with unsupported EEP)"
+        )
+        return supported
+
+    def __create_observers(self, device: Device) -> None:
+        """Attach the shared observers of the device's EEP to the device and apply its emit filters and restored state."""
+        capabilities = self.__pipeline_for(device.eep).observers
+        self.__apply_emit_filters(device.address, capabilities)
+        self.__apply_observer_states(device.address, capabilities)
+        device.capabilities = capabilities
+        device.observers_created = True
+
+    def __pipeline_for(self, eep: EEP) -> ObserverPipeline:
+        """Return the observer pipeline shared by all devices of the given EEP, creating it on first use."""
+        pipeline = self.__eep_pipelines.get(eep)
+        if pipeline is None:
+            cb = self.__on_observation
+            observers = [self.__metadata_observer]
+            for factory in EEP_SPECIFICATIONS[eep].observers:
+                observer = factory(None, cb)
+                observer.timers = self.__timers
+                observer.clock = self.__clock
+                observers.append(observer)
+
+            eep_filters = self.__eep_emit_filters.get(eep, {})
+            for observer in observers:
+                if (
+                    isinstance(observer, ScalarObserver)
+                    and observer.observable in eep_filters
+                ):
+                    observer.emit_filter = eep_filters[observer.observable]
+            pipeline = self.__eep_pipelines[eep] = ObserverPipeline(observers)
+        return pipeline
+
+    def __forget_device(self, address: EURID | BaseAddress) -> None:
+        """Drop a registered device and the state its observers keep for it."""
+        self.__registry_generation += 1
+        if self.__sender_allocator is not None:
+            self.__sender_allocator.release(address)
+        device = self.__devices.pop(address, None)
+        if device is not None:
+            for observer in device.capabilities:
+                observer.forget(address)
+
+    def set_emit_filters(
+        self, eep: EEP, emit_filters: dict[Observable, EmitFilter] | None
+    ) -> None:
+        """Set emission filters for the scalar observers of all devices with the given EEP (pass None to clear them).
+
+        Filters set for individual devices via add_device() take precedence. Devices that are already registered are updated immediately.
+        """
+        removed = self.__eep_emit_filters.pop(eep, {}).keys() - (emit_filters or {})
+        if emit_filters:
+            self.__eep_emit_filters[eep] = dict(emit_filters)
+
+        pipeline = self.__eep_pipelines.get(eep)
+        for observer in pipeline.observers if pipeline is not None else ():
+            if not isinstance(observer, ScalarObserver):
+                continue
+            if emit_filters and observer.observable in emit_filters:
+                observer.emit_filter = emit_filters[observer.observable]
+            elif observer.observable in removed:
+                observer.emit_filter = None
+
+    def __apply_emit_filters(
+        self, address: EURID | BaseAddress, observers: Sequence[Observer]
+    ) -> None:
+        """Apply the per-device emission filters of a device to the given (shared) observers."""
+        filters = self.__device_emit_filters.get(address)
+        if not filters:
+            return
+
+        for observer in observers:
+            if isinstance(observer, ScalarObserver) and observer.observable in filters:
+                observer.set_device_emit_filter(address, filters[observer.observable])
+
     def __on_observation(self, observation: Observation) -> None:
-        """Internal callback forwarding observer Observations to registered callbacks."""
+        """Internal callback forwarding observer Observations to the state store (if any) and registered callbacks."""
+        self.__receive_latency.record(ReceiveStage.OBSERVATION, observation.received)
+        if self.__state_store is not None:
+            self.__state_store.update(observation)
         self.__emit(self.__observation_callbacks, observation)
 
+    @property
+    def state_store(self) -> StateStore | None:
+        """The store holding the last known state of all entities, or None if no store was supplied."""
+        return self.__state_store
+
     def remove_device(self, address: EURID | BaseAddress) -> None:
         """Deregister a device by its sender address (EURID or Base ID). This removes the device from the registry of known devices, so that incoming messages from this address will no longer be recognized as coming from a known device and will not be decoded as EEP messages."""
         if address in self.__known_device_eeps:
             del self.__known_device_eeps[address]
-            if address in self.__devices:
-                del self.__devices[address]
+            self.__device_emit_filters.pop(address, None)
+            if self.__state_store is not None:
+                self.__state_store.remove_device(address)
+            self.__forget_device(address)
+            self.__schedule_filter_sync()
             self._logger.info(f"Removed device with address {address}")
         else:
             self._logger.warning(
@@ -542,6 +1778,84 @@ class Gateway:
                 result[address] = descriptor
         return result
 
+    # ------------------------------------------------------------------
+    # state persistence
+    # ------------------------------------------------------------------
+    def save_state(self, path: str | None = None) -> None:
+        """Save the last known entity state and observer internals to a snapshot file (defaults to the gateway's state_file)."""
+        path = path or self.__state_file
+        if path is None:
+            raise ValueError("No state file given")
+
+        observer_states: ObserverStates = dict(self.__pending_observer_states)
+        for address, device in self.__devices.items():
+            states = [
+                (type(observer).__name__, state)
+                if (state := observer.snapshot_state(address)) is not None
+                else None
+                for observer in device.capabilities
+            ]
+            if any(states):
+                observer_states[address] = states
+
+        try:
+            write_snapshot(path, self.__state_store, observer_states)
+        except OSError as e:
+            self._logger.error(f"Failed to save state snapshot to {path}: {e}")
+            return
+        self._logger.debug(f"Saved state snapshot to {path}")
+
+    def restore_state(self, path: str | None = None) -> bool:
+        """Restore the last known entity state and observer internals from a snapshot file (defaults to the gateway's state_file).
+
+        Entity state is loaded into the state store (live values take precedence). Observer internals are applied to registered devices immediately and to devices registered later as soon as their observers are created. Returns True if a snapshot was loaded.
+        """
+        path = path or self.__state_file
+        if path is None:
+            raise ValueError("No state file given")
+        self.__state_restored = True
+
+        try:
+            snapshot = read_snapshot(path)
+        except FileNotFoundError:
+            self._logger.debug(f"No state snapshot found at {path}")
+            return False
+        except (OSError, SnapshotFormatError) as e:
+            self._logger.warning(f"Failed to restore state snapshot from {path}: {e}")
+            return False
+
+        if self.__state_store is not None:
+            self.__state_store.restore(snapshot.entities)
+
+        self.__pending_observer_states.update(snapshot.observers)
+        for address, device in self.__devices.items():
+            self.__apply_observer_states(address, device.capabilities)
+
+        self._logger.info(
+            f"Restored state snapshot from {path} ({len(snapshot.entities)} entity values, {len(snapshot.observers)} devices with observer state)"
+        )
+        return True
+
+    def __apply_observer_states(
+        self, address: EURID | BaseAddress, observers: list
+    ) -> None:
+        """Apply restored observer internals (if any) to the given observers of a device."""
+        states = self.__pending_observer_states.pop(address, None)
+        if not states:
+            return
+
+        for observer, entry in zip(observers, states):
+            if entry is not None and entry[0] == type(observer).__name__:
+                observer.restore_state(entry[1], address)
+
+    async def __save_state_periodically(self, interval: float) -> None:
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.save_state()
+        except asyncio.CancelledError:
+            pass
+
     # ------------------------------------------------------------------
     # Gateway properties and methods
     # ------------------------------------------------------------------
@@ -557,8 +1871,21 @@ class Gateway:
         # Send GET ID base id request
         cmd = CommonCommandTelegram.CO_RD_IDBASE()
         result: SendResult = await self.send_esp3_packet(cmd.to_esp3_packet())
-        response = result.response
+        parsed = self.__parse_base_id(result.response)
+        if parsed is None:
+            return None
+
+        self.__base_id, remaining_write_cycles = parsed
+        if remaining_write_cycles is not None:
+            self.__base_id_remaining_write_cycles = remaining_write_cycles
 
+        return self.__base_id
+
+    @staticmethod
+    def __parse_base_id(
+        response: ResponseTelegram | None,
+    ) -> tuple[BaseAddress, int | None] | None:
+        """Parse a CO_RD_IDBASE response into (base ID, remaining write cycles)."""
         if (
             response is None
             or response.return_code != ResponseCode.OK
@@ -566,12 +1893,10 @@ class Gateway:
         ):
             return None
 
-        self.__base_id = BaseAddress.from_bytelist(response.response_data[:4])
-
-        if len(response.optional_data) >= 1:
-            self.__base_id_remaining_write_cycles = response.optional_data[0]
-
-        return self.__base_id
+        return (
+            BaseAddress.from_bytelist(response.response_data[:4]),
+            response.optional_data[0] if len(response.optional_data) >= 1 else None,
+        )
 
     async def change_base_id(
         self, new_base_id: BaseAddress, safety_flag: int = 0
@@ -597,7 +1922,10 @@ class Gateway:
 
         # send WR ID base id request
         cmd = CommonCommandTelegram.CO_WR_IDBASE(new_base_id)
-        send_result = await self.send_esp3_packet(cmd.to_esp3_packet())
+        # not retried on timeout: the base ID can only be changed a limited number of times
+        send_result = await self.send_esp3_packet(
+            cmd.to_esp3_packet(), idempotent=False
+        )
         response = send_result.response
 
         # check response for errors; if we got a response, but it indicates an error, we can be pretty sure that the base ID change failed, so we can raise an exception with the error message
@@ -621,12 +1949,10 @@ class Gateway:
                     )
 
         # now either we got a successful response, or no response at all (timeout). In both cases, we should check if the base ID was actually changed by reading it again, because the module might have accepted the command but failed to send a response.
-        self.__base_id = None  # reset cached base ID to force re-fetching it
-        self.__base_id_remaining_write_cycles = (
-            None  # reset cached remaining write cycles as well
-        )
+        self.__reset_module_info()  # force re-fetching the base ID and its remaining write cycles
         reported_base_id = await self.base_id
         if reported_base_id == new_base_id:
+            self.__save_module_info()
             return reported_base_id
         elif reported_base_id == base_id_before_change:
             raise BaseIDChangeError(
@@ -649,8 +1975,12 @@ class Gateway:
         # Send GET VERSION request
         cmd = CommonCommandTelegram.CO_RD_VERSION()
         send_result = await self.send_esp3_packet(cmd.to_esp3_packet())
-        response = send_result.response
+        self.__version_info = self.__parse_version_info(send_result.response)
+        return self.__version_info
 
+    @staticmethod
+    def __parse_version_info(response: ResponseTelegram | None) -> VersionInfo | None:
+        """Parse a CO_RD_VERSION response."""
         if (
             response is None
             or response.return_code != ResponseCode.OK
@@ -658,7 +1988,7 @@ class Gateway:
         ):
             return None
 
-        self.__version_info = VersionInfo(
+        return VersionInfo(
             app_version=VersionIdentifier(
                 main=response.response_data[0],
                 beta=response.response_data[1],
@@ -678,8 +2008,6 @@ class Gateway:
             .rstrip("\x00"),
         )
 
-        return self.__version_info
-
     @property
     async def base_id_remaining_write_cycles(self) -> int | None:
         """Get the remaining write cycles for the base ID of the connected EnOcean module."""
@@ -702,38 +2030,49 @@ class Gateway:
     def process_esp3_packet(self, packet: ESP3Packet):
         """Process a received ESP3 packet. This includes emitting the raw packet to registered callbacks and further processing based on packet type."""
         self.__emit(self.__esp3_receive_callbacks, packet)
+        self.__link.record_received(
+            ESP3_FRAME_OVERHEAD + len(packet.data) + len(packet.optional)
+        )
 
-        self._logger.debug(f"Received ESP3 packet: {packet}")
+        # handle packet based on type (see register_packet_handler()); packets of types without handler are counted and ignored
+        self.__dispatcher.dispatch(packet)
 
-        # handle packet based on type; currently we only process RESPONSE and RADIO_ERP1 packets, other types are ignored
-        if packet.packet_type == ESP3PacketType.RESPONSE:
-            response: ResponseTelegram
-            try:
-                response = ResponseTelegram.from_esp3_packet(packet)
-            except Exception as e:
-                return
-            self.__process_response(response)
-            return
+    def register_packet_handler(
+        self,
+        packet_type: ESP3PacketType,
+        handler: PacketHandler,
+        replace: bool = False,
+    ) -> None:
+        """Register a handler for received ESP3 packets of the given type, e.g. for SMART_ACK_COMMAND, REMOTE_MAN_COMMAND or vendor-specific processing.
 
-        if packet.packet_type != ESP3PacketType.RADIO_ERP1:
-            self._logger.debug(
-                f"Received ESP3 packet of type {packet.packet_type.name}, which is currently not processed by the gateway. Ignoring packet."
-            )
-            return
+        The gateway itself handles RESPONSE, EVENT and the radio packet types RADIO_ERP1, RADIO_SUB_TEL, RADIO_MESSAGE and RADIO_ERP2. Registering a handler for one of these (or for a type that already has a registered handler) requires replace=True; the new handler then receives these packets instead of the gateway's own processing (so e.g. a replaced RADIO_SUB_TEL handler bypasses duplicate suppression and EEP decoding). The previous handler can be obtained via unregister_packet_handler() and called from the new one to extend rather than replace it. A handler signals a packet it cannot process by raising an exception, which is logged and counted in packet_stats().
+
+        Raises:
+            ValueError: If a handler is already registered for the packet type and replace is False.
+        """
+        self.__dispatcher.register(packet_type, handler, replace)
+
+    def unregister_packet_handler(
+        self, packet_type: ESP3PacketType
+    ) -> PacketHandler | None:
+        """Remove the handler for the given packet type; packets of this type are ignored afterwards. Returns the removed handler."""
+        return self.__dispatcher.unregister(packet_type)
+
+    def packet_stats(self) -> dict[ESP3PacketType, PacketTypeStats]:
+        """Return the number of received, handled, failed and ignored packets per packet type."""
+        return self.__dispatcher.stats()
 
-        self.__process_erp1_packet(packet)
+    def __process_response_packet(self, packet: ESP3Packet) -> None:
+        """Parse ESP3 RESPONSE packet into a response telegram and process it."""
+        self.__process_response(ResponseTelegram.from_esp3_packet(packet))
 
     def __process_erp1_packet(self, packet: ESP3Packet) -> None:
-        """Parse ESP3 RADIO_ERP1 packet into ERP1 telegram and process it."""
-        try:
-            erp1 = ERP1Telegram.from_esp3(packet)
-        except Exception as e:
-            self._logger.debug(
-                f"Failed to parse ESP3 packet to ERP1 telegram: {packet}. Ignoring packet. Error: {e}"
-            )
-            return
+        """Parse ESP3 RADIO_ERP1, RADIO_SUB_TEL or RADIO_MESSAGE packet into ERP1 telegram and process it."""
+        self.__process_erp1_telegram(ERP1Telegram.from_esp3(packet))
 
-        self.__process_erp1_telegram(erp1)
+    def __process_erp2_packet(self, packet: ESP3Packet) -> None:
+        """Parse ESP3 RADIO_ERP2 packet into ERP1 telegram and process it like a received ERP1 telegram."""
+        self.__process_erp1_telegram(parse_erp2(packet))
 
     def __emit(self, callbacks: list[Callable], obj):
         """Emit an object to all registered callbacks of the given type."""
@@ -762,11 +2101,87 @@ class Gateway:
         self.__emit(self.__response_callbacks, response)
         self._logger.debug(f"Processing received RESPONSE packet: {response}")
 
+        if self.__late_response is not None and not self.__late_response.done():
+            self.__late_response.set_result(response)
+            self.__latency.record_late_response()
+            self._logger.warning(
+                f"Received response {response} after its packet timed out; response discarded and response timeout raised"
+            )
+            return
+
         if self.__send_future and not self.__send_future.done():
             self.__send_future.set_result(response)
+        else:
+            self._logger.debug(
+                f"Received response {response} while no packet was waiting for one; ignoring it"
+            )
+
+    def __process_event(self, packet: ESP3Packet) -> None:
+        """Process a received EVENT packet: run the gateway's own handling of its event code, then emit it to the event callbacks."""
+        event = EventTelegram.from_esp3_packet(packet)
+        handler = self.__event_handlers.get(event.event_code)
+        if handler is not None:
+            handler(event)
+        else:
+            self._logger.debug(f"Received event {event.event_code.name}: {event}")
+        self.__emit(self.__event_callbacks, event)
+
+    def __on_module_ready(self, event: EventTelegram) -> None:
+        """The module was reset: read its information again right away (the serial connection stays open)."""
+        cause = event.wakeup_cause
+        self.__connection_stats.module_resets += 1
+        self._logger.warning(
+            f"EnOcean module was reset ({cause.name if cause is not None else 'unknown cause'}); reading module information again"
+        )
+        self.__version_info = None
+        self.__reset_module_info()
+        self.__module_filters = None
+        self.__module_filter_enabled = None
+        if self.__transport is not None and self.__handshake_task is None:
+            self.__handshake_task = asyncio.create_task(self.__handshake())
+        self.__radio_mode = RadioMode.COMPATIBLE
+        if (
+            self.__erp2
+            and self.__transport is not None
+            and self.__radio_mode_task is None
+        ):
+            self.__radio_mode_task = asyncio.create_task(self.__restore_radio_mode())
+        self.__schedule_filter_sync()
+
+    def __on_transmit_event(self, event: EventTelegram) -> None:
+        """The module reports the outcome of a radio transmission; hand it to the packet waiting for it."""
+        if not self.__transmit_events:
+            self._logger.debug(
+                "EnOcean module reports radio transmissions; waiting for transmit events from now on"
+            )
+            self.__transmit_events = True
+        future = self.__transmit_future
+        if future is not None and not future.done():
+            future.set_result((event, time.perf_counter()))
+
+    def __on_duty_cycle_limit(self, event: EventTelegram) -> None:
+        reached = bool(event.event_data) and event.event_data[0] == 1
+        self._logger.warning(
+            f"EnOcean module reports duty-cycle limit {'reached' if reached else 'released'}"
+        )
+        if reached and self.__duty_cycle is not None:
+            self.__duty_cycle.resync()
+
+    def __on_stronger_copy(self, erp1: ERP1Telegram) -> None:
+        """Report the better RSSI of a dropped copy of a registered device's telegram."""
+        if erp1.sender in self.__known_device_eeps:
+            self.__metadata_observer.update_rssi(erp1.sender, erp1.rssi, erp1.received)
 
     def __process_erp1_telegram(self, erp1: ERP1Telegram):
         """Process a received ERP1 telegram. This includes emitting it to registered callbacks and further processing based on RORG and learning bit."""
+        self.__receive_latency.record(ReceiveStage.TELEGRAM, erp1.received)
+        if self.__duplicates is not None and self.__duplicates.is_duplicate(erp1):
+            return
+        if erp1.rorg == RORG.RORG_CDM:
+            erp1 = self.__chains.add(erp1)
+            if erp1 is None:
+                return  # chain not complete yet
+
         # emit the raw telegram
         self.__emit_with_sender_filter(self.__erp1_receive_callbacks, erp1.sender, erp1)
         self._logger.debug(f"ESP3 packet successfully decoded to ERP1 telegram: {erp1}")
@@ -856,6 +2271,7 @@ class Gateway:
 
     def __process_eep_message(self, eep_message: EEPMessage) -> None:
         """Emit callbacks for a decoded EEP message."""
+        self.__receive_latency.record(ReceiveStage.MESSAGE, eep_message.received)
         self.__emit_with_sender_filter(
             self.__eep_receive_callbacks, eep_message.sender, eep_message
         )
@@ -881,7 +2297,11 @@ class Gateway:
             )
             return
 
-        for capability in device.capabilities:
+        if not device.observers_created:
+            self.__create_observers(device)
+
+        # only dispatch to the observers whose inputs are present in the message
+        for capability in self.__eep_pipelines[device.eep].select(eep_message):
             try:
                 capability.decode(eep_message)
             except Exception as e:
@@ -898,7 +2318,7 @@ class Gateway:
             self._logger.info(f"Sending UTE teach-in response message: {response}")
             erp1 = response.to_erp1()
             esp3 = erp1.to_esp3()
-            send_result = await self.send_esp3_packet(esp3)
+            send_result = await self.send_esp3_packet(esp3, SendPriority.TEACH_IN)
 
         except Exception as e:
             self._logger.error(f"Failed to send UTE teach-in response message: {e}")
@@ -983,3 +2403,15 @@ class Gateway:
             self._logger.info(
                 f"4BS learn telegram with EEP A5-{func:02X}-{type_:02X} and manufacturer '{manufacturer}', hence {eep}"
             )
+
+
+def _with_destination(
+    packet: ESP3Packet, destination: EURID | BaseAddress
+) -> ESP3Packet:
+    """Return a copy of a RADIO_ERP1 packet with the destination ID in its optional data replaced."""
+    optional = packet.optional
+    return ESP3Packet(
+        packet.packet_type,
+        packet.data,
+        optional[:1] + bytes(destination.to_bytelist()) + optional[5:],
+    )
@@ -0,0 +1,83 @@
+"""Traffic statistics of the serial link to the module."""
+
+from collections import deque
+from dataclasses import dataclass
+import time
+from typing import Callable, Final
+
+UART_BITS_PER_BYTE: Final = 10
+"""Bits on the wire per byte (8N1: start bit, 8 data bits, stop bit)."""
+
+ESP3_FRAME_OVERHEAD: Final = 7
+"""Bytes of an ESP3 frame besides data and optional data (sync byte, header, header CRC, data CRC)."""
+
+
+@dataclass(frozen=True)
+class LinkStats:
+    """Traffic on the serial link to the module."""
+
+    baudrate: int
+    """Baud rate the link is currently operated at."""
+
+    bytes_sent: int
+    bytes_received: int
+
+    tx_utilisation: float
+    """Fraction of the link capacity used for sending within the last window seconds."""
+
+    rx_utilisation: float
+    """Fraction of the link capacity used for receiving within the last window seconds."""
+
+    window: float
+
+
+class LinkMonitor:
+    """Counts the bytes sent and received on the serial link, in one-second buckets over a sliding window."""
+
+    def __init__(
+        self,
+        baudrate: int,
+        window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.baudrate = baudrate
+        """Baud rate the link is currently operated at."""
+
+        self.window = window
+        """Length of the sliding window in seconds over which the utilisation is computed."""
+
+        self._clock = clock
+        self._buckets: deque[list[int]] = deque()  # [second, sent, received]
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+
+    def record_sent(self, size: int) -> None:
+        self.bytes_sent += size
+        self.__bucket()[1] += size
+
+    def record_received(self, size: int) -> None:
+        self.bytes_received += size
+        self.__bucket()[2] += size
+
+    def stats(self) -> LinkStats:
+        self.__expire(int(self._clock()))
+        capacity = self.window * self.baudrate / UART_BITS_PER_BYTE
+        return LinkStats(
+            baudrate=self.baudrate,
+            bytes_sent=self.bytes_sent,
+            bytes_received=self.bytes_received,
+            tx_utilisation=sum(b[1] for b in self._buckets) / capacity,
+            rx_utilisation=sum(b[2] for b in self._buckets) / capacity,
+            window=self.window,
+        )
+
+    def __bucket(self) -> list[int]:
+        second = int(self._clock())
+        if not self._buckets or self._buckets[-1][0] != second:
+            self.__expire(second)
+            self._buckets.append([second, 0, 0])
+        return self._buckets[-1]
+
+    def __expire(self, second: int) -> None:
+        while self._buckets and self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
@@ -0,0 +1,93 @@
+"""Cache of module information (chip ID, base ID, version) for fast warm restarts.
+
+The cache is a small JSON file with one entry per serial port:
+
+    {"format": 1, "modules": {"/dev/ttyUSB0": {"eurid": "01:23:45:67", "base_id": "FF:80:00:00", ...}}}
+
+An entry is only trusted until the module on that port has answered the start-up handshake; if it reports a
+different chip ID (another module was plugged in), the entry is replaced.
+"""
+
+from dataclasses import dataclass
+import json
+import os
+
+from .address import EURID, BaseAddress
+from .protocol.version import VersionIdentifier, VersionInfo
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class ModuleInfo:
+    """Information read from a module during the start-up handshake."""
+
+    version: VersionInfo
+    base_id: BaseAddress
+    base_id_remaining_write_cycles: int | None = None
+    baudrate: int | None = None
+    """Baud rate negotiated with the module (None: the module's default rate)."""
+
+    @property
+    def eurid(self) -> EURID:
+        return self.version.eurid
+
+
+def read_module_info(path: str | os.PathLike, port: str) -> ModuleInfo | None:
+    """Return the cached information of the module last seen on the given port, or None if there is none (or the file is unreadable)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != FORMAT_VERSION:
+            return None
+        entry = data["modules"].get(port)
+        if entry is None:
+            return None
+        return ModuleInfo(
+            version=VersionInfo(
+                app_version=VersionIdentifier(*entry["app_version"]),
+                api_version=VersionIdentifier(*entry["api_version"]),
+                eurid=EURID.from_string(entry["eurid"]),
+                device_version=entry["device_version"],
+                app_description=entry["app_description"],
+            ),
+            base_id=BaseAddress.from_string(entry["base_id"]),
+            base_id_remaining_write_cycles=entry.get("base_id_remaining_write_cycles"),
+            baudrate=entry.get("baudrate"),
+        )
+    except OSError, ValueError, KeyError, TypeError, AttributeError:
+        return None
+
+
+def write_module_info(path: str | os.PathLike, port: str, info: ModuleInfo) -> None:
+    """Store the module information for the given port, keeping the entries of other ports.
+
+    The file is replaced atomically.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        modules = data["modules"] if data.get("format") == FORMAT_VERSION else {}
+    except OSError, ValueError, KeyError, AttributeError:
+        modules = {}
+
+    version = info.version
+    modules[port] = {
+        "eurid": version.eurid.to_string(),
+        "base_id": info.base_id.to_string(),
+        "base_id_remaining_write_cycles": info.base_id_remaining_write_cycles,
+        "baudrate": info.baudrate,
+        "app_version": _version_list(version.app_version),
+        "api_version": _version_list(version.api_version),
+        "device_version": version.device_version,
+        "app_description": version.app_description,
+    }
+
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "modules": modules}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _version_list(version: VersionIdentifier) -> list[int]:
+    return [version.main, version.beta, version.alpha, version.build]
@@ -0,0 +1,240 @@
+"""Binary snapshot files of last-known entity state and observer internals for warm restarts.
+
+File layout (all integers little-endian):
+
+    header      magic "EOSS", format version (u8), string blob size (u32), entity count (u32), observer blob size (u32)
+    strings     UTF-8 string table, entries separated by NUL
+    entities    seven columns of `entity count` items each:
+                address (u32), entity_id (u32 string index), observable (u32 string index),
+                value kind (u8), value (f64; string index for strings), last_changed (f64), last_updated (f64)
+    observers   JSON object {address: [[observer class name, state], ...]}
+
+The columnar layout lets a snapshot with tens of thousands of entities be loaded with a handful of
+bulk array reads instead of per-entity parsing.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+import json
+import os
+import struct
+import sys
+from typing import Any
+
+from .address import EURID, BaseAddress, SenderAddress
+from .semantics.observable import Observable
+from .state import EntityKey, StateStore
+
+MAGIC = b"EOSS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBIII")
+
+_KIND_NONE = 0
+_KIND_BOOL = 1
+_KIND_INT = 2
+_KIND_FLOAT = 3
+_KIND_STR = 4
+
+# array type code with 4-byte items (platform dependent)
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+type ObserverStates = dict[SenderAddress, list[tuple[str, dict[str, Any]] | None]]
+"""Observer internals per device: one (observer class name, state) entry per observer, or None for stateless observers."""
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+@dataclass
+class StateSnapshot:
+    """The contents of a snapshot file."""
+
+    entities: list[tuple[EntityKey, Any, float, float]] = field(default_factory=list)
+    """(key, value, last_changed, last_updated) for every persisted entity observable; suitable for StateStore.restore()."""
+
+    observers: ObserverStates = field(default_factory=dict)
+    """Persisted observer internals per device."""
+
+
+def write_snapshot(
+    path: str | os.PathLike, store: StateStore | None, observers: ObserverStates
+) -> None:
+    """Write the state store contents and observer internals to a snapshot file.
+
+    The file is replaced atomically, so a crash during writing never leaves a truncated snapshot behind.
+    Values of types other than None, bool, int, float and str are not persisted.
+    """
+    strings: dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(strings)
+        return i
+
+    addresses = array(_U32)
+    entity_ids = array(_U32)
+    observables = array(_U32)
+    kinds = array("B")
+    values = array("d")
+    last_changed = array("d")
+    last_updated = array("d")
+
+    for (address, entity_id, observable), state in (
+        store.snapshot().items() if store is not None else ()
+    ):
+        value = state.value
+        if value is None:
+            kind, number = _KIND_NONE, 0.0
+        elif isinstance(value, bool):
+            kind, number = _KIND_BOOL, float(value)
+        elif isinstance(value, int):
+            kind, number = _KIND_INT, float(value)
+        elif isinstance(value, float):
+            kind, number = _KIND_FLOAT, value
+        elif isinstance(value, str):
+            kind, number = _KIND_STR, float(intern(value))
+        else:
+            continue
+
+        addresses.append(address.to_number())
+        entity_ids.append(intern(entity_id))
+        observables.append(intern(observable.value))
+        kinds.append(kind)
+        values.append(number)
+        last_changed.append(state.last_changed)
+        last_updated.append(state.last_updated)
+
+    string_blob = "\0".join(strings).encode("utf-8")
+    observer_blob = json.dumps(
+        {f"{address.to_number():08X}": states for address, states in observers.items()},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    columns = (
+        addresses,
+        entity_ids,
+        observables,
+        kinds,
+        values,
+        last_changed,
+        last_updated,
+    )
+    if sys.byteorder == "big":
+        for column in columns:
+            column.byteswap()
+
+    tmp_path = f"{os.fspath(path)}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                len(string_blob),
+                len(addresses),
+                len(observer_blob),
+            )
+        )
+        f.write(string_blob)
+        for column in columns:
+            column.tofile(f)
+        f.write(observer_blob)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str | os.PathLike) -> StateSnapshot:
+    """Read a snapshot file written by write_snapshot().
+
+    Raises:
+        SnapshotFormatError: if the file is not a valid snapshot.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise SnapshotFormatError("Snapshot file is truncated")
+
+    magic, version, string_size, count, observer_size = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotFormatError("Not a snapshot file")
+    if version != FORMAT_VERSION:
+        raise SnapshotFormatError(f"Unsupported snapshot format version {version}")
+
+    offset = _HEADER.size
+    strings = data[offset : offset + string_size].decode("utf-8").split("\0")
+    offset += string_size
+
+    columns = []
+    for typecode in (_U32, _U32, _U32, "B", "d", "d", "d"):
+        column = array(typecode)
+        size = column.itemsize * count
+        if offset + size > len(data):
+            raise SnapshotFormatError("Snapshot file is truncated")
+        column.frombytes(data[offset : offset + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+        offset += size
+
+    observer_blob = data[offset : offset + observer_size]
+    if len(observer_blob) != observer_size:
+        raise SnapshotFormatError("Snapshot file is truncated")
+
+    addresses: dict[int, SenderAddress] = {}
+    observables: dict[int, Observable] = {}
+    snapshot = StateSnapshot()
+    entities = snapshot.entities
+
+    for (
+        address_number,
+        entity_id,
+        observable_index,
+        kind,
+        number,
+        last_changed,
+        last_updated,
+    ) in zip(*columns):
+        address = addresses.get(address_number)
+        if address is None:
+            address = addresses[address_number] = _sender_address(address_number)
+
+        observable = observables.get(observable_index)
+        if observable is None:
+            try:
+                observable = Observable(strings[observable_index])
+            except ValueError:
+                continue  # observable no longer exists
+            observables[observable_index] = observable
+
+        if kind == _KIND_BOOL:
+            value = number != 0.0
+        elif kind == _KIND_INT:
+            value = int(number)
+        elif kind == _KIND_FLOAT:
+            value = number
+        elif kind == _KIND_STR:
+            value = strings[int(number)]
+        else:
+            value = None
+
+        entities.append(
+            (
+                (address, strings[entity_id], observable),
+                value,
+                last_changed,
+                last_updated,
+            )
+        )
+
+    for address_hex, states in json.loads(observer_blob or b"{}").items():
+        snapshot.observers[_sender_address(int(address_hex, 16))] = [
+            tuple(entry) if entry is not None else None for entry in states
+        ]
+
+    return snapshot
+
+
+def _sender_address(number: int) -> SenderAddress:
+    return EURID(number) if number <= 0xFF7FFFFF else BaseAddress(number)
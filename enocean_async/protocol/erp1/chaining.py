@@ -0,0 +1,163 @@
+"""Reassembly of chained data messages (CDM, RORG 0x40).
+
+Messages too long for a single telegram (more than 14 bytes of data, e.g. long VLD responses or remote management
+replies) are sent as a chain of CDM telegrams. The first telegram of a chain carries the sequence and index byte
+(index 0), the length of the message, the RORG of the message and the first part of the payload; all following
+telegrams carry the sequence and index byte and the next part of the payload. Chains are told apart by sender
+and sequence number (2 bits, so a sender can have up to four chains in flight).
+"""
+
+from dataclasses import replace
+import time
+from typing import Callable
+
+from ...address import EURID, BaseAddress
+from .errors import ERP1ParseError
+from .rorg import RORG
+from .telegram import ERP1Telegram
+
+type ChainKey = tuple[EURID | BaseAddress, int]
+
+
+class _Chain:
+    __slots__ = ("started", "length", "rorg", "first", "segments", "size")
+
+    def __init__(self, started: float) -> None:
+        self.started = started
+        self.length: int | None = None  # known once the first telegram arrived
+        self.rorg: int | None = None
+        self.first: ERP1Telegram | None = None
+        self.segments: dict[int, bytes] = {}
+        self.size = 0
+
+
+class ChainReassembler:
+    """Collects the telegrams of chained messages and returns each message once it is complete.
+
+    Memory is strictly bounded: at most max_chains chains and max_bytes payload bytes are buffered. When a limit
+    is reached, the oldest chains are discarded; chains not completed within timeout seconds are discarded as well.
+    A chain announcing a message longer than max_bytes is rejected right away.
+    """
+
+    def __init__(
+        self,
+        max_chains: int = 8,
+        max_bytes: int = 2048,
+        timeout: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_chains = max_chains
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._clock = clock
+        self._chains: dict[ChainKey, _Chain] = {}  # oldest first
+        self._size = 0
+
+        self.completed: int = 0
+        """Number of messages reassembled."""
+
+        self.expired: int = 0
+        """Number of chains discarded because they were not completed in time."""
+
+        self.evicted: int = 0
+        """Number of chains discarded to stay within max_chains or max_bytes."""
+
+        self.rejected: int = 0
+        """Number of chains rejected because their message is longer than max_bytes."""
+
+    @property
+    def in_flight(self) -> int:
+        """Number of incomplete chains."""
+        return len(self._chains)
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Number of payload bytes of incomplete chains."""
+        return self._size
+
+    def add(self, erp1: ERP1Telegram) -> ERP1Telegram | None:
+        """Add a CDM telegram; return the reassembled message as telegram of its own RORG once the chain is complete, None otherwise.
+
+        Raises:
+            ERP1ParseError: If the telegram is not a valid CDM telegram, or the message has an unknown RORG.
+        """
+        if erp1.rorg != RORG.RORG_CDM or not erp1.telegram_data:
+            raise ERP1ParseError("Not a chained data message")
+
+        data = erp1.telegram_data
+        key = (erp1.sender, data[0] >> 6)
+        index = data[0] & 0x3F
+        now = self._clock()
+        self.__expire(now)
+
+        chain = self._chains.get(key)
+        if chain is not None and index == 0 and 0 in chain.segments:
+            # the sender started a new message with this sequence number; the old chain will not be completed
+            self.__discard(key)
+            chain = None
+        if chain is None:
+            if len(self._chains) >= self.max_chains:
+                self.__evict_oldest()
+            chain = self._chains[key] = _Chain(now)
+
+        if index == 0:
+            if len(data) < 4:
+                self.__discard(key)
+                raise ERP1ParseError("First telegram of chain too short")
+            length = int.from_bytes(data[1:3], "big")
+            if length > self.max_bytes:
+                self.__discard(key)
+                self.rejected += 1
+                return None
+            chain.length = length
+            chain.rorg = data[3]
+            chain.first = erp1
+            payload = data[4:]
+        else:
+            payload = data[1:]
+
+        if index not in chain.segments:
+            chain.segments[index] = payload
+            chain.size += len(payload)
+            self._size += len(payload)
+            while self._size > self.max_bytes:
+                self.__evict_oldest()
+            if key not in self._chains:
+                return None  # evicted itself
+
+        if chain.length is None or chain.size < chain.length:
+            return None
+        if len(chain.segments) != max(chain.segments) + 1:
+            return None  # a segment is missing; the announced length was wrong
+
+        self.__discard(key)
+        self.completed += 1
+        try:
+            rorg = RORG(chain.rorg)
+        except ValueError:
+            raise ERP1ParseError(f"Unknown RORG of chained message: 0x{chain.rorg:02X}")
+        message = b"".join(chain.segments[i] for i in range(len(chain.segments)))
+        return replace(
+            chain.first,
+            rorg=rorg,
+            telegram_data=message[: chain.length],
+            status=erp1.status,
+            rssi=erp1.rssi,
+            received=erp1.received,
+        )
+
+    def __expire(self, now: float) -> None:
+        while self._chains:
+            key, chain = next(iter(self._chains.items()))
+            if now - chain.started < self.timeout:
+                break
+            self.__discard(key)
+            self.expired += 1
+
+    def __evict_oldest(self) -> None:
+        self.__discard(next(iter(self._chains)))
+        self.evicted += 1
+
+    def __discard(self, key: ChainKey) -> None:
+        chain = self._chains.pop(key)
+        self._size -= chain.size
@@ -9,6 +9,8 @@ class RORG(IntEnum):
     RORG_UTE = 0xD4
     RORG_MSC = 0xD1
     RORG_ADT_VLD = 0xA6
+    RORG_SYS_EX = 0xC5
+    RORG_CDM = 0x40
 
     @property
     def simple_name(self) -> str:
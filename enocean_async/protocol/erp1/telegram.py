@@ -1,11 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
+from typing import NamedTuple
 
 from enocean_async.eep.manufacturer import Manufacturer
 
 from ...address import EURID, Address, BaseAddress, BroadcastAddress
 from ...eep.id import EEP
-from ..esp3.packet import ESP3Packet, ESP3PacketType
+from ..esp3.packet import ESP3Packet, ESP3PacketType, ReceiveTime
 from .errors import ERP1ParseError
 from .rorg import RORG
 
@@ -34,6 +35,19 @@ class RepeaterCount(IntEnum):
     ShallNotBeRepeated = 0xF
 
 
+class SubTelegram(NamedTuple):
+    """One received subtelegram of a telegram, as reported in RADIO_SUB_TEL packets."""
+
+    tick: int
+    """Time of reception relative to the telegram's timestamp."""
+
+    dbm: int
+    """Received signal strength as positive value (e.g. 0x55 for -85 dBm)."""
+
+    status: int
+    """Status byte of the subtelegram (including its repeater count)."""
+
+
 @dataclass
 class ERP1Telegram:
     rorg: RORG
@@ -46,6 +60,15 @@ class ERP1Telegram:
     sec_level: int | None = None
     destination: EURID | BroadcastAddress | None = None
 
+    timestamp: int | None = None
+    """Module time in ms (lower 16 bits) at which the first subtelegram was received; RADIO_SUB_TEL only."""
+
+    sub_telegrams: tuple[SubTelegram, ...] = ()
+    """The received subtelegrams; RADIO_SUB_TEL only."""
+
+    received: ReceiveTime | None = field(default=None, compare=False)
+    """Time at which the ESP3 packet carrying the telegram was read from the serial port (None for telegrams created locally)."""
+
     def data_byte(self, index: int) -> int:
         """Get the byte in the telegram data at the given index, counting from the end of the telegram data (as in the EEP specification).
 
@@ -165,7 +188,13 @@ class ERP1Telegram:
 
     @classmethod
     def from_esp3(cls, pkt: ESP3Packet) -> "ERP1Telegram":
-        if pkt.packet_type != ESP3PacketType.RADIO_ERP1:
+        """Parse a RADIO_ERP1 or RADIO_SUB_TEL packet (which carries the same telegram plus its subtelegrams), or a RADIO_MESSAGE packet."""
+        if pkt.packet_type == ESP3PacketType.RADIO_MESSAGE:
+            return cls.__from_radio_message(pkt)
+        if pkt.packet_type not in (
+            ESP3PacketType.RADIO_ERP1,
+            ESP3PacketType.RADIO_SUB_TEL,
+        ):
             raise ERP1ParseError("Not an ERP1 telegram")
 
         data = pkt.data
@@ -258,6 +287,15 @@ class ERP1Telegram:
         rssi = opt[5] if len(opt) > 5 else None
         sec_level = opt[6] if len(opt) > 6 else None
 
+        # RADIO_SUB_TEL: timestamp, followed by tick, dBm and status of every subtelegram
+        timestamp = None
+        sub_telegrams: tuple[SubTelegram, ...] = ()
+        if pkt.packet_type == ESP3PacketType.RADIO_SUB_TEL and len(opt) >= 9:
+            timestamp = int.from_bytes(opt[7:9], "big")
+            sub_telegrams = tuple(
+                SubTelegram(*opt[i : i + 3]) for i in range(9, len(opt) - 2, 3)
+            )
+
         return cls(
             rorg=rorg,
             telegram_data=telegram_data,
@@ -267,6 +305,53 @@ class ERP1Telegram:
             rssi=rssi,
             sec_level=sec_level,
             destination=destination,
+            timestamp=timestamp,
+            sub_telegrams=sub_telegrams,
+            received=pkt.received,
+        )
+
+    @classmethod
+    def __from_radio_message(cls, pkt: ESP3Packet) -> "ERP1Telegram":
+        """Parse a RADIO_MESSAGE packet: a message the module received (and possibly reassembled from a chain), without radio telegram framing.
+
+        The payload is not limited to the 14 bytes of a single telegram. Sender and destination are taken from the optional data.
+        """
+        data = pkt.data
+        opt = pkt.optional
+        if len(data) < 1:
+            raise ERP1ParseError("Radio message without data")
+        if len(opt) < 8:
+            raise ERP1ParseError("Radio message without source ID")
+
+        try:
+            rorg = RORG(data[0])
+        except ValueError:
+            raise ERP1ParseError(f"Unknown RORG: 0x{data[0]:02X}")
+
+        s = Address.from_bytelist(opt[4:8])
+        if s.is_eurid():
+            sender = EURID.from_number(s.to_number())
+        elif s.is_base_address():
+            sender = BaseAddress.from_number(s.to_number())
+        else:
+            raise ERP1ParseError(f"Invalid sender address: {s}")
+
+        d = Address.from_bytelist(opt[0:4])
+        destination = None
+        if d.is_broadcast():
+            destination = BroadcastAddress()
+        elif d.is_eurid():
+            destination = EURID.from_number(d.to_number())
+
+        return cls(
+            rorg=rorg,
+            telegram_data=data[1:],
+            sender=sender,
+            sub_tel_num=None,
+            rssi=opt[8] if len(opt) > 8 else None,
+            sec_level=opt[9] if len(opt) > 9 else None,
+            destination=destination,
+            received=pkt.received,
         )
 
     def to_esp3(self) -> ESP3Packet:
@@ -0,0 +1,171 @@
+"""EnOcean Radio Protocol 2 (ERP2) telegrams, as exchanged in RADIO_ERP2 packets by modules in ERP2 (advanced) mode.
+
+ERP2 replaces the RORG and status bytes of ERP1 by a compact header: address control (3 bits: length of the
+originator ID and presence of a destination ID), extended header flag and telegram type (4 bits). Addressed
+telegrams carry the destination directly instead of an ADT encapsulation. The ESP3 data holds the telegram
+without the length byte and CRC, which the module adds and checks on air.
+
+Received ERP2 telegrams are parsed straight into ERP1Telegram, so that the EEP decode pipeline is shared; commands
+are encoded as ERP1 as usual and converted to ERP2 just before they are sent.
+"""
+
+from typing import Final
+
+from ...address import EURID, Address, BaseAddress, BroadcastAddress
+from ..erp1.errors import ERP1ParseError
+from ..erp1.rorg import RORG
+from ..erp1.telegram import ERP1Telegram
+from ..esp3.packet import ESP3Packet, ESP3PacketType
+
+# telegram type (lower 4 bits of the header) per RORG
+TELEGRAM_TYPES: Final = {
+    RORG.RORG_RPS: 0x0,
+    RORG.RORG_1BS: 0x1,
+    RORG.RORG_4BS: 0x2,
+    RORG.RORG_VLD: 0x4,
+    RORG.RORG_UTE: 0x5,
+    RORG.RORG_MSC: 0x6,
+}
+
+EXTENDED_TELEGRAM_TYPE: Final = 0xF
+"""Telegram type indicating that an extended telegram type byte follows the header."""
+
+# extended telegram type per RORG
+EXTENDED_TELEGRAM_TYPES: Final = {
+    RORG.RORG_SYS_EX: 0x00,
+    RORG.RORG_CDM: 0x03,
+}
+
+_RORGS: Final = {t: rorg for rorg, t in TELEGRAM_TYPES.items()}
+_EXTENDED_RORGS: Final = {t: rorg for rorg, t in EXTENDED_TELEGRAM_TYPES.items()}
+
+# address control: (originator ID length, destination ID present); 48 bit originator IDs (0b011) are not supported
+_ADDRESS_CONTROL: Final = {
+    0b000: (3, False),
+    0b001: (4, False),
+    0b010: (4, True),
+}
+
+_EXTENDED_HEADER: Final = 0x10
+
+# ERP1 status bits of RPS telegrams (not transmitted in ERP2): T21 (PTM 2xx module) and NU (N-message)
+_T21: Final = 0x20
+_NU: Final = 0x10
+_ENERGY_BOW: Final = 0x10
+_BROADCAST: Final = b"\xff\xff\xff\xff"
+
+
+class ERP2ParseError(ERP1ParseError):
+    pass
+
+
+def parse_erp2(pkt: ESP3Packet) -> ERP1Telegram:
+    """Parse a RADIO_ERP2 packet into an ERP1Telegram (the repeater count is reported in the status byte).
+
+    ERP2 has no status byte. For RPS telegrams, which ERP2 only carries from PTM 2xx modules, T21 is set, and NU is
+    derived from the energy bow bit: a pressed button is reported as N-message, a release as U-message (as PTM 2xx
+    modules do in ERP1; a press of more than two buttons is thus misread as N-message).
+    """
+    if pkt.packet_type != ESP3PacketType.RADIO_ERP2:
+        raise ERP2ParseError("Not an ERP2 telegram")
+
+    data = pkt.data
+    if len(data) < 2:
+        raise ERP2ParseError(f"ERP2 telegram too short: {len(data)} bytes")
+
+    header = data[0]
+    layout = _ADDRESS_CONTROL.get(header >> 5)
+    if layout is None:
+        raise ERP2ParseError(f"Unsupported ERP2 address control: {header >> 5:03b}")
+    originator_length, addressed = layout
+
+    pos = 1
+    repeater_count = 0
+    optional_length = 0
+    if header & _EXTENDED_HEADER:
+        repeater_count = data[pos] >> 4
+        optional_length = data[pos] & 0x0F
+        pos += 1
+
+    telegram_type = header & 0x0F
+    if telegram_type == EXTENDED_TELEGRAM_TYPE:
+        if len(data) <= pos:
+            raise ERP2ParseError("ERP2 telegram too short for extended telegram type")
+        rorg = _EXTENDED_RORGS.get(data[pos])
+        pos += 1
+    else:
+        rorg = _RORGS.get(telegram_type)
+    if rorg is None:
+        raise ERP2ParseError(f"Unsupported ERP2 telegram type in header 0x{header:02X}")
+
+    end = len(data) - optional_length
+    data_start = pos + originator_length + (4 if addressed else 0)
+    if data_start >= end:
+        raise ERP2ParseError(f"ERP2 telegram too short: {len(data)} bytes")
+
+    s = Address.from_number(int.from_bytes(data[pos : pos + originator_length], "big"))
+    if s.is_eurid():
+        sender = EURID.from_number(s.to_number())
+    elif s.is_base_address():
+        sender = BaseAddress.from_number(s.to_number())
+    else:
+        raise ERP2ParseError(f"Invalid sender address: {s}")
+
+    destination = None
+    if addressed:
+        d = Address.from_bytelist(data[pos + originator_length : data_start])
+        if d.is_broadcast():
+            destination = BroadcastAddress()
+        elif d.is_eurid():
+            destination = EURID.from_number(d.to_number())
+
+    status = repeater_count
+    if rorg == RORG.RORG_RPS:
+        status |= _T21 | (_NU if data[data_start] & _ENERGY_BOW else 0)
+
+    opt = pkt.optional
+    return ERP1Telegram(
+        rorg=rorg,
+        telegram_data=data[data_start:end],
+        sender=sender,
+        status=status,
+        sub_tel_num=opt[0] if len(opt) > 0 else None,
+        rssi=opt[1] if len(opt) > 1 else None,
+        destination=destination,
+        received=pkt.received,
+    )
+
+
+def erp2_from_erp1(packet: ESP3Packet) -> ESP3Packet:
+    """Convert a RADIO_ERP1 packet into the equivalent RADIO_ERP2 packet.
+
+    Raises:
+        ValueError: If the packet is not a RADIO_ERP1 packet, or its RORG has no ERP2 telegram type.
+    """
+    if packet.packet_type != ESP3PacketType.RADIO_ERP1:
+        raise ValueError("Not an ERP1 packet")
+
+    data = packet.data
+    telegram_type = TELEGRAM_TYPES.get(data[0])
+    extended_type = EXTENDED_TELEGRAM_TYPES.get(data[0])
+    if telegram_type is None and extended_type is None:
+        raise ValueError(f"RORG 0x{data[0]:02X} cannot be sent as ERP2 telegram")
+
+    destination = packet.optional[1:5]
+    addressed = len(destination) == 4 and destination != _BROADCAST
+    header = (0b010 if addressed else 0b001) << 5 | (
+        telegram_type if telegram_type is not None else EXTENDED_TELEGRAM_TYPE
+    )
+
+    erp2 = bytearray((header,))
+    if extended_type is not None:
+        erp2.append(extended_type)
+    erp2 += data[-5:-1]  # originator ID
+    if addressed:
+        erp2 += destination
+    erp2 += data[1:-5]
+
+    sub_tel_num = packet.optional[0] if packet.optional else 0x03
+    return ESP3Packet(
+        ESP3PacketType.RADIO_ERP2, bytes(erp2), bytes((sub_tel_num, 0xFF))
+    )
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import IntEnum
+from typing import Final
 
 from ...address import BaseAddress
 from .packet import ESP3Packet, ESP3PacketType
@@ -17,6 +18,67 @@ class CommonCommandCode(IntEnum):
     CO_RD_IDBASE = 8
     """ Read ID range base address"""
 
+    CO_WR_FILTER_ADD = 11
+    """Add filter to filter list"""
+
+    CO_WR_FILTER_DEL = 12
+    """Delete filter from filter list"""
+
+    CO_WR_FILTER_DEL_ALL = 13
+    """Delete all filters"""
+
+    CO_WR_FILTER_ENABLE = 14
+    """Enable/Disable supplied filters"""
+
+    CO_RD_FILTER = 15
+    """Read supplied filters"""
+
+    CO_WR_MODE = 28
+    """Set the radio protocol mode (ERP1 or ERP2) of the module"""
+
+    CO_SET_BAUDRATE = 36
+    """Modifies the baud rate of the EnOcean device"""
+
+
+BAUDRATES: Final = (57600, 115200, 230400, 460800)
+"""Baud rates selectable with CO_SET_BAUDRATE; the index of a rate is its code in the command."""
+
+
+class RadioMode(IntEnum):
+    """Radio protocol mode of a module (ESP3 CO_WR_MODE)."""
+
+    COMPATIBLE = 0
+    """ERP1: radio telegrams are exchanged in RADIO_ERP1 packets (the default)."""
+
+    ADVANCED = 1
+    """ERP2: radio telegrams are exchanged in RADIO_ERP2 packets."""
+
+
+class FilterType(IntEnum):
+    """What a module-side telegram filter compares (ESP3 CO_WR_FILTER_ADD)."""
+
+    SOURCE_ID = 0
+    RORG = 1
+    DBM = 2
+    DESTINATION_ID = 3
+
+
+class FilterKind(IntEnum):
+    """Whether matching telegrams are blocked or passed by a module-side filter."""
+
+    BLOCK = 0x00
+    """Matching telegrams are dropped (negative filter)."""
+
+    APPLY = 0x80
+    """Only matching telegrams are passed (positive filter)."""
+
+
+class FilterOperator(IntEnum):
+    """How the module combines multiple filters (ESP3 CO_WR_FILTER_ENABLE)."""
+
+    OR = 0
+    AND = 1
+
 
 @dataclass
 class CommonCommandTelegram:
@@ -46,6 +108,68 @@ class CommonCommandTelegram:
             common_command_data=id_base_bytes,
         )
 
+    @classmethod
+    def CO_WR_FILTER_ADD(
+        cls, filter_type: FilterType, value: int, kind: FilterKind = FilterKind.APPLY
+    ) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to add a filter (value: ID, R-ORG or dBm, depending on filter_type)."""
+        return cls(
+            common_command_code=CommonCommandCode.CO_WR_FILTER_ADD,
+            common_command_data=bytes([filter_type])
+            + value.to_bytes(4, "big")
+            + bytes([kind]),
+        )
+
+    @classmethod
+    def CO_WR_FILTER_DEL(
+        cls, filter_type: FilterType, value: int
+    ) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to delete a filter."""
+        return cls(
+            common_command_code=CommonCommandCode.CO_WR_FILTER_DEL,
+            common_command_data=bytes([filter_type]) + value.to_bytes(4, "big"),
+        )
+
+    @classmethod
+    def CO_WR_FILTER_DEL_ALL(cls) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to delete all filters."""
+        return cls(common_command_code=CommonCommandCode.CO_WR_FILTER_DEL_ALL)
+
+    @classmethod
+    def CO_WR_FILTER_ENABLE(
+        cls, enable: bool, operator: FilterOperator = FilterOperator.OR
+    ) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to enable or disable the filters."""
+        return cls(
+            common_command_code=CommonCommandCode.CO_WR_FILTER_ENABLE,
+            common_command_data=bytes([int(enable), operator]),
+        )
+
+    @classmethod
+    def CO_RD_FILTER(cls) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to read the filter list."""
+        return cls(common_command_code=CommonCommandCode.CO_RD_FILTER)
+
+    @classmethod
+    def CO_WR_MODE(cls, mode: RadioMode) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to switch the module between ERP1 (compatible) and ERP2 (advanced) mode."""
+        return cls(
+            common_command_code=CommonCommandCode.CO_WR_MODE,
+            common_command_data=bytes([mode]),
+        )
+
+    @classmethod
+    def CO_SET_BAUDRATE(cls, baudrate: int) -> "CommonCommandTelegram":
+        """Create a Common Command Telegram to change the baud rate of the serial link (the module answers at the old rate, then switches)."""
+        if baudrate not in BAUDRATES:
+            raise ValueError(
+                f"Unsupported baud rate {baudrate}; must be one of {', '.join(map(str, BAUDRATES))}"
+            )
+        return cls(
+            common_command_code=CommonCommandCode.CO_SET_BAUDRATE,
+            common_command_data=bytes([BAUDRATES.index(baudrate)]),
+        )
+
     def __post_init__(self):
         if self.optional_data is None:
             self.optional_data = b""
@@ -65,3 +189,16 @@ class CommonCommandTelegram:
             data=bytes(data),
             optional=self.optional_data,
         )
+
+
+def parse_filters(response_data: bytes) -> list[tuple[FilterType, int]]:
+    """Parse the response data of CO_RD_FILTER into (filter type, value) pairs."""
+    filters = []
+    for i in range(0, len(response_data) - 4, 5):
+        filters.append(
+            (
+                FilterType(response_data[i]),
+                int.from_bytes(response_data[i + 1 : i + 5], "big"),
+            )
+        )
+    return filters
@@ -0,0 +1,111 @@
+"""An event is a packet sent by an EnOcean module to the host to report something that happened in the module.
+
+The event codes are defined in ENOCEAN SERIAL PROTOCOL (ESP3) - SPECIFICATION, Section 2.4. Some events (SA_CONFIRM_LEARN) expect a RESPONSE from the host; all others are informational.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+from .packet import ESP3Packet, ESP3PacketType
+
+
+class EventCode(IntEnum):
+    """Event codes for EnOcean ESP3 EVENT packets."""
+
+    SA_RECLAIM_NOT_SUCCESSFUL = 1
+    """Informs the backbone of a Smart Ack Client to not successful reclaim."""
+
+    SA_CONFIRM_LEARN = 2
+    """Used for SMACK to confirm/discard learn in/out."""
+
+    SA_LEARN_ACK = 3
+    """Inform backbone about result of learn request."""
+
+    CO_READY = 4
+    """Inform backbone about the readiness for operation (sent after a reset of the module)."""
+
+    CO_EVENT_SECUREDEVICES = 5
+    """Informs about a secure device."""
+
+    CO_DUTYCYCLE_LIMIT = 6
+    """Informs about duty cycle limit."""
+
+    CO_TRANSMIT_FAILED = 7
+    """Informs that the device was not able to send a telegram."""
+
+    CO_TX_DONE = 8
+    """Informs that all TX operations are done."""
+
+    CO_LRN_MODE_DISABLED = 9
+    """Informs that the learn mode has time-out."""
+
+
+class WakeupCause(IntEnum):
+    """Reason for a module reset, reported with CO_READY."""
+
+    VOLTAGE_SUPPLY_DROP = 0x00
+    RESET_PIN = 0x01
+    WATCHDOG = 0x02
+    FLYWHEEL = 0x03
+    PARITY_ERROR = 0x04
+    HW_PARITY_ERROR = 0x05
+    PAGE_FAULT = 0x06
+    WAKEUP_PIN_0 = 0x07
+    WAKEUP_PIN_1 = 0x08
+    UNKNOWN_SOURCE = 0x09
+
+
+class TransmitFailure(IntEnum):
+    """Reason for a failed radio transmission, reported with CO_TRANSMIT_FAILED."""
+
+    CSMA_FAILED = 0x00
+    """The channel was not free."""
+
+    NO_ACK = 0x01
+    """No acknowledgement was received."""
+
+
+@dataclass
+class EventTelegram:
+    """Represents an EnOcean ESP3 event telegram."""
+
+    event_code: EventCode
+    event_data: bytes = b""
+    optional_data: bytes = b""
+
+    @classmethod
+    def from_esp3_packet(cls, packet: ESP3Packet) -> "EventTelegram":
+        """Create EventTelegram from an ESP3 packet."""
+
+        if packet.packet_type != ESP3PacketType.EVENT:
+            raise ValueError("ESP3Packet is not an event telegram")
+
+        if len(packet.data) < 1:
+            raise ValueError("ESP3Packet is not a valid event; no data")
+
+        try:
+            event_code = EventCode(packet.data[0])
+        except ValueError:
+            raise ValueError(f"Unknown event code 0x{packet.data[0]:02X} in ESP3Packet")
+
+        return EventTelegram(event_code, packet.data[1:], packet.optional)
+
+    @property
+    def wakeup_cause(self) -> WakeupCause | None:
+        """The reason for the module reset (CO_READY only; None if unknown)."""
+        if self.event_code != EventCode.CO_READY or not self.event_data:
+            return None
+        try:
+            return WakeupCause(self.event_data[0])
+        except ValueError:
+            return None
+
+    @property
+    def transmit_failure(self) -> TransmitFailure | None:
+        """The reason for the failed transmission (CO_TRANSMIT_FAILED only; None if unknown)."""
+        if self.event_code != EventCode.CO_TRANSMIT_FAILED or not self.event_data:
+            return None
+        try:
+            return TransmitFailure(self.event_data[0])
+        except ValueError:
+            return None
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
+from typing import NamedTuple
 
 SYNC_BYTE = 0x55
 
@@ -16,6 +17,16 @@ class ESP3PacketType(IntEnum):
     RADIO_ERP2 = 0x0A
 
 
+class ReceiveTime(NamedTuple):
+    """Time at which a packet was received from the serial port, taken once per read in EnOceanSerialProtocol3."""
+
+    time: float
+    """Wall-clock time in seconds since the epoch."""
+
+    monotonic: float
+    """Monotonic time in seconds, to measure processing latency (see ReceiveLatencyTracker)."""
+
+
 # fmt: off
 CRC8TABLE = [
     0x00, 0x07, 0x0e, 0x09, 0x1c, 0x1b, 0x12, 0x15, 0x38, 0x3f, 0x36, 0x31,
@@ -67,6 +78,8 @@ class ESP3Packet:
     packet_type: ESP3PacketType
     data: bytes
     optional: bytes
+    received: ReceiveTime | None = field(default=None, compare=False)
+    """Time of reception (None for packets created locally)."""
 
     def __repr__(self) -> str:
         return (
@@ -10,7 +10,7 @@ import serial_asyncio_fast as serial_asyncio
 
 from enocean_async.protocol.esp3.response import ResponseTelegram
 
-from .packet import SYNC_BYTE, ESP3Packet, ESP3PacketType, crc8
+from .packet import SYNC_BYTE, ESP3Packet, ESP3PacketType, ReceiveTime, crc8
 
 
 class EnOceanSerialProtocol3(asyncio.Protocol):
@@ -29,6 +29,9 @@ class EnOceanSerialProtocol3(asyncio.Protocol):
 
     def data_received(self, data: bytes):
         """Process the internal buffer to extract complete ESP3 packets and emit them."""
+        # all packets completed by this read were received at the same time
+        clock = self.__gateway.clock
+        received = ReceiveTime(clock.time(), clock.monotonic())
         self.__buffer.extend(data)
 
         while True:
@@ -76,7 +79,7 @@ class EnOceanSerialProtocol3(asyncio.Protocol):
                 continue
 
             # create ESP3Packet and process it
-            pkt = ESP3Packet(ESP3PacketType(packet_type), data, optional)
+            pkt = ESP3Packet(ESP3PacketType(packet_type), data, optional, received)
             self.__gateway.process_esp3_packet(pkt)
 
             # Remove processed bytes
@@ -0,0 +1,72 @@
+"""Reconnect strategy and connection statistics."""
+
+from dataclasses import dataclass
+import random
+
+
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    """When to retry opening the serial connection after it was lost.
+
+    The delay before attempt n is initial_delay * multiplier ** (n - 1), capped at max_delay and randomised by
+    jitter. With multiplier=1 and jitter=0 the gateway retries at a fixed interval.
+    For device ports (paths like /dev/ttyUSB0) the gateway additionally watches the device node while waiting,
+    and retries immediately when a re-plugged stick reappears.
+    """
+
+    initial_delay: float = 1.0
+    """Delay in seconds before the first reconnect attempt."""
+
+    max_delay: float = 60.0
+    """Upper bound of the delay between attempts in seconds."""
+
+    multiplier: float = 2.0
+    """Factor by which the delay grows with every failed attempt."""
+
+    jitter: float = 0.2
+    """Fraction of the delay that is randomised (0 = no jitter)."""
+
+    max_duration: float | None = 3600.0
+    """Give up after this many seconds without a successful reconnect (None = never give up)."""
+
+    poll_interval: float = 0.5
+    """Interval in seconds at which the device node is checked while waiting."""
+
+    def delay(self, attempt: int) -> float:
+        """Return the time in seconds to wait before the given (1-based) attempt."""
+        delay = min(
+            self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1)
+        )
+        return delay * (1.0 - self.jitter * random.random())
+
+
+@dataclass
+class ConnectionStats:
+    """Statistics of connection losses, module resets and of commands issued while disconnected."""
+
+    outages: int = 0
+    """Number of times the connection was lost unexpectedly."""
+
+    reconnect_attempts: int = 0
+    """Number of reconnect attempts (successful or not)."""
+
+    module_resets: int = 0
+    """Number of times the module reported a reset (CO_READY) while connected."""
+
+    last_outage_duration: float | None = None
+    """Duration in seconds of the last outage that ended with a reconnect."""
+
+    total_outage_duration: float = 0.0
+    """Sum of the durations of all outages that ended with a reconnect, in seconds."""
+
+    buffered: int = 0
+    """Number of packets queued while disconnected."""
+
+    flushed: int = 0
+    """Number of buffered packets that were sent after reconnecting."""
+
+    dropped_expired: int = 0
+    """Number of buffered packets discarded because their time-to-live ran out."""
+
+    dropped_overflow: int = 0
+    """Number of packets rejected while disconnected because the buffer was full."""
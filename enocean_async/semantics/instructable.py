@@ -26,3 +26,13 @@ class Instructable(StrEnum):
     SET_SWITCH_OUTPUT = "set_switch_output"
     QUERY_ACTUATOR_STATUS = "query_actuator_status"
     QUERY_ACTUATOR_MEASUREMENT = "query_actuator_measurement"
+
+
+QUERY_INSTRUCTABLES: frozenset[Instructable] = frozenset(
+    {
+        Instructable.QUERY_COVER_POSITION,
+        Instructable.QUERY_ACTUATOR_STATUS,
+        Instructable.QUERY_ACTUATOR_MEASUREMENT,
+    }
+)
+"""Actions that only request a status report from the device and do not change its state."""
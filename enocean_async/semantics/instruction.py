@@ -15,3 +15,11 @@ class Instruction:
 
     entity_id: str = field(default="", kw_only=True)
     """Target entity ID. Encoders use this to determine the target channel or sub-unit."""
+
+    @property
+    def idempotent(self) -> bool:
+        """Whether sending the instruction twice has the same effect as sending it once.
+
+        Non-idempotent instructions are neither coalesced in the send queue nor retried after a response timeout.
+        """
+        return True
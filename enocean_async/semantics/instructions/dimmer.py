@@ -27,3 +27,8 @@ class Dim(Instruction):
 
     switch_on: bool = True
     """SW field: False = switch off, True = switch on."""
+
+    @property
+    def idempotent(self) -> bool:
+        # a relative step applied twice dims twice as far
+        return not self.relative
@@ -4,6 +4,7 @@ from time import time
 from typing import Any, Callable
 
 from ..address import SenderAddress
+from ..protocol.esp3.packet import ReceiveTime
 from .observable import Observable
 
 
@@ -28,6 +29,8 @@ class Observation:
     timestamp: float = field(default_factory=time)
     time_elapsed: float = 0
     source: ObservationSource = ObservationSource.TELEGRAM
+    received: ReceiveTime | None = field(default=None, compare=False)
+    """Time at which the telegram this observation was derived from was received (None for timer events)."""
 
 
 type ObservationCallback = Callable[[Observation], None]
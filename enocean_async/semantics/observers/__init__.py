@@ -1,6 +1,8 @@
 from .cover import COVER_WATCHDOG_TIMEOUT, CoverObserver, cover_factory
+from .filter import EmitFilter
 from .metadata import MetaDataObserver
 from .observer import Observer
+from .pipeline import ObserverPipeline
 from .push_button import (
     CLICKED,
     HELD,
@@ -14,9 +16,11 @@ from .scalar import ScalarObserver, scalar_factory
 
 __all__ = [
     "Observer",
+    "ObserverPipeline",
     "CoverObserver",
     "COVER_WATCHDOG_TIMEOUT",
     "cover_factory",
+    "EmitFilter",
     "MetaDataObserver",
     "PushButtonObserver",
     "F6_02_01_02PushButtonObserver",
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
-import logging
-from time import time
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
+from ...address import Address
 from ..observable import Observable
 from ..observation import Observation, ObservationSource
 from .observer import Observer
@@ -13,32 +12,47 @@ from .observer import Observer
 if TYPE_CHECKING:
     from ...eep.message import EEPMessage
     from ...eep.profile import ObserverFactory
+    from ...timing.wheel import Timer
 
 # Watchdog timeout in seconds to detect when cover movement has stopped
 COVER_WATCHDOG_TIMEOUT = 1.5
 
 
+@dataclass(slots=True)
+class _CoverState:
+    """Per-device state of a CoverObserver."""
+
+    previous_position: int | None = None
+    """Previous position, to derive the cover state from movement."""
+
+    cover_state: str | None = None
+    """The current cover state, to avoid redundant state change emissions."""
+
+    watchdog: Timer | asyncio.TimerHandle | None = None
+    """Watchdog timer to detect when cover movement has stopped."""
+
+
 @dataclass
 class CoverObserver(Observer):
     """Observer that emits position and angle updates for blinds/cover devices."""
 
-    _previous_position: int | None = field(default=None, init=False, repr=False)
-    """Track previous position to derive cover state from movement."""
+    @property
+    def inputs(self) -> frozenset[Observable] | None:
+        return frozenset((Observable.POSITION, Observable.ANGLE))
 
-    _current_cover_state: str | None = field(default=None, init=False, repr=False)
-    """Track the current cover state to avoid redundant state change emissions."""
+    @property
+    def message_types(self) -> frozenset[int] | None:
+        return frozenset((4,))
 
-    _watchdog_task: asyncio.Task | None = field(default=None, init=False, repr=False)
-    """Watchdog task to detect when cover movement has stopped."""
+    def _new_state(self) -> _CoverState:
+        return _CoverState()
 
     def _decode_impl(self, message: EEPMessage) -> None:
         if not message.values:
             return
 
-        if message.message_type is None or message.message_type.id != 4:
-            return
-
-        current_time = time()
+        current_time = self._timestamp(message)
+        sender = message.sender
 
         pos_entity = message.entities.get(Observable.POSITION)
         ang_entity = message.entities.get(Observable.ANGLE)
@@ -50,25 +64,24 @@ class CoverObserver(Observer):
 
         if pos_value is not None:
             values[Observable.POSITION] = pos_value
+            state = self._state(sender)
 
             # Derive cover state from position changes
-            cover_state = self._derive_cover_state(pos_value)
+            cover_state = self._derive_cover_state(pos_value, state.previous_position)
             if cover_state is not None:
                 values[Observable.COVER_STATE] = cover_state
-                self._current_cover_state = cover_state
+                state.cover_state = cover_state
 
                 # Restart watchdog timer if cover is moving
                 if cover_state in ("opening", "closing"):
-                    self._restart_watchdog()
+                    self._restart_watchdog(sender, state)
 
                 if cover_state == "stopped":
                     # If we receive a stopped state from the message, cancel the watchdog
-                    if (
-                        self._watchdog_task is not None
-                        and not self._watchdog_task.done()
-                    ):
-                        self._watchdog_task.cancel()
-            self._previous_position = pos_value
+                    if state.watchdog is not None:
+                        state.watchdog.cancel()
+                        state.watchdog = None
+            state.previous_position = pos_value
 
         if ang_value is not None:
             values[Observable.ANGLE] = ang_value
@@ -76,44 +89,66 @@ class CoverObserver(Observer):
         if values:
             self._emit(
                 Observation(
-                    device_id=self.device_address,
+                    device_id=sender,
                     entity_id="cover",
                     values=values,
                     timestamp=current_time,
                     source=ObservationSource.TELEGRAM,
+                    received=message.received,
                 )
             )
 
-    def _restart_watchdog(self) -> None:
+    def _restart_watchdog(self, device_address: Address, state: _CoverState) -> None:
         """Cancel existing watchdog and start a new one."""
-        if self._watchdog_task is not None and not self._watchdog_task.done():
-            self._watchdog_task.cancel()
-        self._watchdog_task = asyncio.create_task(self._watchdog_timer())
-
-    async def _watchdog_timer(self) -> None:
-        """Watchdog timer that emits stopped state after timeout."""
-        try:
-            await asyncio.sleep(COVER_WATCHDOG_TIMEOUT)
-            # Timeout elapsed, emit stopped state
-            self._emit(
-                Observation(
-                    device_id=self.device_address,
-                    entity_id="cover",
-                    values={Observable.COVER_STATE: "stopped"},
-                    timestamp=time(),
-                    source=ObservationSource.TIMER,
-                )
+        if state.watchdog is not None:
+            state.watchdog.cancel()
+        state.watchdog = self._call_later(
+            COVER_WATCHDOG_TIMEOUT, self._watchdog_expired, device_address, state
+        )
+
+    def _watchdog_expired(self, device_address: Address, state: _CoverState) -> None:
+        """Emit stopped state after the watchdog timeout elapsed without a new position."""
+        state.watchdog = None
+        self._emit(
+            Observation(
+                device_id=device_address,
+                entity_id="cover",
+                values={Observable.COVER_STATE: "stopped"},
+                timestamp=self.clock.time(),
+                source=ObservationSource.TIMER,
             )
-            self._current_cover_state = "stopped"
-        except asyncio.CancelledError:
-            pass  # Timer was cancelled due to new message
+        )
+        state.cover_state = "stopped"
+
+    def snapshot_state(self, device_address=None) -> dict[str, Any] | None:
+        state = self._states.get(self._address(device_address))
+        if state is None:
+            return None
+        return {
+            "previous_position": state.previous_position,
+            "cover_state": state.cover_state,
+        }
+
+    def restore_state(self, state: dict[str, Any], device_address=None) -> None:
+        record = self._state(self._address(device_address))
+        record.previous_position = state.get("previous_position")
+        record.cover_state = state.get("cover_state")
+
+    def forget(self, device_address: Address) -> None:
+        state = self._states.pop(device_address, None)
+        if state is not None and state.watchdog is not None:
+            state.watchdog.cancel()
 
     def stop(self) -> None:
-        """Stop the watchdog task."""
-        if self._watchdog_task is not None and not self._watchdog_task.done():
-            self._watchdog_task.cancel()
-
-    def _derive_cover_state(self, current_pos: int) -> str | None:
+        """Stop all watchdog timers."""
+        for state in self._states.values():
+            if state.watchdog is not None:
+                state.watchdog.cancel()
+                state.watchdog = None
+
+    def _derive_cover_state(
+        self, current_pos: int, previous_pos: int | None
+    ) -> str | None:
         """Derive cover state from current position and previous position."""
 
         if current_pos == 0:
@@ -121,14 +156,14 @@ class CoverObserver(Observer):
         elif current_pos == 100:
             return "closed"
 
-        if self._previous_position is None:
+        if previous_pos is None:
             # First message, determine state from absolute position
             return None  # Unknown state until we see a change, or we can infer from absolute position
 
         # Position changed, determine direction of movement
-        if current_pos > self._previous_position:
+        if current_pos > previous_pos:
             return "closing"
-        elif current_pos < self._previous_position:
+        elif current_pos < previous_pos:
             return "opening"
         else:
             return "stopped"  # No change in position, state remains the same
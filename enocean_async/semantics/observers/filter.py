@@ -0,0 +1,59 @@
+"""Emission filter policies for observers that report plain scalar values."""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class EmitFilter:
+    """Policy deciding whether a newly decoded value is worth emitting as an Observation.
+
+    A value is emitted if (in this order of precedence):
+    - nothing has been emitted before,
+    - the ``heartbeat`` interval has elapsed since the last emission,
+    - the ``min_interval`` has elapsed since the last emission and the value differs
+      from the last emitted value by more than the deadband.
+
+    With all defaults, the filter suppresses exact repetitions of the last emitted value.
+    """
+
+    deadband: float = 0.0
+    """Absolute deadband: numeric changes up to this amount are suppressed (in the observable's unit)."""
+
+    relative_deadband: float = 0.0
+    """Relative deadband as a fraction of the last emitted value (e.g. 0.02 for 2 %)."""
+
+    min_interval: float = 0.0
+    """Minimum time in seconds between two emissions."""
+
+    heartbeat: float | None = None
+    """If set, force an emission when this many seconds have elapsed since the last emission, even if unchanged."""
+
+    def should_emit(
+        self,
+        value: Any,
+        timestamp: float,
+        last_value: Any,
+        last_timestamp: float | None,
+    ) -> bool:
+        """Decide whether ``value`` observed at ``timestamp`` should be emitted, given the last emission."""
+        if last_timestamp is None:
+            return True
+
+        elapsed = timestamp - last_timestamp
+        if self.heartbeat is not None and elapsed >= self.heartbeat:
+            return True
+
+        if elapsed < self.min_interval:
+            return False
+
+        if _is_number(value) and _is_number(last_value):
+            threshold = max(self.deadband, self.relative_deadband * abs(last_value))
+            if threshold > 0:
+                return abs(value - last_value) > threshold
+
+        return value != last_value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
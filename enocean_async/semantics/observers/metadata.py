@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from time import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from .observer import Observer
 
 if TYPE_CHECKING:
+    from ...address import Address
     from ...eep.message import EEPMessage
+    from ...protocol.esp3.packet import ReceiveTime
 from ..observable import Observable
 from ..observation import Observation, ObservationSource
 
@@ -23,45 +24,72 @@ class MetaDataObserver(Observer):
     """
 
     def __init__(self, device_address, on_state_change):
-        """Initialize the metadata observer."""
+        """Initialize the metadata observer (pass device_address=None to share it between devices)."""
         super().__init__(device_address, on_state_change)
-        self._telegram_count = 0
+
+    # the per-device state is just the telegram count (a plain int in the state table)
+
+    def snapshot_state(self, device_address=None) -> dict[str, Any] | None:
+        count = self._states.get(self._address(device_address))
+        return None if count is None else {"telegram_count": count}
+
+    def restore_state(self, state: dict[str, Any], device_address=None) -> None:
+        self._states[self._address(device_address)] = state.get("telegram_count", 0)
+
+    def update_rssi(
+        self, device_address: Address, rssi: int, received: ReceiveTime | None
+    ) -> None:
+        """Emit the RSSI of a stronger copy of the device's last telegram (copies are not decoded, see DuplicateFilter)."""
+        self._emit(
+            Observation(
+                device_id=device_address,
+                entity_id="rssi",
+                values={Observable.RSSI: rssi},
+                timestamp=received.time if received is not None else self.clock.time(),
+                source=ObservationSource.TELEGRAM,
+                received=received,
+            )
+        )
 
     def _decode_impl(self, message: EEPMessage) -> None:
         """Decode metadata from the message."""
-        self._telegram_count += 1
-        timestamp = time()
+        sender = message.sender
+        telegram_count = self._states[sender] = self._states.get(sender, 0) + 1
+        timestamp = self._timestamp(message)
 
         # Emit RSSI if available
         if message.rssi is not None:
             self._emit(
                 Observation(
-                    device_id=self.device_address,
+                    device_id=sender,
                     entity_id="rssi",
                     values={Observable.RSSI: message.rssi},
                     timestamp=timestamp,
                     source=ObservationSource.TELEGRAM,
+                    received=message.received,
                 )
             )
 
         # Always emit last_seen timestamp
         self._emit(
             Observation(
-                device_id=self.device_address,
+                device_id=sender,
                 entity_id="last_seen",
                 values={Observable.LAST_SEEN: timestamp},
                 timestamp=timestamp,
                 source=ObservationSource.TELEGRAM,
+                received=message.received,
             )
         )
 
         # Always emit telegram count
         self._emit(
             Observation(
-                device_id=self.device_address,
+                device_id=sender,
                 entity_id="telegram_count",
-                values={Observable.TELEGRAM_COUNT: self._telegram_count},
+                values={Observable.TELEGRAM_COUNT: telegram_count},
                 timestamp=timestamp,
                 source=ObservationSource.TELEGRAM,
+                received=message.received,
             )
         )
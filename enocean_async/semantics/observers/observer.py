@@ -2,31 +2,68 @@ from __future__ import annotations
 
 from abc import ABC
 import asyncio
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from ...address import Address
+from ...timing.clock import Clock, SystemClock
+from ..observable import Observable
 from ..observation import Observation, ObservationCallback
 
 if TYPE_CHECKING:
     from ...eep.message import EEPMessage
+    from ...timing.wheel import Timer, TimingWheel
 
 
 @dataclass
 class Observer(ABC):
     """An observer represents a specific functionality of a device, such as a button, a temperature sensor, or a motion detector.
-    It is responsible for decoding EEP messages related to that functionality and emitting observations accordingly."""
+    It is responsible for decoding EEP messages related to that functionality and emitting observations accordingly.
+
+    An observer is either bound to a single device (device_address set) or shared by all devices of an EEP (device_address None).
+    In both cases, mutable per-device state is kept in a table of small records keyed by the sender address, so a single shared
+    instance can serve thousands of devices.
+    """
+
+    device_address: Address | None
+    """The device this observer is bound to, or None to decode messages from any sender."""
 
-    device_address: Address
     on_observation: Optional[ObservationCallback] = None
 
+    timers: TimingWheel | None = field(default=None, repr=False)
+    """Timing wheel for the observer's timers (set by the gateway); if None, timers are scheduled on the event loop directly."""
+
+    clock: Clock = field(default_factory=SystemClock, repr=False)
+    """Clock for observation timestamps and durations (set by the gateway)."""
+
+    _states: dict[Address, Any] = field(default_factory=dict, init=False, repr=False)
+    """Per-device state records keyed by device address; created on a device's first telegram (see _state())."""
+
+    @property
+    def inputs(self) -> frozenset[Observable] | None:
+        """The observables this observer reads from EEPMessage.entities, or None if it must see every message.
+
+        Used by ObserverPipeline to dispatch a message only to observers whose inputs are present in it.
+        """
+        return None
+
+    @property
+    def message_types(self) -> frozenset[int] | None:
+        """The EEP message type IDs this observer handles, or None for all message types."""
+        return None
+
     def decode(self, message: EEPMessage) -> None:
         """Decode the given EEPMessage according to this observer's logic.
 
-        Only processes messages from the bound device.
+        Only processes messages from the bound device (if any) and of the handled message types (if restricted).
         Emits observations via the on_observation callback.
         """
-        if message.sender != self.device_address:
+        if self.device_address is not None and message.sender != self.device_address:
+            return
+        types = self.message_types
+        if types is not None and (
+            message.message_type is None or message.message_type.id not in types
+        ):
             return
 
         self._decode_impl(message)
@@ -35,6 +72,52 @@ class Observer(ABC):
         """Implementation of decode logic. Override in subclasses."""
         raise NotImplementedError("Subclasses must implement the _decode_impl method.")
 
+    def _new_state(self) -> Any:
+        """Return a fresh per-device state record. Override in stateful subclasses."""
+        raise NotImplementedError(f"{type(self).__name__} keeps no per-device state")
+
+    def _state(self, device_address: Address) -> Any:
+        """Return the state record of the given device, creating it if necessary."""
+        state = self._states.get(device_address)
+        if state is None:
+            state = self._states[device_address] = self._new_state()
+        return state
+
+    def _address(self, device_address: Address | None) -> Address:
+        """Return the given device address, or the bound device's address if None."""
+        return self.device_address if device_address is None else device_address
+
+    def snapshot_state(
+        self, device_address: Address | None = None
+    ) -> dict[str, Any] | None:
+        """Return the internal state kept for a device (default: the bound device) as a JSON-serializable dict, or None if there is none.
+
+        Used to persist observer internals across restarts; see restore_state().
+        """
+        return None
+
+    def restore_state(
+        self, state: dict[str, Any], device_address: Address | None = None
+    ) -> None:
+        """Restore internal state of a device (default: the bound device) previously returned by snapshot_state()."""
+
+    def forget(self, device_address: Address) -> None:
+        """Drop all state kept for the given device."""
+        self._states.pop(device_address, None)
+
+    def _timestamp(self, message: EEPMessage) -> float:
+        """Return the time at which the message's telegram was received (the current time for messages created locally)."""
+        received = message.received
+        return received.time if received is not None else self.clock.time()
+
+    def _call_later(
+        self, delay: float, callback: Callable[..., Any], *args
+    ) -> Timer | asyncio.TimerHandle:
+        """Call callback(*args) after delay seconds; the returned timer can be cancelled."""
+        if self.timers is not None:
+            return self.timers.schedule(delay, callback, *args)
+        return asyncio.get_running_loop().call_later(delay, callback, *args)
+
     def _emit(self, observation: Observation) -> None:
         """Emit an observation via callback, scheduled on the running event loop."""
         if self.on_observation:
@@ -0,0 +1,74 @@
+"""Observable-indexed dispatch of EEP messages to observers."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+from ..observable import Observable
+from .observer import Observer
+
+if TYPE_CHECKING:
+    from ...eep.message import EEPMessage
+
+type _DispatchTable = tuple[
+    tuple[Observer, ...], dict[Observable, tuple[Observer, ...]]
+]
+
+
+class ObserverPipeline:
+    """Dispatches EEP messages only to the observers that can make use of them.
+
+    Observers declare the observables they read (Observer.inputs) and the message types they handle
+    (Observer.message_types). Per message type, the pipeline indexes the observers by observable, so
+    selecting the observers for a message costs one lookup per observable present in the message instead
+    of one decode() call per observer. Observers without declared inputs receive every message.
+    """
+
+    __slots__ = ("observers", "_tables", "_dedupe")
+
+    def __init__(self, observers: Sequence[Observer]) -> None:
+        self.observers: tuple[Observer, ...] = tuple(observers)
+        """All observers of the pipeline, in dispatch order."""
+
+        # dispatch table per message type ID (None for messages without message type), built on first use
+        self._tables: dict[int | None, _DispatchTable] = {}
+
+        # observers with several inputs can be selected more than once for a message
+        self._dedupe: bool = any(
+            o.inputs is not None and len(o.inputs) > 1 for o in self.observers
+        )
+
+    def select(self, message: EEPMessage) -> list[Observer]:
+        """Return the observers to which the given message has to be dispatched, in dispatch order."""
+        message_type = message.message_type
+        key = message_type.id if message_type is not None else None
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self.__build_table(key)
+
+        always, by_observable = table
+        selected = list(always)
+        for observable in message.entities:
+            observers = by_observable.get(observable)
+            if observers:
+                selected.extend(observers)
+
+        if self._dedupe and len(selected) > 1:
+            # observers are dataclasses (compared by value, unhashable), so deduplicate by identity
+            return list({id(o): o for o in selected}.values())
+        return selected
+
+    def __build_table(self, message_type: int | None) -> _DispatchTable:
+        always: list[Observer] = []
+        by_observable: dict[Observable, list[Observer]] = {}
+        for observer in self.observers:
+            types = observer.message_types
+            if types is not None and message_type not in types:
+                continue
+            inputs = observer.inputs
+            if inputs is None:
+                always.append(observer)
+            else:
+                for observable in inputs:
+                    by_observable.setdefault(observable, []).append(observer)
+        return tuple(always), {k: tuple(v) for k, v in by_observable.items()}
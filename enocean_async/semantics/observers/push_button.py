@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass, field
-from time import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from ...address import Address
 from .observer import Observer
 
 if TYPE_CHECKING:
     from ...eep.message import EEPMessage
     from ...eep.profile import ObserverFactory
+    from ...protocol.esp3.packet import ReceiveTime
+    from ...timing.wheel import Timer
 from ..observable import Observable
 from ..observation import Observation, ObservationSource
 
@@ -19,6 +21,23 @@ CLICKED = "clicked"
 HELD = "held"
 
 
+@dataclass(slots=True)
+class _PushButtonState:
+    """Per-device state of a PushButtonObserver (all keyed by button ID)."""
+
+    pressed: dict[str, float] = field(default_factory=dict)
+    """Timestamp of the last press event."""
+
+    held: dict[str, bool] = field(default_factory=dict)
+    """Indicates whether the button was held."""
+
+    hold_timers: dict[str, Timer | asyncio.TimerHandle] = field(default_factory=dict)
+    """Hold timers, to track when to emit `held` events (after hold threshold elapses)."""
+
+    release_timers: dict[str, Timer | asyncio.TimerHandle] = field(default_factory=dict)
+    """Release timers, to track when to emit `released` events (timeout)."""
+
+
 @dataclass
 class PushButtonObserver(Observer):
     """Base observer for push button devices.
@@ -36,153 +55,195 @@ class PushButtonObserver(Observer):
     _RELEASE_TIMEOUT: float = 30.0
     """Time in seconds after which a button is considered released, if no release telegram was received."""
 
-    _last_pressed_timestamps: dict[str, float] = field(default_factory=dict)
-    """Timestamp of the last press event (for each button ID)."""
-
-    _button_was_held: dict[str, bool] = field(default_factory=dict)
-    """Indicates whether the button was held (for each button ID)."""
-
-    _hold_timers: dict[str, asyncio.TimerHandle] = field(default_factory=dict)
-    """Hold timers for each button ID, to track when to emit `held` events (after hold threshold elapses)."""
-
-    _release_timers: dict[str, asyncio.TimerHandle] = field(default_factory=dict)
-    """Release timers for each button ID, to track when to emit `released` events (timeout)."""
-
-    def _emit_held(self, button_id: str, press_time: float) -> None:
+    def _new_state(self) -> _PushButtonState:
+        return _PushButtonState()
+
+    def snapshot_state(self, device_address=None) -> dict[str, Any] | None:
+        """Return press timestamps and held flags of all currently pressed buttons (timers are not included)."""
+        state = self._states.get(self._address(device_address))
+        if state is None:
+            return None
+        return {"pressed": dict(state.pressed), "held": dict(state.held)}
+
+    def restore_state(self, state: dict[str, Any], device_address=None) -> None:
+        """Restore pressed/held buttons, so that a lost release is still reported as `released` on the next press or release telegram."""
+        record = self._state(self._address(device_address))
+        record.pressed = dict(state.get("pressed", {}))
+        record.held = dict(state.get("held", {}))
+
+    def forget(self, device_address: Address) -> None:
+        state = self._states.pop(device_address, None)
+        if state is not None:
+            for timer in (*state.hold_timers.values(), *state.release_timers.values()):
+                timer.cancel()
+
+    def _emit_held(
+        self, device_address: Address, button_id: str, press_time: float
+    ) -> None:
         """Emit held event (called by hold timer)."""
-        if button_id not in self._last_pressed_timestamps:
+        state = self._state(device_address)
+        if button_id not in state.pressed:
             return
 
-        duration = time() - press_time
-        self._button_was_held[button_id] = True
+        now = self.clock.time()
+        duration = now - press_time
+        state.held[button_id] = True
 
         self._emit(
             Observation(
-                device_id=self.device_address,
+                device_id=device_address,
                 entity_id=button_id,
                 values={Observable.PUSH_BUTTON: HELD},
-                timestamp=time(),
+                timestamp=now,
                 time_elapsed=duration,
                 source=ObservationSource.TIMER,
             )
         )
 
-    def _emit_released(self, button_id: str, press_time: float) -> None:
+    def _emit_released(
+        self, device_address: Address, button_id: str, press_time: float
+    ) -> None:
         """Emit released event (called by release-timeout timer)."""
-        if button_id not in self._last_pressed_timestamps:
+        state = self._state(device_address)
+        if button_id not in state.pressed:
             return
 
-        duration = time() - press_time
+        now = self.clock.time()
+        duration = now - press_time
 
-        if button_id in self._hold_timers:
-            self._hold_timers[button_id].cancel()
-            del self._hold_timers[button_id]
+        if button_id in state.hold_timers:
+            state.hold_timers[button_id].cancel()
+            del state.hold_timers[button_id]
 
         self._emit(
             Observation(
-                device_id=self.device_address,
+                device_id=device_address,
                 entity_id=button_id,
                 values={Observable.PUSH_BUTTON: RELEASED},
-                timestamp=time(),
+                timestamp=now,
                 time_elapsed=duration,
                 source=ObservationSource.TIMER,
             )
         )
 
-        if button_id in self._release_timers:
-            del self._release_timers[button_id]
+        if button_id in state.release_timers:
+            del state.release_timers[button_id]
 
-    def _button_pressed(self, button_id: str) -> None:
-        """Handle a button press."""
-        current_time = time()
-        loop = asyncio.get_running_loop()
+    def _button_pressed(
+        self,
+        device_address: Address,
+        button_id: str,
+        received: ReceiveTime | None = None,
+    ) -> None:
+        """Handle a button press (received: time of the press telegram, if known)."""
+        current_time = received.time if received is not None else self.clock.time()
+        state = self._state(device_address)
 
         # if button was held, emit a `released` event before emitting the new `pressed` event;
         # this can only happen if the release telegram got lost
-        if self._button_was_held.get(button_id, False):
+        if state.held.get(button_id, False):
             self._emit(
                 Observation(
-                    device_id=self.device_address,
+                    device_id=device_address,
                     entity_id=button_id,
                     values={Observable.PUSH_BUTTON: RELEASED},
                     timestamp=current_time,
                     source=ObservationSource.TELEGRAM,
+                    received=received,
                 )
             )
 
         # emit pressed event
         self._emit(
             Observation(
-                device_id=self.device_address,
+                device_id=device_address,
                 entity_id=button_id,
                 values={Observable.PUSH_BUTTON: PRESSED},
                 timestamp=current_time,
                 source=ObservationSource.TELEGRAM,
+                received=received,
             )
         )
 
         # store press time and reset held state
-        self._last_pressed_timestamps[button_id] = current_time
-        self._button_was_held[button_id] = False
+        state.pressed[button_id] = current_time
+        state.held[button_id] = False
 
         # restart hold timer
-        if button_id in self._hold_timers:
-            self._hold_timers[button_id].cancel()
-        self._hold_timers[button_id] = loop.call_later(
-            self._HOLD_THRESHOLD, self._emit_held, button_id, current_time
+        if button_id in state.hold_timers:
+            state.hold_timers[button_id].cancel()
+        state.hold_timers[button_id] = self._call_later(
+            self._HOLD_THRESHOLD,
+            self._emit_held,
+            device_address,
+            button_id,
+            current_time,
         )
 
         # restart release timeout timer
-        if button_id in self._release_timers:
-            self._release_timers[button_id].cancel()
-        self._release_timers[button_id] = loop.call_later(
-            self._RELEASE_TIMEOUT, self._emit_released, button_id, current_time
+        if button_id in state.release_timers:
+            state.release_timers[button_id].cancel()
+        state.release_timers[button_id] = self._call_later(
+            self._RELEASE_TIMEOUT,
+            self._emit_released,
+            device_address,
+            button_id,
+            current_time,
         )
 
-    def _button_released(self, button_id: str, current_time: float) -> None:
+    def _button_released(
+        self,
+        device_address: Address,
+        button_id: str,
+        current_time: float,
+        received: ReceiveTime | None = None,
+    ) -> None:
         """Handle a button release."""
-        press_time = self._last_pressed_timestamps.get(button_id)
+        state = self._state(device_address)
+        press_time = state.pressed.get(button_id)
         if press_time is None:
             return  # release without prior press — ignore
 
         press_duration = current_time - press_time
 
-        if button_id in self._hold_timers:
-            self._hold_timers[button_id].cancel()
-            del self._hold_timers[button_id]
+        if button_id in state.hold_timers:
+            state.hold_timers[button_id].cancel()
+            del state.hold_timers[button_id]
 
-        if button_id in self._release_timers:
-            self._release_timers[button_id].cancel()
-            del self._release_timers[button_id]
+        if button_id in state.release_timers:
+            state.release_timers[button_id].cancel()
+            del state.release_timers[button_id]
 
-        was_held = self._button_was_held.get(button_id, False)
+        was_held = state.held.get(button_id, False)
 
         if was_held:
             self._emit(
                 Observation(
-                    device_id=self.device_address,
+                    device_id=device_address,
                     entity_id=button_id,
                     values={Observable.PUSH_BUTTON: RELEASED},
                     timestamp=current_time,
                     time_elapsed=press_duration,
                     source=ObservationSource.TELEGRAM,
+                    received=received,
                 )
             )
         elif press_duration < self._HOLD_THRESHOLD:
             self._emit(
                 Observation(
-                    device_id=self.device_address,
+                    device_id=device_address,
                     entity_id=button_id,
                     values={Observable.PUSH_BUTTON: CLICKED},
                     timestamp=current_time,
                     time_elapsed=press_duration,
                     source=ObservationSource.TELEGRAM,
+                    received=received,
                 )
             )
 
-        del self._last_pressed_timestamps[button_id]
-        if button_id in self._button_was_held:
-            del self._button_was_held[button_id]
+        del state.pressed[button_id]
+        if button_id in state.held:
+            del state.held[button_id]
 
     def _decode_impl(self, message: EEPMessage) -> None:
         """Decode button messages into semantic state changes with timing."""
@@ -232,20 +293,30 @@ class F6_02_01_02PushButtonObserver(PushButtonObserver):
             sa_val = sa_value.value if sa_value else None
             r2_val = r2_value.value if r2_value else None
 
-            current_time = time()
+            current_time = self._timestamp(message)
 
             if eb_val == "pressed" and r1_val is not None:
                 r1_id = r1_val
                 r2_id = r2_val
                 if sa_val == "2nd action valid" and r2_val is not None:
                     combo_id = self._combine_button_ids(r1_id, r2_id)
-                    self._button_pressed(button_id=combo_id)
+                    self._button_pressed(
+                        message.sender, button_id=combo_id, received=message.received
+                    )
                 else:
-                    self._button_pressed(button_id=r1_id)
+                    self._button_pressed(
+                        message.sender, button_id=r1_id, received=message.received
+                    )
             elif eb_val == "released":
-                for button_id in list(self._last_pressed_timestamps.keys()):
+                state = self._states.get(message.sender)
+                if state is None:
+                    return
+                for button_id in list(state.pressed.keys()):
                     self._button_released(
-                        button_id=button_id, current_time=current_time
+                        message.sender,
+                        button_id=button_id,
+                        current_time=current_time,
+                        received=message.received,
                     )
 
 
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from time import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from ...address import Address
+from .filter import EmitFilter
 from .observer import Observer
 
 if TYPE_CHECKING:
@@ -35,6 +36,37 @@ class ScalarObserver(Observer):
     entity_id_not_applicable: int | None = field(default=None, kw_only=True)
     """Raw entity_id_field value that means 'not channel-specific'; falls back to entity_id."""
 
+    emit_filter: EmitFilter | None = field(default=None, kw_only=True)
+    """Optional policy to suppress unchanged or insignificant updates. If None, every decoded value is emitted."""
+
+    _device_filters: dict[Address, EmitFilter] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    """Emit filters for individual devices, taking precedence over emit_filter."""
+
+    _last_emitted: dict[tuple[Address, str], tuple[Any, float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    """Last emitted (value, timestamp) per (device address, entity ID); only maintained if an emit filter applies."""
+
+    @property
+    def inputs(self) -> frozenset[Observable] | None:
+        return frozenset((self.observable,))
+
+    def set_device_emit_filter(
+        self, device_address: Address, emit_filter: EmitFilter | None
+    ) -> None:
+        """Set (or with None: remove) the emit filter used for a single device instead of emit_filter."""
+        if emit_filter is None:
+            self._device_filters.pop(device_address, None)
+        else:
+            self._device_filters[device_address] = emit_filter
+
+    def forget(self, device_address: Address) -> None:
+        self._device_filters.pop(device_address, None)
+        for key in [k for k in self._last_emitted if k[0] == device_address]:
+            del self._last_emitted[key]
+
     def _resolve_entity_id(self, message: EEPMessage) -> str:
         """Determine the entity_id for this state change."""
         if self.entity_id_field is not None:
@@ -48,13 +80,32 @@ class ScalarObserver(Observer):
         if v is None or v.value is None:
             return
 
+        entity_id = self._resolve_entity_id(message)
+        timestamp = self._timestamp(message)
+
+        sender = message.sender
+        emit_filter = (
+            self._device_filters.get(sender, self.emit_filter)
+            if self._device_filters
+            else self.emit_filter
+        )
+        if emit_filter is not None:
+            key = (sender, entity_id)
+            last_value, last_timestamp = self._last_emitted.get(key, (None, None))
+            if not emit_filter.should_emit(
+                v.value, timestamp, last_value, last_timestamp
+            ):
+                return
+            self._last_emitted[key] = (v.value, timestamp)
+
         self._emit(
             Observation(
-                device_id=self.device_address,
-                entity_id=self._resolve_entity_id(message),
+                device_id=sender,
+                entity_id=entity_id,
                 values={self.observable: v.value},
-                timestamp=time(),
+                timestamp=timestamp,
                 source=ObservationSource.TELEGRAM,
+                received=message.received,
             )
         )
 
@@ -65,6 +116,7 @@ def scalar_factory(
     entity_id: str = "",
     entity_id_field: str | None = None,
     entity_id_not_applicable: int | None = None,
+    emit_filter: EmitFilter | None = None,
 ) -> ObserverFactory:
     """Return an ``ObserverFactory`` that creates a ``ScalarObserver`` for ``observable``.
 
@@ -73,6 +125,7 @@ def scalar_factory(
         entity_id: Static entity ID for the Observation (defaults to observable.value).
         entity_id_field: Optional field ID to read the entity ID from (e.g. ``"I/O"`` for D2-01).
         entity_id_not_applicable: Raw field value meaning "not channel-specific"; falls back to entity_id.
+        emit_filter: Optional emission filter applied to every device of this EEP.
     """
     from ...eep.profile import ObserverFactory
 
@@ -84,5 +137,6 @@ def scalar_factory(
             entity_id=entity_id,
             entity_id_field=entity_id_field,
             entity_id_not_applicable=entity_id_not_applicable,
+            emit_filter=emit_filter,
         ),
     )
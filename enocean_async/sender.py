@@ -0,0 +1,104 @@
+"""Assignment of the sender IDs in a module's base ID range to devices."""
+
+import heapq
+from typing import Final, Iterable
+
+from .address import EURID, BaseAddress, SenderAddress
+
+BASE_ID_RANGE: Final = 128
+"""Number of consecutive sender IDs starting at the base ID that a module may use."""
+
+
+class SenderIdAllocator:
+    """Hands out unused sender IDs (base ID + 0 … 127) to devices, with O(1) lookup in both directions.
+
+    Actuators learn the sender ID they are controlled from, so giving every actuator its own sender ID allows
+    controlling them individually. Offsets listed in reserved (by default offset 0, the base ID itself, which the
+    gateway uses as its default sender) are never handed out by allocate(), but may be claimed explicitly.
+    """
+
+    def __init__(self, base_id: BaseAddress, reserved: Iterable[int] = (0,)) -> None:
+        self.__base = base_id.to_number()
+        self.__base_id = base_id
+        self.__owners: list[EURID | BaseAddress | None] = [None] * BASE_ID_RANGE
+        self.__offsets: dict[EURID | BaseAddress, int] = {}
+        reserved = frozenset(reserved)
+        # free offsets, smallest first; entries of offsets claimed in the meantime are skipped when popped
+        self.__free: list[int] = [o for o in range(BASE_ID_RANGE) if o not in reserved]
+
+    @property
+    def base_id(self) -> BaseAddress:
+        return self.__base_id
+
+    def __len__(self) -> int:
+        """Number of sender IDs currently assigned to devices."""
+        return len(self.__offsets)
+
+    def offset(self, sender: SenderAddress) -> int | None:
+        """Return the offset of a sender ID within the base ID range, or None if it is outside the range."""
+        offset = sender.to_number() - self.__base
+        return offset if 0 <= offset < BASE_ID_RANGE else None
+
+    def allocate(self, device: EURID | BaseAddress) -> BaseAddress:
+        """Return the sender ID assigned to the device, assigning the lowest unused one if it has none yet.
+
+        Raises:
+            ValueError: If all sender IDs are in use.
+        """
+        offset = self.__offsets.get(device)
+        if offset is not None:
+            return self.__sender(offset)
+
+        while self.__free:
+            offset = heapq.heappop(self.__free)
+            if self.__owners[offset] is None:
+                self.__assign(device, offset)
+                return self.__sender(offset)
+        raise ValueError(
+            f"All {BASE_ID_RANGE} sender IDs of base ID {self.__base_id} are in use"
+        )
+
+    def claim(self, device: EURID | BaseAddress, sender: SenderAddress) -> None:
+        """Record that the device uses the given sender ID (e.g. one it was taught in with earlier).
+
+        Raises:
+            ValueError: If the sender ID is outside the base ID range or assigned to another device.
+        """
+        offset = self.offset(sender)
+        if offset is None:
+            raise ValueError(
+                f"{sender} is not in the sender ID range of base ID {self.__base_id}"
+            )
+        owner = self.__owners[offset]
+        if owner is not None:
+            if owner == device:
+                return
+            raise ValueError(f"Sender ID {sender} is already assigned to {owner}")
+        self.release(device)
+        self.__assign(device, offset)
+
+    def release(self, device: EURID | BaseAddress) -> BaseAddress | None:
+        """Make the device's sender ID available again; returns the released sender ID (if any)."""
+        offset = self.__offsets.pop(device, None)
+        if offset is None:
+            return None
+        self.__owners[offset] = None
+        heapq.heappush(self.__free, offset)
+        return self.__sender(offset)
+
+    def sender_for(self, device: EURID | BaseAddress) -> BaseAddress | None:
+        """Return the sender ID assigned to the device, or None."""
+        offset = self.__offsets.get(device)
+        return self.__sender(offset) if offset is not None else None
+
+    def owner(self, sender: SenderAddress) -> EURID | BaseAddress | None:
+        """Return the device the sender ID is assigned to, or None."""
+        offset = self.offset(sender)
+        return self.__owners[offset] if offset is not None else None
+
+    def __assign(self, device: EURID | BaseAddress, offset: int) -> None:
+        self.__owners[offset] = device
+        self.__offsets[device] = offset
+
+    def __sender(self, offset: int) -> BaseAddress:
+        return BaseAddress(self.__base + offset)
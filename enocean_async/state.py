@@ -0,0 +1,202 @@
+"""In-memory store of the last known state of every entity observable."""
+
+from array import array
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from .address import SenderAddress
+from .semantics.observable import Observable
+from .semantics.observation import Observation
+
+type EntityKey = tuple[SenderAddress, str, Observable]
+"""Unique key of an observable of a physical entity: (device address, entity ID, observable)."""
+
+
+class EntityState(NamedTuple):
+    """The last known state of one observable of an entity."""
+
+    value: Any
+    """The last reported value."""
+
+    unit: str | None
+    """The unit of the value (always the observable's native unit)."""
+
+    last_changed: float
+    """Timestamp of the observation that last changed the value."""
+
+    last_updated: float
+    """Timestamp of the last observation reporting this observable (changed or not)."""
+
+    sequence: int
+    """Change-sequence number of the last update; increases monotonically across the store."""
+
+
+class StateStore:
+    """Current-state store fed with Observations, keyed by (address, entity_id, observable).
+
+    State is kept in a columnar layout (one list/array per attribute, indexed via a single dict),
+    so point lookups are O(1) and full snapshots only walk flat columns. Every update is
+    assigned a change-sequence number; pollers can remember the store's ``sequence`` and later
+    fetch only the entities updated since via ``changed_since()``.
+    """
+
+    __slots__ = (
+        "_index",
+        "_keys",
+        "_values",
+        "_last_changed",
+        "_last_updated",
+        "_sequences",
+        "_recent",
+        "_sequence",
+    )
+
+    def __init__(self) -> None:
+        self._index: dict[EntityKey, int] = {}
+        self._keys: list[EntityKey] = []
+        self._values: list[Any] = []
+        self._last_changed: array = array("d")
+        self._last_updated: array = array("d")
+        self._sequences: array = array("Q")
+
+        # keys ordered by their last update (oldest first), used for changed_since()
+        self._recent: dict[EntityKey, None] = {}
+        self._sequence: int = 0
+
+    @property
+    def sequence(self) -> int:
+        """The change-sequence number of the most recent update (0 if the store is empty)."""
+        return self._sequence
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: EntityKey) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[EntityKey]:
+        return iter(self._keys)
+
+    def update(self, observation: Observation) -> None:
+        """Update the store with all observable values of the given Observation."""
+        timestamp = observation.timestamp
+        for observable, value in observation.values.items():
+            self.set(
+                (observation.device_id, observation.entity_id, observable),
+                value,
+                timestamp,
+            )
+
+    def set(self, key: EntityKey, value: Any, timestamp: float) -> None:
+        """Set the value of a single entity observable, observed at the given timestamp."""
+        self._sequence += 1
+        i = self._index.get(key)
+        if i is None:
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._last_changed.append(timestamp)
+            self._last_updated.append(timestamp)
+            self._sequences.append(self._sequence)
+        else:
+            if self._values[i] != value:
+                self._values[i] = value
+                self._last_changed[i] = timestamp
+            self._last_updated[i] = timestamp
+            self._sequences[i] = self._sequence
+            del self._recent[key]
+        self._recent[key] = None
+
+    def restore(self, entries: Iterable[tuple[EntityKey, Any, float, float]]) -> None:
+        """Bulk-load (key, value, last_changed, last_updated) entries, e.g. from a persisted snapshot.
+
+        Entries for keys already present in the store are skipped, so live values take precedence over restored ones.
+        """
+        for key, value, last_changed, last_updated in entries:
+            if key in self._index:
+                continue
+            self._sequence += 1
+            self._index[key] = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._last_changed.append(last_changed)
+            self._last_updated.append(last_updated)
+            self._sequences.append(self._sequence)
+            self._recent[key] = None
+
+    def get(
+        self, address: SenderAddress, entity_id: str, observable: Observable
+    ) -> EntityState | None:
+        """Return the last known state of an entity observable, or None if it was never observed."""
+        i = self._index.get((address, entity_id, observable))
+        if i is None:
+            return None
+        return self.__state(i)
+
+    def snapshot(self) -> dict[EntityKey, EntityState]:
+        """Return the last known state of all entity observables."""
+        return {
+            key: EntityState(value, key[2].unit, last_changed, last_updated, sequence)
+            for key, value, last_changed, last_updated, sequence in zip(
+                self._keys,
+                self._values,
+                self._last_changed,
+                self._last_updated,
+                self._sequences,
+            )
+        }
+
+    def changed_since(self, sequence: int) -> dict[EntityKey, EntityState]:
+        """Return the state of all entity observables updated after the given change-sequence number.
+
+        The cost is proportional to the number of returned entries, not to the size of the store.
+        """
+        result: dict[EntityKey, EntityState] = {}
+        for key in reversed(self._recent):
+            i = self._index[key]
+            if self._sequences[i] <= sequence:
+                break
+            result[key] = self.__state(i)
+        return result
+
+    def remove_device(self, address: SenderAddress) -> None:
+        """Remove all state belonging to the device with the given address."""
+        for key in [k for k in self._keys if k[0] == address]:
+            self.__remove(key)
+
+    def clear(self) -> None:
+        """Remove all state (the change-sequence number is kept)."""
+        self._index.clear()
+        self._keys.clear()
+        self._values.clear()
+        del self._last_changed[:]
+        del self._last_updated[:]
+        del self._sequences[:]
+        self._recent.clear()
+
+    def __state(self, i: int) -> EntityState:
+        return EntityState(
+            self._values[i],
+            self._keys[i][2].unit,
+            self._last_changed[i],
+            self._last_updated[i],
+            self._sequences[i],
+        )
+
+    def __remove(self, key: EntityKey) -> None:
+        """Remove a single key by moving the last row into its slot (O(1))."""
+        i = self._index.pop(key)
+        del self._recent[key]
+        last = len(self._keys) - 1
+        if i != last:
+            last_key = self._keys[last]
+            self._index[last_key] = i
+            self._keys[i] = last_key
+            self._values[i] = self._values[last]
+            self._last_changed[i] = self._last_changed[last]
+            self._last_updated[i] = self._last_updated[last]
+            self._sequences[i] = self._sequences[last]
+        self._keys.pop()
+        self._values.pop()
+        self._last_changed.pop()
+        self._last_updated.pop()
+        self._sequences.pop()
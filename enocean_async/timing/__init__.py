@@ -0,0 +1,13 @@
+from .clock import Clock, SystemClock, VirtualClock
+from .latency import ReceiveLatencyTracker, ReceiveStage
+from .wheel import Timer, TimingWheel
+
+__all__ = [
+    "Clock",
+    "ReceiveLatencyTracker",
+    "ReceiveStage",
+    "SystemClock",
+    "Timer",
+    "TimingWheel",
+    "VirtualClock",
+]
@@ -0,0 +1,100 @@
+"""Clocks for the gateway and its observers: the system clock, or a virtual clock for replays and tests."""
+
+from abc import ABC, abstractmethod
+import asyncio
+import heapq
+import itertools
+import time
+
+from .wheel import TimingWheel
+
+
+class Clock(ABC):
+    """Source of time for the receive path.
+
+    time() is wall-clock time in seconds since the epoch, used for observation timestamps and press durations.
+    monotonic() never jumps and is used for timers and time windows (duplicate suppression, chained messages), and
+    with sleep() for the timing of reconnect attempts.
+    """
+
+    @abstractmethod
+    def time(self) -> float:
+        """Wall-clock time in seconds since the epoch."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Monotonic time in seconds (arbitrary reference point)."""
+
+    async def sleep(self, seconds: float) -> None:
+        """Wait until the clock's monotonic time has moved forward by the given number of seconds."""
+        await asyncio.sleep(seconds)
+
+
+class SystemClock(Clock):
+    """The real time of the system (time.time() and time.monotonic())."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when advanced, so that hours of recorded traffic can be replayed in seconds.
+
+    Monotonic time starts at 0, wall-clock time at epoch. advance() fires the timers of the timing wheels driven by
+    this clock (see drive()) as their deadlines are passed, so timer callbacks see the time at which they are due
+    (up to the wheel's resolution) rather than the time advanced to. Coroutines waiting in sleep() are resumed once
+    the clock was advanced past the end of their sleep.
+    """
+
+    def __init__(self, epoch: float | None = None) -> None:
+        self.__epoch = time.time() if epoch is None else epoch
+        self.__now = 0.0
+        self.__wheels: list[TimingWheel] = []
+        self.__sleepers: list[tuple[float, int, asyncio.Future]] = []
+        self.__sequence = itertools.count()
+
+    def time(self) -> float:
+        return self.__epoch + self.__now
+
+    def monotonic(self) -> float:
+        return self.__now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self.__sleepers, (self.__now + seconds, next(self.__sequence), future)
+        )
+        await future
+
+    def drive(self, wheel: TimingWheel) -> None:
+        """Fire the timers of the given timing wheel (which must use this clock's monotonic()) whenever the clock is advanced."""
+        if wheel not in self.__wheels:
+            self.__wheels.append(wheel)
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by the given number of seconds, firing due timers on the way.
+
+        Raises:
+            ValueError: If seconds is negative.
+        """
+        if seconds < 0:
+            raise ValueError("A clock cannot be moved backwards")
+        target = self.__now + seconds
+        while True:
+            # step one wheel slot at a time while timers are pending, so that they fire at their deadline
+            steps = [wheel.resolution for wheel in self.__wheels if len(wheel)]
+            self.__now = min(target, self.__now + min(steps)) if steps else target
+            for wheel in self.__wheels:
+                wheel.advance()
+            while self.__sleepers and self.__sleepers[0][0] <= self.__now:
+                future = heapq.heappop(self.__sleepers)[2]
+                if not future.done():
+                    future.set_result(None)
+            if self.__now >= target:
+                return
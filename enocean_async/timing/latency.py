@@ -0,0 +1,60 @@
+"""Latency of the receive path, from reading a packet off the serial port to each processing stage."""
+
+from enum import StrEnum
+import time
+from typing import Callable, Final
+
+from ..protocol.esp3.packet import ReceiveTime
+from ..transmit.latency import LatencyHistogram
+
+# fmt: off
+RECEIVE_BUCKET_BOUNDS_MS: Final = (
+    0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500,
+)
+# fmt: on
+"""Upper bounds in milliseconds of the receive latency histogram buckets (a last bucket collects everything slower)."""
+
+
+class ReceiveStage(StrEnum):
+    """Processing stages of a received telegram, each measured from the time the packet was read."""
+
+    TELEGRAM = "telegram"
+    """The ESP3 packet was parsed into a radio telegram (before duplicate suppression)."""
+
+    MESSAGE = "message"
+    """The telegram was decoded into an EEP message."""
+
+    OBSERVATION = "observation"
+    """An observation derived from the telegram reached the gateway's observation callback."""
+
+
+class ReceiveLatencyTracker:
+    """Histograms of the time from reading a packet off the serial port to each processing stage.
+
+    The difference between the stages shows where received telegrams spend their time: parsing, EEP decoding, or
+    waiting in the event loop before observations are delivered.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.__clock = clock
+        self.__histograms: dict[ReceiveStage, LatencyHistogram] = {}
+
+    def record(self, stage: ReceiveStage, received: ReceiveTime | None) -> None:
+        """Record that a telegram received at the given time reached the stage now (ignored if the time is unknown)."""
+        if received is None:
+            return
+        histogram = self.__histograms.get(stage)
+        if histogram is None:
+            histogram = self.__histograms[stage] = LatencyHistogram(
+                bounds_ms=RECEIVE_BUCKET_BOUNDS_MS
+            )
+        histogram.add((self.__clock() - received.monotonic) * 1000)
+
+    def histograms(self) -> dict[ReceiveStage, LatencyHistogram]:
+        """Return a copy of the latency histograms per stage."""
+        return {
+            stage: LatencyHistogram(
+                list(h.counts), h.count, h.total_ms, h.max_ms, h.timeouts, h.bounds_ms
+            )
+            for stage, h in self.__histograms.items()
+        }
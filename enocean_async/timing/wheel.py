@@ -0,0 +1,155 @@
+"""Hashed timing wheel for the many short-lived timers of observers (button hold/release timeouts, cover watchdogs)."""
+
+import asyncio
+import math
+import time
+from typing import Any, Callable
+
+
+class Timer:
+    """A deadline registered with a TimingWheel; cancel() removes it in O(1)."""
+
+    __slots__ = ("deadline", "_tick", "_slot", "_wheel", "_callback", "_args")
+
+    def __init__(
+        self,
+        deadline: float,
+        tick: int,
+        wheel: "TimingWheel",
+        callback: Callable[..., Any],
+        args: tuple,
+    ) -> None:
+        self.deadline = deadline
+        """Time (of the wheel's clock) at which the timer is due."""
+        self._tick = tick
+        self._slot: dict["Timer", None] | None = None
+        self._wheel = wheel
+        self._callback: Callable[..., Any] | None = callback
+        self._args = args
+
+    def cancel(self) -> None:
+        """Cancel the timer (no-op if it has already fired or was cancelled)."""
+        self._callback = None
+        if self._slot is not None:
+            del self._slot[self]
+            self._slot = None
+            self._wheel._discard()
+
+    def cancelled(self) -> bool:
+        """Whether the timer was cancelled or has fired."""
+        return self._callback is None
+
+
+class TimingWheel:
+    """Hashed timing wheel: timers are kept in slots of resolution seconds each, indexed by their deadline.
+
+    schedule() and Timer.cancel() are O(1), independent of the number of pending timers. A single loop callback,
+    running every resolution seconds while timers are pending, fires the timers of the elapsed slots. Timers fire up
+    to one resolution late, never early. Deadlines more than slots * resolution seconds ahead simply stay in their
+    slot for further turns of the wheel.
+
+    The wheel can also be driven manually with advance(), e.g. with a virtual clock.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.02,
+        slots: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+        self.__resolution = resolution
+        self.__slots: list[dict[Timer, None]] = [{} for _ in range(slots)]
+        self.__clock = clock
+        self.__origin = clock()
+        self.__tick = 0  # next tick to be processed
+        self.__pending = 0
+        self.__handle: asyncio.TimerHandle | None = None
+        self.fired: int = 0
+        """Number of timers that have fired."""
+
+    @property
+    def resolution(self) -> float:
+        return self.__resolution
+
+    def __len__(self) -> int:
+        """Number of pending timers."""
+        return self.__pending
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> Timer:
+        """Call callback(*args) after delay seconds and return the Timer (compatible with asyncio's call_later)."""
+        deadline = self.__clock() + delay
+        tick = max(
+            self.__tick, math.ceil((deadline - self.__origin) / self.__resolution)
+        )
+        timer = Timer(deadline, tick, self, callback, args)
+        slot = self.__slots[tick % len(self.__slots)]
+        slot[timer] = None
+        timer._slot = slot
+        self.__pending += 1
+        if self.__handle is None:
+            self.__handle = asyncio.get_running_loop().call_later(
+                self.__resolution, self.__run
+            )
+        return timer
+
+    def advance(self, now: float | None = None) -> int:
+        """Fire all timers due at now (default: the current time of the clock), in deadline order; return their number."""
+        now = self.__clock() if now is None else now
+        target = math.floor((now - self.__origin) / self.__resolution)
+        if target < self.__tick or self.__pending == 0:
+            self.__tick = max(self.__tick, target + 1)
+            return 0
+
+        # a jump of more than one turn visits every slot only once
+        due: list[Timer] = []
+        last = min(target, self.__tick + len(self.__slots) - 1)
+        for tick in range(self.__tick, last + 1):
+            slot = self.__slots[tick % len(self.__slots)]
+            if slot:
+                expired = [timer for timer in slot if timer._tick <= target]
+                for timer in expired:
+                    del slot[timer]
+                    timer._slot = None
+                due.extend(expired)
+        self.__tick = target + 1
+        self.__pending -= len(due)
+
+        if len(due) > 1:
+            due.sort(key=lambda timer: timer.deadline)
+        fired = 0
+        for timer in due:
+            # an earlier callback may have cancelled a timer that is due as well
+            callback = timer._callback
+            if callback is None:
+                continue
+            timer._callback = None
+            callback(*timer._args)
+            fired += 1
+        self.fired += fired
+        return fired
+
+    def close(self) -> None:
+        """Cancel all pending timers and stop the loop callback."""
+        for slot in self.__slots:
+            for timer in slot:
+                timer._callback = None
+                timer._slot = None
+            slot.clear()
+        self.__pending = 0
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__handle = None
+
+    def _discard(self) -> None:
+        """Account for a cancelled timer (called by Timer.cancel())."""
+        self.__pending -= 1
+
+    def __run(self) -> None:
+        self.__handle = None
+        self.advance()
+        if self.__pending:
+            self.__handle = asyncio.get_running_loop().call_later(
+                self.__resolution, self.__run
+            )
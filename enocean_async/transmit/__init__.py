@@ -0,0 +1,20 @@
+from .duty_cycle import DutyCycleLimiter, estimate_airtime, radio_telegram_size
+from .latency import LatencyHistogram, LatencyTracker
+from .result import BulkSendResult, SendOutcome, SendResult
+from .retry import RetryPolicy
+from .scheduler import SendPriority, SendQueueStats, SendScheduler
+
+__all__ = [
+    "BulkSendResult",
+    "DutyCycleLimiter",
+    "estimate_airtime",
+    "LatencyHistogram",
+    "LatencyTracker",
+    "radio_telegram_size",
+    "RetryPolicy",
+    "SendPriority",
+    "SendOutcome",
+    "SendQueueStats",
+    "SendResult",
+    "SendScheduler",
+]
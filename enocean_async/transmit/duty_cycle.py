@@ -0,0 +1,197 @@
+"""Airtime estimation and duty-cycle budgeting for radio transmissions."""
+
+from collections import deque
+import time
+from typing import Callable
+
+from ..protocol.esp3.packet import ESP3Packet, ESP3PacketType
+
+ERP1_BITRATE = 125_000
+"""ERP1 radio bit rate in bit/s (868 MHz)."""
+
+ERP1_SUBTELEGRAMS = 3
+"""Number of subtelegrams the module transmits per telegram."""
+
+# Per subtelegram: preamble (8 bit) + start of frame (4 bit) + end of frame (4 bit); each byte is
+# transmitted with 4 synchronisation bits. Every radio telegram carries one checksum byte that is
+# not part of the ESP3 data, and addressed ERP1 telegrams add an ADT encapsulation (RORG + destination).
+# ERP2 telegrams are additionally preceded by a length byte.
+_FRAME_OVERHEAD_BITS = 8 + 4 + 4
+_BITS_PER_BYTE = 12
+_CHECKSUM_BYTES = 1
+_LENGTH_BYTES = 1
+_ADT_BYTES = 5
+_BROADCAST = b"\xff\xff\xff\xff"
+
+RADIO_PACKET_TYPES = frozenset(
+    (
+        ESP3PacketType.RADIO_ERP1,
+        ESP3PacketType.RADIO_MESSAGE,
+        ESP3PacketType.RADIO_ERP2,
+    )
+)
+"""Packet types the module transmits by radio."""
+
+
+def radio_telegram_size(packet: ESP3Packet) -> int:
+    """Return the number of bytes the given ESP3 packet occupies on air per subtelegram (0 for packets that are not transmitted by radio)."""
+    if packet.packet_type not in RADIO_PACKET_TYPES:
+        return 0
+    if packet.packet_type == ESP3PacketType.RADIO_ERP2:
+        # ERP2 carries the destination in the telegram itself, framed by a length byte and a CRC
+        return _LENGTH_BYTES + len(packet.data) + _CHECKSUM_BYTES
+
+    size = len(packet.data) + _CHECKSUM_BYTES
+    destination = packet.optional[1:5]
+    if len(destination) == 4 and destination != _BROADCAST:
+        size += _ADT_BYTES
+    return size
+
+
+def estimate_airtime(packet: ESP3Packet) -> float:
+    """Estimate the airtime in seconds needed to transmit the given ESP3 packet (0 for packets that are not transmitted by radio)."""
+    size = radio_telegram_size(packet)
+    if size == 0:
+        return 0.0
+    bits = _FRAME_OVERHEAD_BITS + _BITS_PER_BYTE * size
+    return ERP1_SUBTELEGRAMS * bits / ERP1_BITRATE
+
+
+class DutyCycleLimiter:
+    """Sliding-window airtime budget, used to pace radio transmissions before the module enforces its duty-cycle lock.
+
+    Every transmission is recorded with its estimated airtime. delay() returns how long a packet has to wait so that
+    the airtime within the window stays below duty_cycle * window. When the module nevertheless reports a duty-cycle
+    lock, resync() scales up the airtime estimates towards what the module actually counts, and holds back all
+    transmissions for a short time (doubling with every consecutive lock) so the module can recover. Without further
+    locks, the correction decays back to the plain estimate over one window length.
+    """
+
+    __slots__ = (
+        "duty_cycle",
+        "window",
+        "_clock",
+        "_entries",
+        "_used",
+        "_scale",
+        "_lock_scale",
+        "_last_lock",
+        "_locked_until",
+        "_consecutive_locks",
+        "locks",
+    )
+
+    MAX_SCALE = 8.0
+    """Upper bound of the estimate correction factor applied by resync()."""
+
+    LOCK_HOLD = 1.0
+    """Time in seconds transmissions are held back after a duty-cycle lock (doubled per consecutive lock)."""
+
+    MAX_LOCK_HOLD = 60.0
+    """Upper bound of the hold-back time after consecutive duty-cycle locks."""
+
+    def __init__(
+        self,
+        duty_cycle: float = 0.01,
+        window: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.duty_cycle = duty_cycle
+        """Allowed fraction of time on air (1% in the 868 MHz band)."""
+
+        self.window = window
+        """Length of the sliding window in seconds."""
+
+        self._clock = clock
+        self._entries: deque[tuple[float, float]] = (
+            deque()
+        )  # (timestamp, estimated airtime)
+        self._used: float = 0.0
+        self._scale: float = 1.0
+        # correction factor set by the last lock, and the time of that lock
+        self._lock_scale: float = 1.0
+        self._last_lock: float = 0.0
+        self._locked_until: float = 0.0
+        self._consecutive_locks: int = 0
+
+        self.locks: int = 0
+        """Number of duty-cycle lock responses received from the module."""
+
+    @property
+    def budget(self) -> float:
+        """Airtime in seconds allowed per window."""
+        return self.duty_cycle * self.window
+
+    @property
+    def scale(self) -> float:
+        """Correction factor currently applied to the airtime estimates (1.0 unless the module reported a lock within the last window)."""
+        self.__expire(self._clock())
+        return self._scale
+
+    @property
+    def used(self) -> float:
+        """Airtime in seconds used within the current window (corrected estimate)."""
+        self.__expire(self._clock())
+        return self._used * self._scale
+
+    def delay(self, packet: ESP3Packet) -> float:
+        """Return the time in seconds to wait before the given packet may be transmitted (0 if it can be sent now)."""
+        airtime = estimate_airtime(packet)
+        if airtime == 0.0:
+            return 0.0
+
+        now = self._clock()
+        self.__expire(now)
+        airtime *= self._scale
+        hold = max(0.0, self._locked_until - now)
+        excess = self._used * self._scale + airtime - self.budget
+        if excess <= 0.0:
+            return hold
+
+        # wait until enough of the oldest transmissions have left the window
+        freed = 0.0
+        for timestamp, entry in self._entries:
+            freed += entry * self._scale
+            if freed >= excess:
+                return max(hold, timestamp + self.window - now)
+        return self.window  # packet exceeds the whole budget
+
+    def record(self, packet: ESP3Packet) -> None:
+        """Record a transmitted packet."""
+        airtime = estimate_airtime(packet)
+        if airtime == 0.0:
+            return
+        now = self._clock()
+        self.__expire(now)
+        self._entries.append((now, airtime))
+        self._used += airtime
+        self._consecutive_locks = 0
+
+    def resync(self) -> None:
+        """Adapt to a duty-cycle lock reported by the module: scale estimates up and hold back transmissions for a while."""
+        self.locks += 1
+        now = self._clock()
+        self.__expire(now)
+        self._locked_until = now + min(
+            self.MAX_LOCK_HOLD, self.LOCK_HOLD * 2**self._consecutive_locks
+        )
+        self._consecutive_locks += 1
+        if self._used > 0.0:
+            self._scale = min(
+                self.MAX_SCALE, max(self._scale, self.budget / self._used)
+            )
+        else:
+            self._scale = self.MAX_SCALE
+        self._lock_scale = self._scale
+        self._last_lock = now
+
+    def __expire(self, now: float) -> None:
+        entries = self._entries
+        limit = now - self.window
+        while entries and entries[0][0] <= limit:
+            self._used -= entries.popleft()[1]
+        if not entries:
+            self._used = 0.0
+        if self._scale > 1.0:
+            remaining = max(0.0, 1.0 - (now - self._last_lock) / self.window)
+            self._scale = 1.0 + (self._lock_scale - 1.0) * remaining
@@ -0,0 +1,164 @@
+"""Response latency statistics and adaptive response timeouts."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Final
+
+from ..protocol.esp3.packet import ESP3Packet, ESP3PacketType
+
+SPEC_TIMEOUT: Final = 0.5
+"""Maximum time in seconds to wait for a response, as per the ESP3 specification."""
+
+# fmt: off
+BUCKET_BOUNDS_MS: Final = (
+    1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 25, 30, 40, 50, 60, 80, 100, 120, 150, 200, 250, 300, 400, 500,
+)
+# fmt: on
+"""Upper bounds in milliseconds of the latency histogram buckets (a last bucket collects everything slower)."""
+
+MAX_PENALTY: Final = 32.0
+
+type LatencyKey = tuple[ESP3PacketType, int | None]
+"""Latency statistics are kept per packet type, and per command code for command packets."""
+
+
+def latency_key(packet: ESP3Packet) -> LatencyKey:
+    """Return the statistics key of a packet: command packets are told apart by their command code."""
+    if packet.packet_type in (
+        ESP3PacketType.COMMON_COMMAND,
+        ESP3PacketType.SMART_ACK_COMMAND,
+    ):
+        return packet.packet_type, packet.data[0] if packet.data else None
+    return packet.packet_type, None
+
+
+@dataclass
+class LatencyHistogram:
+    """Histogram of latencies in milliseconds, with fixed buckets (by default the response latency buckets BUCKET_BOUNDS_MS)."""
+
+    counts: list[int] = field(default_factory=list)
+    """Number of samples per bucket; counts[i] holds samples up to bounds_ms[i], the last entry slower ones."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    timeouts: int = 0
+    """Number of packets that were not answered in time (not included in the buckets)."""
+
+    bounds_ms: tuple[float, ...] = BUCKET_BOUNDS_MS
+    """Upper bounds in milliseconds of the buckets."""
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds_ms) + 1)
+
+    def add(self, duration_ms: float) -> None:
+        self.counts[bisect_left(self.bounds_ms, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float | None:
+        """Return an upper bound of the q-quantile (0 < q <= 1) in milliseconds, or None without samples."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds_ms, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+
+
+class LatencyTracker:
+    """Tracks response latencies per packet type and derives a response timeout from them.
+
+    Once min_samples responses of a packet type were seen, the timeout is factor times the observed percentile,
+    bounded by min_timeout and the specification's 500 ms. Sticks typically answer within a few milliseconds, so
+    a lost response is detected after tens of milliseconds instead of half a second (the gateway still holds back
+    the next packet until the module can no longer answer the lost one).
+    Every timeout doubles the timeout of that packet type (halved again with every answered packet), and a
+    response arriving after its packet timed out raises it to the maximum, so that a slow module is not
+    mistaken for a lossy one.
+    """
+
+    def __init__(
+        self,
+        factor: float = 4.0,
+        percentile: float = 0.99,
+        min_timeout: float = 0.02,
+        max_timeout: float = SPEC_TIMEOUT,
+        min_samples: int = 20,
+    ) -> None:
+        self.factor = factor
+        self.percentile = percentile
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+
+        self.__histograms: dict[LatencyKey, LatencyHistogram] = {}
+        self.__penalties: dict[LatencyKey, float] = {}
+        self.__last_timeout: LatencyKey | None = None
+
+        self.late_responses: int = 0
+        """Number of responses that arrived after their packet had timed out."""
+
+    def timeout(self, packet: ESP3Packet) -> float:
+        """Return the time in seconds to wait for the response to the given packet."""
+        key = latency_key(packet)
+        histogram = self.__histograms.get(key)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.max_timeout
+        timeout = (
+            histogram.percentile(self.percentile)
+            / 1000
+            * self.factor
+            * self.__penalties.get(key, 1.0)
+        )
+        return min(self.max_timeout, max(self.min_timeout, timeout))
+
+    def record(self, packet: ESP3Packet, duration_ms: float) -> None:
+        """Record the latency of an answered packet."""
+        key = latency_key(packet)
+        histogram = self.__histograms.get(key)
+        if histogram is None:
+            histogram = self.__histograms[key] = LatencyHistogram()
+        histogram.add(duration_ms)
+
+        penalty = self.__penalties.get(key)
+        if penalty is not None:
+            if penalty <= 2.0:
+                del self.__penalties[key]
+            else:
+                self.__penalties[key] = penalty / 2
+
+    def record_timeout(self, packet: ESP3Packet) -> None:
+        """Record that a packet was not answered in time."""
+        key = latency_key(packet)
+        histogram = self.__histograms.get(key)
+        if histogram is None:
+            histogram = self.__histograms[key] = LatencyHistogram()
+        histogram.timeouts += 1
+        self.__penalties[key] = min(MAX_PENALTY, self.__penalties.get(key, 1.0) * 2)
+        self.__last_timeout = key
+
+    def record_late_response(self) -> None:
+        """Record a response that arrived after its packet timed out."""
+        self.late_responses += 1
+        if self.__last_timeout is not None:
+            self.__penalties[self.__last_timeout] = MAX_PENALTY
+
+    def histograms(self) -> dict[LatencyKey, LatencyHistogram]:
+        """Return a copy of the latency histograms per packet type (and command code)."""
+        return {
+            key: LatencyHistogram(
+                list(h.counts), h.count, h.total_ms, h.max_ms, h.timeouts
+            )
+            for key, h in self.__histograms.items()
+        }
@@ -0,0 +1,87 @@
+"""Result of a send operation."""
+
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Optional
+
+from ..address import EURID, BaseAddress
+from ..protocol.esp3.response import ResponseCode, ResponseTelegram
+
+
+class SendOutcome(StrEnum):
+    """Final outcome of a send operation (after all retries)."""
+
+    SUCCESS = "success"
+    """The module confirmed the packet with ResponseCode.OK."""
+
+    REJECTED = "rejected"
+    """The module answered with an error response code."""
+
+    TIMEOUT = "timeout"
+    """The module did not respond in time."""
+
+    NOT_CONNECTED = "not_connected"
+    """The gateway was not connected to a module."""
+
+    EXPIRED = "expired"
+    """The packet was queued while disconnected and discarded when its time-to-live ran out."""
+
+    TRANSMIT_FAILED = "transmit_failed"
+    """The module confirmed the packet, but then reported that it could not transmit it by radio (CO_TRANSMIT_FAILED)."""
+
+
+@dataclass
+class SendResult:
+    response: Optional[ResponseTelegram]
+    duration_ms: Optional[float]
+
+    attempts: int = 1
+    """Number of times the packet was handed to the module (1 + number of retries)."""
+
+    outcome: SendOutcome | None = None
+    """Final outcome; derived from the response if not given."""
+
+    transmitted: bool | None = None
+    """Whether the module reported the radio transmission as done (CO_TX_DONE) or failed (CO_TRANSMIT_FAILED); None if it reported neither."""
+
+    transmit_ms: float | None = None
+    """Time in milliseconds from sending the packet to the module until it reported the radio transmission as done or failed."""
+
+    def __post_init__(self) -> None:
+        if self.outcome is None:
+            if self.response is None:
+                self.outcome = SendOutcome.TIMEOUT
+            elif self.response.return_code == ResponseCode.OK:
+                self.outcome = (
+                    SendOutcome.TRANSMIT_FAILED
+                    if self.transmitted is False
+                    else SendOutcome.SUCCESS
+                )
+            else:
+                self.outcome = SendOutcome.REJECTED
+
+
+@dataclass
+class BulkSendResult:
+    """Result of sending one instruction to many targets."""
+
+    results: dict[EURID | BaseAddress, SendResult]
+    """Result per target, in the order the targets were given."""
+
+    duration_ms: float
+    """Time in milliseconds from queueing the first packet until the last result arrived."""
+
+    @property
+    def succeeded(self) -> int:
+        """Number of targets whose packet was confirmed by the module."""
+        return sum(r.outcome == SendOutcome.SUCCESS for r in self.results.values())
+
+    @property
+    def failed(self) -> int:
+        """Number of targets whose packet was rejected, timed out or could not be sent."""
+        return len(self.results) - self.succeeded
+
+    @property
+    def attempts(self) -> int:
+        """Total number of transmissions including retries."""
+        return sum(r.attempts for r in self.results.values())
@@ -0,0 +1,51 @@
+"""Retry policy for transient send errors."""
+
+from dataclasses import dataclass, field
+import random
+from typing import Final, Literal, Mapping
+
+from ..protocol.esp3.response import ResponseCode
+
+TIMEOUT: Final = "timeout"
+"""Retry reason for packets the module did not respond to in time."""
+
+type RetryReason = ResponseCode | Literal["timeout"]
+
+
+def _default_retries() -> dict[RetryReason, int]:
+    return {
+        ResponseCode.NO_FREE_BUFFER: 3,
+        ResponseCode.DUTY_CYCLE_LOCK: 3,
+        TIMEOUT: 2,
+    }
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how fast to retry a packet after a transient error.
+
+    Error responses such as NO_FREE_BUFFER or DUTY_CYCLE_LOCK mean that the module did not transmit the packet,
+    so they are retried for every packet. After a timeout it is unknown whether the packet went out, so only
+    idempotent packets are retried (e.g. queries or absolute set-points, but not relative dimming).
+    """
+
+    retries: Mapping[RetryReason, int] = field(default_factory=_default_retries)
+    """Maximum number of retries per reason (response code or TIMEOUT); reasons not listed are not retried."""
+
+    base_delay: float = 0.05
+    """Backoff before the first retry in seconds; doubled for every further attempt."""
+
+    max_delay: float = 2.0
+    """Upper bound of the backoff in seconds."""
+
+    jitter: float = 0.5
+    """Fraction of the backoff that is randomised (0 = no jitter), to spread out retries of concurrent senders."""
+
+    def max_retries(self, reason: RetryReason) -> int:
+        """Return the retry budget for the given reason."""
+        return self.retries.get(reason, 0)
+
+    def backoff(self, attempt: int) -> float:
+        """Return the time in seconds to wait before retrying after the given (1-based) attempt failed."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1.0 - self.jitter * random.random())
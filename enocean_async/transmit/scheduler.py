@@ -0,0 +1,444 @@
+"""Prioritised send queue with coalescing of superseded commands."""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+import logging
+from typing import Awaitable, Callable, Hashable, Iterable, Iterator
+
+from ..protocol.esp3.packet import ESP3Packet
+from ..protocol.esp3.response import ResponseCode
+from ..semantics.instructable import QUERY_INSTRUCTABLES
+from ..semantics.instruction import Instruction
+from .result import SendOutcome, SendResult
+from .retry import TIMEOUT, RetryPolicy, RetryReason
+
+type CoalesceKey = tuple[Hashable, ...]
+"""Key identifying commands that supersede each other, e.g. (destination, entity_id, Instructable)."""
+
+type Transmitter = Callable[[ESP3Packet], Awaitable[SendResult]]
+
+type Pacer = Callable[[ESP3Packet], float]
+"""Returns the time in seconds a packet has to wait before it may be transmitted (e.g. DutyCycleLimiter.delay)."""
+
+
+class SendPriority(IntEnum):
+    """Priority classes of the send queue; lower values are sent first."""
+
+    TEACH_IN = 0
+    """Responses to teach-in requests (the device only listens for a short time)."""
+
+    COMMAND = 1
+    """Commands issued by users or automations, and requests to the module itself."""
+
+    POLLING = 2
+    """Status and measurement queries."""
+
+
+def default_priority(command: Instruction) -> SendPriority:
+    """Return the send priority for a command: POLLING for queries, COMMAND for everything else."""
+    return (
+        SendPriority.POLLING
+        if command.action in QUERY_INSTRUCTABLES
+        else SendPriority.COMMAND
+    )
+
+
+@dataclass
+class SendQueueStats:
+    """Statistics of one priority class of the send queue."""
+
+    depth: int = 0
+    """Number of packets currently queued."""
+
+    sent: int = 0
+    """Number of packets handed to the module."""
+
+    coalesced: int = 0
+    """Number of packets that were superseded by a newer one before being sent (and thus never sent)."""
+
+    retried: int = 0
+    """Number of retries after transient errors."""
+
+    total_wait: float = 0.0
+    """Sum of the time in seconds that sent packets waited in the queue."""
+
+    max_wait: float = 0.0
+    """Longest time in seconds a sent packet waited in the queue."""
+
+    @property
+    def mean_wait(self) -> float:
+        """Average time in seconds that sent packets waited in the queue."""
+        return self.total_wait / self.sent if self.sent else 0.0
+
+
+class _SendJob:
+    __slots__ = ("packet", "priority", "key", "idempotent", "futures", "enqueued")
+
+    def __init__(
+        self,
+        packet: ESP3Packet,
+        priority: SendPriority,
+        key: CoalesceKey | None,
+        idempotent: bool,
+        future: asyncio.Future,
+        enqueued: float,
+    ) -> None:
+        self.packet = packet
+        self.priority = priority
+        self.key = key
+        self.idempotent = idempotent
+        self.futures: list[asyncio.Future] = [future]
+        self.enqueued = enqueued
+
+
+class _BatchJob:
+    """Packets submitted together; they keep one place in the queue and are sent back to back."""
+
+    __slots__ = ("items", "priority", "idempotent", "enqueued")
+
+    def __init__(
+        self,
+        items: deque[tuple[ESP3Packet, asyncio.Future]],
+        priority: SendPriority,
+        idempotent: bool,
+        enqueued: float,
+    ) -> None:
+        self.items = items
+        self.priority = priority
+        self.idempotent = idempotent
+        self.enqueued = enqueued
+
+
+class SendScheduler:
+    """Send queue feeding a transmit function one packet at a time, highest priority first.
+
+    Packets submitted with a coalesce key replace a still-queued packet with the same key: the queued job keeps
+    its place in the queue but transmits the newest packet, and all callers receive the result of that
+    transmission. A job only absorbs newer packets as long as no packet with a different key for the same
+    target (the key without its last element, e.g. (destination, entity_id)) was queued after it, so a
+    stop command between two position commands is never overtaken. Packets that are not idempotent (e.g. a
+    relative dimming step) are never coalesced, and act as such a barrier for their target as well.
+
+    If a pacer is given, each packet is held back for the time the pacer demands before it is transmitted.
+    If a retry policy is given, packets failing with a transient error are retried (with backoff) before the
+    next packet is sent, so that retries keep their place in the queue instead of competing with other senders.
+
+    While paused (e.g. during a connection outage), packets are queued but not sent; packets submitted with a
+    time-to-live resolve with SendOutcome.EXPIRED and leave the queue if they have not been sent when it runs out.
+
+    A batch of packets (submit_batch()) is queued as one job; its packets are sent back to back, but packets of a
+    higher priority class may still be sent between two packets of the batch.
+    """
+
+    def __init__(
+        self,
+        transmit: Transmitter,
+        pacer: Pacer | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self.__transmit = transmit
+        self.__pacer = pacer
+        self.__retry_policy = retry_policy
+        self.__queues: dict[SendPriority, deque[_SendJob | _BatchJob]] = {
+            priority: deque() for priority in SendPriority
+        }
+        self.__stats: dict[SendPriority, SendQueueStats] = {
+            priority: SendQueueStats() for priority in SendPriority
+        }
+
+        # queued jobs by coalesce key, and the last key queued per target
+        self.__pending: dict[CoalesceKey, _SendJob] = {}
+        self.__last_key: dict[CoalesceKey, CoalesceKey] = {}
+
+        self.__wakeup: asyncio.Event = asyncio.Event()
+        self.__worker: asyncio.Task | None = None
+        self.__paused: bool = False
+        self._logger = logging.getLogger(__name__)
+
+    def submit(
+        self,
+        packet: ESP3Packet,
+        priority: SendPriority = SendPriority.COMMAND,
+        coalesce_key: CoalesceKey | None = None,
+        idempotent: bool = True,
+        ttl: float | None = None,
+    ) -> asyncio.Future[SendResult]:
+        """Queue a packet for sending and return a future resolving to its SendResult.
+
+        Packets that are not idempotent are neither coalesced nor retried after a timeout (it is unknown whether they
+        were transmitted); give them a coalesce key anyway, so that later packets for the same target are not coalesced
+        past them.
+        If a ttl is given and the packet has not been sent within ttl seconds, the future resolves with SendOutcome.EXPIRED
+        (the packet is then skipped).
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[SendResult] = loop.create_future()
+
+        if coalesce_key is not None and not idempotent:
+            # repeating a cumulative command changes its effect: end the coalescing of the target's last job
+            last_key = self.__last_key.pop(coalesce_key[:-1], None)
+            if last_key is not None:
+                self.__pending.pop(last_key, None)
+            coalesce_key = None
+        elif coalesce_key is not None:
+            target = coalesce_key[:-1]
+            job = self.__pending.get(coalesce_key)
+            if (
+                job is not None
+                and job.priority == priority
+                and self.__last_key.get(target) == coalesce_key
+            ):
+                job.packet = packet
+                job.futures.append(future)
+                self.__stats[priority].coalesced += 1
+                if ttl is not None:
+                    self.__set_ttl(loop, ttl, job, future)
+                return future
+            self.__last_key[target] = coalesce_key
+
+        job = _SendJob(packet, priority, coalesce_key, idempotent, future, loop.time())
+        self.__queues[priority].append(job)
+        self.__stats[priority].depth += 1
+        if coalesce_key is not None:
+            self.__pending[coalesce_key] = job
+        if ttl is not None:
+            self.__set_ttl(loop, ttl, job, future)
+
+        self.__start(loop)
+        return future
+
+    def submit_batch(
+        self,
+        packets: Iterable[ESP3Packet],
+        priority: SendPriority = SendPriority.COMMAND,
+        idempotent: bool = True,
+        ttl: float | None = None,
+    ) -> list[asyncio.Future[SendResult]]:
+        """Queue several packets as one job and return a future per packet, in the given order.
+
+        Batched packets are not coalesced. A ttl applies to every packet of the batch (see submit()).
+        """
+        loop = asyncio.get_running_loop()
+        items: deque[tuple[ESP3Packet, asyncio.Future]] = deque(
+            (packet, loop.create_future()) for packet in packets
+        )
+        if not items:
+            return []
+        futures = [future for _, future in items]
+        batch = _BatchJob(items, priority, idempotent, loop.time())
+        if ttl is not None:
+            expiry = loop.call_later(ttl, self.__expire_batch, batch)
+            futures[-1].add_done_callback(lambda _: expiry.cancel())
+
+        self.__queues[priority].append(batch)
+        self.__stats[priority].depth += len(items)
+        self.__start(loop)
+        return futures
+
+    @property
+    def paused(self) -> bool:
+        return self.__paused
+
+    def pause(self) -> None:
+        """Stop sending queued packets (the packet being sent, if any, is completed)."""
+        self.__paused = True
+
+    def resume(self) -> None:
+        """Send the packets queued while paused, in queue order."""
+        self.__paused = False
+        self.__wakeup.set()
+
+    @property
+    def depth(self) -> int:
+        """Number of packets currently queued (in all priority classes)."""
+        return sum(stats.depth for stats in self.__stats.values())
+
+    def stats(self) -> dict[SendPriority, SendQueueStats]:
+        """Return a copy of the queue statistics per priority class."""
+        return {
+            priority: SendQueueStats(**vars(stats))
+            for priority, stats in self.__stats.items()
+        }
+
+    def close(self) -> None:
+        """Stop sending and fail all queued packets, and the packet being sent, with a ConnectionError."""
+        if self.__worker is not None:
+            self.__worker.cancel()
+            self.__worker = None
+        for future in self.__drain():
+            future.set_exception(ConnectionError("Gateway stopped"))
+
+    def drop(self, outcome: SendOutcome) -> int:
+        """Resolve all queued packets with the given outcome without sending them; returns the number of packets dropped."""
+        futures = list(self.__drain())
+        for future in futures:
+            future.set_result(SendResult(None, None, outcome=outcome))
+        return len(futures)
+
+    def __drain(self) -> Iterator[asyncio.Future]:
+        """Empty the queues and yield the futures of the removed packets that are still pending."""
+        for priority, queue in self.__queues.items():
+            while queue:
+                job = queue.popleft()
+                futures = (
+                    [future for _, future in job.items]
+                    if isinstance(job, _BatchJob)
+                    else job.futures
+                )
+                yield from (future for future in futures if not future.done())
+            self.__stats[priority].depth = 0
+        self.__pending.clear()
+        self.__last_key.clear()
+
+    def __start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self.__worker is None or self.__worker.done():
+            self.__worker = loop.create_task(self.__run())
+        self.__wakeup.set()
+
+    def __next_job(self) -> _SendJob | None:
+        for priority, queue in self.__queues.items():
+            if queue:
+                self.__stats[priority].depth -= 1
+                if isinstance(batch := queue[0], _BatchJob):
+                    # the batch stays at the head of its queue until its last packet is taken
+                    packet, future = batch.items.popleft()
+                    if not batch.items:
+                        queue.popleft()
+                    return _SendJob(
+                        packet, priority, None, batch.idempotent, future, batch.enqueued
+                    )
+                job = queue.popleft()
+                self.__forget(job)
+                return job
+        return None
+
+    def __forget(self, job: _SendJob) -> None:
+        """Stop coalescing newer packets into a job that leaves the queue."""
+        if job.key is not None and self.__pending.get(job.key) is job:
+            del self.__pending[job.key]
+            target = job.key[:-1]
+            if self.__last_key.get(target) == job.key:
+                del self.__last_key[target]
+
+    def __set_ttl(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        ttl: float,
+        job: _SendJob,
+        future: asyncio.Future,
+    ) -> None:
+        timer = loop.call_later(ttl, self.__expire, job, future)
+        future.add_done_callback(lambda _: timer.cancel())
+
+    def __expire(self, job: _SendJob, future: asyncio.Future) -> None:
+        """Expire a caller's packet if it is still queued; the job leaves the queue once all its callers expired."""
+        queue = self.__queues[job.priority]
+        if future.done() or job not in queue:
+            return  # resolved, or being sent
+        future.set_result(SendResult(None, None, outcome=SendOutcome.EXPIRED))
+        if all(future.done() for future in job.futures):
+            queue.remove(job)
+            self.__stats[job.priority].depth -= 1
+            self.__forget(job)
+
+    def __expire_batch(self, batch: _BatchJob) -> None:
+        """Expire the packets of a batch that are still queued."""
+        queue = self.__queues[batch.priority]
+        if batch not in queue:
+            return  # all packets were taken for sending
+        queue.remove(batch)
+        self.__stats[batch.priority].depth -= len(batch.items)
+        for _, future in batch.items:
+            if not future.done():
+                future.set_result(SendResult(None, None, outcome=SendOutcome.EXPIRED))
+        batch.items.clear()
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = self.__next_job() if not self.__paused else None
+            if job is None:
+                self.__wakeup.clear()
+                await self.__wakeup.wait()
+                continue
+
+            if all(future.done() for future in job.futures):
+                continue  # all callers gave up waiting
+
+            try:
+                result = await self.__send(job, loop)
+            except asyncio.CancelledError:
+                # only close() cancels the worker
+                for future in job.futures:
+                    if not future.done():
+                        future.set_exception(ConnectionError("Gateway stopped"))
+                raise
+            except Exception as e:
+                for future in job.futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in job.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+    async def __send(
+        self, job: _SendJob, loop: asyncio.AbstractEventLoop
+    ) -> SendResult:
+        """Transmit a job's packet, retrying transient errors according to the retry policy."""
+        stats = self.__stats[job.priority]
+        policy = self.__retry_policy
+        retries: dict[RetryReason, int] = {}
+        attempt = 0
+
+        while True:
+            attempt += 1
+            await self.__pace(job.packet)
+            if attempt == 1:
+                wait = loop.time() - job.enqueued
+                stats.sent += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+
+            reason: RetryReason | None
+            try:
+                result = await self.__transmit(job.packet)
+            except TimeoutError:
+                result = SendResult(None, None, outcome=SendOutcome.TIMEOUT)
+                reason = TIMEOUT
+            else:
+                if (
+                    result.response is None
+                    or result.response.return_code == ResponseCode.OK
+                ):
+                    reason = None
+                else:
+                    reason = ResponseCode(result.response.return_code)
+
+            if (
+                reason is None
+                or policy is None
+                or (reason == TIMEOUT and not job.idempotent)
+                or retries.get(reason, 0) >= policy.max_retries(reason)
+            ):
+                result.attempts = attempt
+                return result
+
+            retries[reason] = retries.get(reason, 0) + 1
+            stats.retried += 1
+            delay = policy.backoff(attempt)
+            self._logger.debug(
+                f"Sending {job.packet} failed ({reason!r}); retrying in {delay:.3f} s"
+            )
+            await asyncio.sleep(delay)
+
+    async def __pace(self, packet: ESP3Packet) -> None:
+        if self.__pacer is None:
+            return
+        while (delay := self.__pacer(packet)) > 0.0:
+            self._logger.debug(
+                f"Pacing transmission: waiting {delay:.3f} s for airtime budget"
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark of device registration: registration time and memory for many devices, registered one by one via
+`Gateway.add_device()` (observers are attached immediately) and in bulk via `Gateway.add_devices()` (observers
+are attached on the first telegram of each device). The last row additionally feeds one telegram from every
+device through the gateway, so it includes the per-device state kept by the (shared) observers.
+
+Usage: python scripts/benchmark_device_registration.py [number of devices, default 10000]
+"""
+
+import asyncio
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+
+from enocean_async.address import EURID
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.erp1.rorg import RORG
+from enocean_async.protocol.erp1.telegram import ERP1Telegram
+
+# a mix of common profiles (temperature sensors, window handles, rocker switches, room operating panels)
+EEPS = [
+    EEP.from_string("A5-02-05"),
+    EEP.from_string("F6-10-00"),
+    EEP.from_string("F6-02-01"),
+    EEP.from_string("A5-10-06"),
+]
+
+
+def devices(count: int) -> list[tuple[EURID, EEP]]:
+    return [(EURID(0x01000000 + i), EEPS[i % len(EEPS)]) for i in range(count)]
+
+
+def measure(name: str, register) -> None:
+    # time without tracing (tracemalloc slows allocations down considerably), then measure memory in a second run
+    gc.collect()
+    start = time.perf_counter()
+    gateway = register()
+    elapsed = time.perf_counter() - start
+    del gateway
+
+    gc.collect()
+    tracemalloc.start()
+    gateway = register()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del gateway
+
+    print(
+        f"{name:<28} {elapsed * 1000:10.1f} ms {current / 2**20:10.2f} MiB {peak / 2**20:10.2f} MiB"
+    )
+
+
+def one_by_one(entries: list[tuple[EURID, EEP]]) -> Gateway:
+    gateway = Gateway("/dev/null")
+    for address, eep in entries:
+        gateway.add_device(address, eep)
+    return gateway
+
+
+def bulk(entries: list[tuple[EURID, EEP]]) -> Gateway:
+    gateway = Gateway("/dev/null")
+    gateway.add_devices(entries)
+    return gateway
+
+
+def with_traffic(entries: list[tuple[EURID, EEP]]) -> Gateway:
+    async def run() -> Gateway:
+        gateway = one_by_one(entries)
+        for address, eep in entries:
+            if eep.rorg == RORG.RORG_4BS:
+                erp1 = ERP1Telegram(RORG.RORG_4BS, b"\x00\x00\x80\x08", address)
+            else:
+                erp1 = ERP1Telegram(RORG.RORG_RPS, b"\x30", address)
+            gateway.process_esp3_packet(erp1.to_esp3())
+        await asyncio.sleep(0)
+        return gateway
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    logging.basicConfig(level=logging.WARNING)
+    entries = devices(count)
+
+    print(f"Registering {count} devices")
+    print(f"{'':<28} {'time':>13} {'resident':>14} {'peak':>14}")
+    measure("add_device() one by one", lambda: one_by_one(entries))
+    measure("add_devices() in bulk", lambda: bulk(entries))
+    measure("add_device() + 1 telegram", lambda: with_traffic(entries))
+
+
+if __name__ == "__main__":
+    main()
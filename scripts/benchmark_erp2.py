@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark of ERP1 and ERP2 telegrams: parse time per received telegram (`ERP1Telegram.from_esp3()` for RADIO_ERP1
+packets, `parse_erp2()` for RADIO_ERP2 packets; both yield an ERP1Telegram), conversion time of a command from
+ERP1 to ERP2, and the bytes per subtelegram on air for typical commands and sensor telegrams.
+
+Usage: python scripts/benchmark_erp2.py [number of iterations, default 100000]
+"""
+
+import sys
+import time
+
+from enocean_async.address import EURID, BaseAddress
+from enocean_async.protocol.erp1.rorg import RORG
+from enocean_async.protocol.erp1.telegram import ERP1Telegram
+from enocean_async.protocol.erp2.telegram import erp2_from_erp1, parse_erp2
+from enocean_async.transmit.duty_cycle import estimate_airtime, radio_telegram_size
+
+SENDER = BaseAddress.from_string("FF:80:00:01")
+DEVICE = EURID.from_string("01:89:AB:CD")
+
+# typical telegrams: sensor readings (broadcast) and actuator commands (addressed)
+TELEGRAMS = {
+    "RPS rocker (broadcast)": ERP1Telegram(RORG.RORG_RPS, b"\x30", DEVICE),
+    "4BS sensor (broadcast)": ERP1Telegram(RORG.RORG_4BS, b"\x08\x28\x4b\x80", DEVICE),
+    "4BS dimmer command": ERP1Telegram(
+        RORG.RORG_4BS, b"\x02\x64\x01\x09", SENDER, destination=DEVICE
+    ),
+    "VLD switch command": ERP1Telegram(
+        RORG.RORG_VLD, b"\x01\x1e\x64", SENDER, destination=DEVICE
+    ),
+    "VLD status query": ERP1Telegram(
+        RORG.RORG_VLD, b"\x03\x1e", SENDER, destination=DEVICE
+    ),
+}
+
+
+def per_call(function, argument, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"{iterations} iterations per telegram")
+    print(
+        f"{'':<24} {'ERP1 parse':>12} {'ERP2 parse':>12} {'convert':>12} {'ERP1 air':>9} {'ERP2 air':>9} {'saved':>9}"
+    )
+    for name, telegram in TELEGRAMS.items():
+        erp1 = telegram.to_esp3()
+        erp2 = erp2_from_erp1(erp1)
+        erp1_parse = per_call(ERP1Telegram.from_esp3, erp1, iterations)
+        erp2_parse = per_call(parse_erp2, erp2, iterations)
+        convert = per_call(erp2_from_erp1, erp1, iterations)
+        saving = 1 - estimate_airtime(erp2) / estimate_airtime(erp1)
+        print(
+            f"{name:<24} {erp1_parse:9.2f} us {erp2_parse:9.2f} us {convert:9.2f} us"
+            f" {radio_telegram_size(erp1):7d} B {radio_telegram_size(erp2):7d} B {saving:8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
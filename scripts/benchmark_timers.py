@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark of observer timers: rocker switch presses and cover position reports from many devices, decoded by
+shared observers whose timers are scheduled on the event loop directly (one TimerHandle per hold/release timeout
+and watchdog) and on a TimingWheel (driven by one loop callback). Reports the decode time, the number of pending timers and the
+number of entries in the event loop's timer heap after all telegrams (cancelled TimerHandles stay in the heap until
+their deadline).
+
+Usage: python scripts/benchmark_timers.py [number of devices, default 10000]
+"""
+
+import asyncio
+import gc
+import sys
+import time
+
+from enocean_async.address import EURID
+from enocean_async.eep.message import EEPMessage, EEPMessageType, EntityValue
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.cover import CoverObserver
+from enocean_async.semantics.observers.push_button import F6_02_01_02PushButtonObserver
+from enocean_async.timing.wheel import TimingWheel
+
+PRESS = {
+    "R1": EntityValue(value="a0"),
+    "EB": EntityValue(value="pressed"),
+    "R2": EntityValue(value="a0"),
+    "SA": EntityValue(value="No 2nd action"),
+}
+
+
+def telegrams(count: int) -> list[tuple[str, EEPMessage]]:
+    messages = []
+    for i in range(count):
+        sender = EURID(0x01000000 + i)
+        if i % 2:
+            messages.append(("button", EEPMessage(sender=sender, values=PRESS)))
+        else:
+            for position in (10, 20, 30):
+                messages.append(
+                    (
+                        "cover",
+                        EEPMessage(
+                            sender=sender,
+                            entities={
+                                Observable.POSITION: EntityValue(
+                                    value=position, unit="%"
+                                )
+                            },
+                            values={"dummy": None},
+                            message_type=EEPMessageType(id=4, description="reply"),
+                        ),
+                    )
+                )
+    return messages
+
+
+async def measure(name: str, messages, timers: TimingWheel | None) -> None:
+    observers = {
+        "button": F6_02_01_02PushButtonObserver(None, None, timers=timers),
+        "cover": CoverObserver(None, None, timers=timers),
+    }
+    loop = asyncio.get_running_loop()
+    gc.collect()
+    start = time.perf_counter()
+    for kind, message in messages:
+        observers[kind].decode(message)
+    elapsed = time.perf_counter() - start
+    heap = len(loop._scheduled)
+    pending = len(timers) if timers is not None else heap
+
+    print(f"{name:<24} {elapsed * 1000:10.1f} ms {pending:10d} {heap:10d}")
+    observers["cover"].stop()
+    for kind in observers:
+        for address in list(observers[kind]._states):
+            observers[kind].forget(address)
+    if timers is not None:
+        timers.close()
+    await asyncio.sleep(0)
+
+
+async def run(count: int) -> None:
+    messages = telegrams(count)
+    print(f"{len(messages)} telegrams from {count} devices")
+    print(f"{'':<24} {'decode':>13} {'timers':>10} {'loop heap':>10}")
+    await measure("loop.call_later()", messages, None)
+    await measure("TimingWheel", messages, TimingWheel())
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    asyncio.run(run(count))
+
+
+if __name__ == "__main__":
+    main()
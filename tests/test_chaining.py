@@ -0,0 +1,103 @@
+"""Tests for chained messages.
+
+Covers:
+- reassembly of a CDM chain (also with segments out of order) into a telegram of the message's RORG
+- a new first telegram with the same sequence number restarts the chain
+- eviction of expired chains and of the oldest chain when max_chains is reached
+- rejection of messages longer than max_bytes
+- parsing of RADIO_MESSAGE packets with payloads longer than a single telegram
+"""
+
+from enocean_async.address import EURID
+from enocean_async.protocol.erp1.chaining import ChainReassembler
+from enocean_async.protocol.erp1.rorg import RORG
+from enocean_async.protocol.erp1.telegram import ERP1Telegram
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+
+MESSAGE = bytes(range(20))
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _chain(sender, sequence: int = 1, message: bytes = MESSAGE) -> list[ERP1Telegram]:
+    """Split a VLD message into CDM telegrams: 8 payload bytes in the first, 9 in every further telegram."""
+    parts = [
+        bytes([sequence << 6])
+        + len(message).to_bytes(2, "big")
+        + bytes([RORG.RORG_VLD])
+        + message[:8]
+    ]
+    for offset in range(8, len(message), 9):
+        parts.append(bytes([sequence << 6 | len(parts)]) + message[offset : offset + 9])
+    return [
+        ERP1Telegram(rorg=RORG.RORG_CDM, telegram_data=part, sender=sender)
+        for part in parts
+    ]
+
+
+def test_reassembly(device_address):
+    chains = ChainReassembler()
+    first, second, third = _chain(device_address)
+    assert chains.add(second) is None
+    assert chains.add(first) is None
+    message = chains.add(third)
+
+    assert message.rorg == RORG.RORG_VLD
+    assert message.telegram_data == MESSAGE
+    assert message.sender == device_address
+    assert (chains.completed, chains.in_flight, chains.buffered_bytes) == (1, 0, 0)
+
+
+def test_new_first_telegram_restarts_the_chain(device_address):
+    chains = ChainReassembler()
+    stale_first, stale_second, _ = _chain(device_address, message=bytes(20))
+    first, second, third = _chain(device_address)
+    chains.add(stale_first)
+    chains.add(stale_second)
+
+    assert chains.add(first) is None
+    assert chains.add(second) is None
+    assert chains.add(third).telegram_data == MESSAGE
+    assert (chains.in_flight, chains.buffered_bytes) == (0, 0)
+
+
+def test_expired_and_evicted_chains(device_address):
+    clock = _Clock()
+    chains = ChainReassembler(max_chains=2, timeout=1.0, clock=clock)
+    chains.add(_chain(device_address, sequence=1)[0])
+    clock.now += 1.5
+    chains.add(_chain(device_address, sequence=2)[0])
+    assert chains.expired == 1 and chains.in_flight == 1
+
+    other = EURID.from_string("01:23:45:68")
+    chains.add(_chain(other, sequence=1)[0])
+    chains.add(_chain(other, sequence=2)[0])
+    assert chains.evicted == 1 and chains.in_flight == 2
+    assert chains.add(_chain(device_address, sequence=2)[1]) is None
+
+
+def test_oversized_message_is_rejected(device_address):
+    chains = ChainReassembler(max_bytes=16)
+    assert chains.add(_chain(device_address)[0]) is None
+    assert chains.rejected == 1 and chains.in_flight == 0
+
+
+def test_radio_message(device_address):
+    optional = bytes([0xFF, 0xFF, 0xFF, 0xFF]) + bytes(device_address.to_bytelist())
+    erp1 = ERP1Telegram.from_esp3(
+        ESP3Packet(
+            ESP3PacketType.RADIO_MESSAGE,
+            bytes([RORG.RORG_VLD]) + MESSAGE,
+            optional + bytes([0x40, 0x00]),
+        )
+    )
+    assert erp1.rorg == RORG.RORG_VLD
+    assert erp1.telegram_data == MESSAGE
+    assert erp1.sender == device_address
+    assert erp1.rssi == 0x40
@@ -0,0 +1,78 @@
+"""Tests for the clocks of the receive path.
+
+Covers:
+- a virtual clock only moves when advanced, and fires the timers of the wheels it drives at their deadline
+- button hold and release timeouts replayed through the gateway with a virtual clock, without waiting in real time
+- reconnect attempts and giving up after max_duration follow the virtual clock
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.reconnect import ReconnectPolicy
+from enocean_async.semantics.observable import Observable
+from enocean_async.timing.clock import VirtualClock
+from enocean_async.timing.wheel import TimingWheel
+
+ROCKER_SWITCH = EEP.from_string("F6-02-01")
+
+
+async def test_virtual_clock_fires_timers_at_their_deadline():
+    clock = VirtualClock(epoch=1000.0)
+    wheel = TimingWheel(resolution=0.1, clock=clock.monotonic)
+    clock.drive(wheel)
+    fired = []
+    wheel.schedule(0.4, lambda: fired.append(clock.monotonic()))
+    wheel.schedule(30.0, lambda: fired.append(clock.monotonic()))
+
+    clock.advance(3600.0)
+    assert clock.monotonic() == 3600.0
+    assert clock.time() == 4600.0
+    assert fired == [pytest.approx(0.4, abs=0.1), pytest.approx(30.0, abs=0.1)]
+
+    with pytest.raises(ValueError):
+        clock.advance(-1.0)
+    wheel.close()
+
+
+async def test_replay_button_timeouts(device_address, make_rps_erp1):
+    clock = VirtualClock(epoch=1000.0)
+    gateway = Gateway("/dev/null", clock=clock)
+    received = []
+    gateway.add_observation_callback(received.append)
+    gateway.add_device(device_address, ROCKER_SWITCH)
+
+    gateway.process_esp3_packet(make_rps_erp1(b"\x30").to_esp3())  # press, no release
+    clock.advance(3600.0)
+    await asyncio.sleep(0.01)
+
+    events = [
+        (o.values[Observable.PUSH_BUTTON], round(o.time_elapsed))
+        for o in received
+        if Observable.PUSH_BUTTON in o.values
+    ]
+    assert events == [("pressed", 0), ("held", 0), ("released", 30)]
+    assert received[0].timestamp == 1000.0
+    gateway.stop()
+
+
+async def test_reconnect_follows_virtual_clock():
+    clock = VirtualClock()
+    gateway = Gateway(
+        "no-such-port",
+        reconnect_policy=ReconnectPolicy(initial_delay=1.0, jitter=0, max_duration=5.0),
+        clock=clock,
+    )
+    gateway.connection_lost(None)
+    await asyncio.sleep(0.05)
+    assert gateway.connection_stats().reconnect_attempts == 0
+
+    # attempts after 1 s and 3 s (backoff 2 s), then after 7 s (backoff 4 s), after which it gives up
+    for seconds, attempts in ((1.0, 1), (2.0, 2), (4.0, 3), (8.0, 3)):
+        clock.advance(seconds)
+        await asyncio.sleep(0.05)  # let the attempt fail (opening the port is real I/O)
+        assert gateway.connection_stats().reconnect_attempts == attempts
+    gateway.stop()
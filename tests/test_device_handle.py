@@ -0,0 +1,74 @@
+"""Tests for DeviceHandle.
+
+Covers:
+- encoded frames are cached per instruction value
+- registry changes invalidate handles; the next send resolves the device again
+- sending through a handle of a removed device fails
+"""
+
+import pytest
+
+from enocean_async.address import BaseAddress
+from enocean_async.device import DeviceHandle, ResolvedDevice
+from enocean_async.eep import EEP_SPECIFICATIONS
+from enocean_async.eep.handler import EEPHandler
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.semantics.instructions.switch import SetSwitchOutput
+from enocean_async.transmit.result import SendResult
+
+RELAY = EEP.from_string("D2-01-00")
+
+
+async def test_frames_are_cached_per_instruction_value(device_address, base_address):
+    spec = EEP_SPECIFICATIONS[RELAY]
+    encoded = []
+    sent = []
+
+    def encoder(command):
+        encoded.append(command)
+        return spec.encoders[command.action](command)
+
+    async def resolve(address):
+        return ResolvedDevice(
+            RELAY,
+            EEPHandler(spec),
+            {SetSwitchOutput.action: encoder},
+            base_address,
+        )
+
+    async def send(packet, priority, coalesce_key, idempotent):
+        sent.append(packet)
+        return SendResult(None, None)
+
+    handle = DeviceHandle(device_address, resolve, send, lambda: 0)
+    for value in (100, 0, 100):
+        await handle.send(SetSwitchOutput(output_value=value))
+
+    assert len(encoded) == 2
+    assert sent[0] is sent[2]
+    assert sent[0].optional[1:5] == bytes(device_address.to_bytelist())
+
+
+async def test_registry_change_invalidates_handle(device_address, base_address):
+    gateway = Gateway("/dev/null")
+    gateway.add_device(device_address, RELAY, sender=base_address)
+    handle = await gateway.device_handle(device_address)
+    assert handle.valid and handle.sender == base_address
+
+    other_sender = BaseAddress(base_address.to_number() + 1)
+    gateway.add_device(device_address, RELAY, sender=other_sender)
+    assert not handle.valid
+
+    await handle.send(SetSwitchOutput(output_value=0))
+    assert handle.valid and handle.sender == other_sender
+
+
+async def test_removed_device_cannot_be_sent_to(device_address, base_address):
+    gateway = Gateway("/dev/null")
+    gateway.add_device(device_address, RELAY, sender=base_address)
+    handle = await gateway.device_handle(device_address)
+    gateway.remove_device(device_address)
+
+    with pytest.raises(ValueError):
+        await handle.send(SetSwitchOutput(output_value=0))
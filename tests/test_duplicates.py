@@ -0,0 +1,110 @@
+"""Tests for RADIO_SUB_TEL parsing and duplicate suppression.
+
+Covers:
+- parsing of timestamp and subtelegrams of RADIO_SUB_TEL packets
+- copies differing only in the repeater count are dropped, keeping the best RSSI
+- a message sent again after a different one, or after the window, is not dropped
+- senders not heard within the window are forgotten
+- the gateway processes a repeated telegram only once, and reports the RSSI of a stronger copy
+"""
+
+import asyncio
+from dataclasses import replace
+
+from enocean_async.address import EURID
+from enocean_async.dedup import DuplicateFilter
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.erp1.telegram import ERP1Telegram, SubTelegram
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.semantics.observable import Observable
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sub_tel_parsing(make_rps_erp1):
+    erp1_packet = make_rps_erp1(b"\x30").to_esp3()
+    optional = erp1_packet.optional[:7] + bytes(
+        [0x12, 0x34, 0x00, 0x50, 0x30, 0x05, 0x48, 0x31]
+    )
+    erp1 = ERP1Telegram.from_esp3(
+        ESP3Packet(ESP3PacketType.RADIO_SUB_TEL, erp1_packet.data, optional)
+    )
+    assert erp1.telegram_data == b"\x30"
+    assert erp1.timestamp == 0x1234
+    assert erp1.sub_telegrams == (
+        SubTelegram(0x00, 0x50, 0x30),
+        SubTelegram(0x05, 0x48, 0x31),
+    )
+
+
+def test_repeated_copies_are_dropped(make_rps_erp1):
+    clock = _Clock()
+    stronger = []
+    duplicates = DuplicateFilter(0.5, clock, stronger.append)
+    original = make_rps_erp1(b"\x30", rssi=0x50)
+    repeated = replace(original, status=original.status | 0x01, rssi=0x40)
+    weaker = replace(original, status=original.status | 0x02, rssi=0x60)
+
+    assert not duplicates.is_duplicate(original)
+    assert duplicates.best_rssi(original.sender) == 0x50
+    clock.now += 0.1
+    assert duplicates.is_duplicate(repeated)
+    assert duplicates.is_duplicate(weaker)
+    assert duplicates.best_rssi(original.sender) == 0x40
+    assert stronger == [repeated]
+    assert (duplicates.received, duplicates.dropped) == (3, 2)
+    clock.now += 0.5
+    assert duplicates.best_rssi(original.sender) is None
+
+
+def test_new_messages_are_kept(make_rps_erp1):
+    clock = _Clock()
+    duplicates = DuplicateFilter(0.5, clock)
+    press, release = make_rps_erp1(b"\x30"), make_rps_erp1(b"\x00")
+
+    assert not duplicates.is_duplicate(press)
+    assert not duplicates.is_duplicate(release)
+    assert not duplicates.is_duplicate(press)
+    clock.now += 0.6
+    assert not duplicates.is_duplicate(press)
+
+
+def test_stale_senders_are_forgotten(make_rps_erp1):
+    clock = _Clock()
+    duplicates = DuplicateFilter(0.5, clock)
+    first = make_rps_erp1(b"\x30")
+    second = replace(first, sender=EURID.from_string("01:02:03:04"))
+    duplicates.is_duplicate(first)
+    clock.now += 0.3
+    duplicates.is_duplicate(second)
+    assert len(duplicates._entries) == 2
+    clock.now += 0.3
+    assert not duplicates.is_duplicate(replace(second, telegram_data=b"\x00"))
+    assert len(duplicates._entries) == 1
+
+
+async def test_gateway_processes_copies_once(device_address, make_4bs_erp1):
+    gateway = Gateway("/dev/null")
+    received = []
+    gateway.add_observation_callback(received.append)
+    gateway.add_device(device_address, EEP.from_string("A5-02-05"))
+
+    telegram = make_4bs_erp1(b"\x00\x00\x80\x08", rssi=0x50)
+    gateway.process_esp3_packet(telegram.to_esp3())
+    gateway.process_esp3_packet(telegram.to_esp3())
+    gateway.process_esp3_packet(replace(telegram, rssi=0x40).to_esp3())
+    await asyncio.sleep(0.01)
+
+    assert len([o for o in received if Observable.TEMPERATURE in o.values]) == 1
+    assert gateway.duplicate_filter.dropped == 2
+    rssi = [o.values[Observable.RSSI] for o in received if Observable.RSSI in o.values]
+    assert rssi == [0x50, 0x40]
+    counts = [o for o in received if Observable.TELEGRAM_COUNT in o.values]
+    assert len(counts) == 1
@@ -0,0 +1,105 @@
+"""Tests for airtime estimation and DutyCycleLimiter.
+
+Covers:
+- airtime estimate grows with telegram length; non-radio packets need no airtime
+- addressed telegrams need more airtime than broadcasts
+- sends within budget are not delayed; sends beyond it wait for the window to slide
+- resync() after a duty-cycle lock scales the estimate up and holds back transmissions
+- the estimate correction decays back without further locks
+"""
+
+import pytest
+
+from enocean_async.address import EURID
+from enocean_async.protocol.erp1.rorg import RORG
+from enocean_async.protocol.erp1.telegram import ERP1Telegram
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.transmit.duty_cycle import DutyCycleLimiter, estimate_airtime
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _erp1(data: bytes, destination=None) -> ESP3Packet:
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_VLD, telegram_data=data, sender=EURID.from_string("01:02:03:04")
+    )
+    if destination is not None:
+        telegram.destination = destination
+    return telegram.to_esp3()
+
+
+def test_airtime_estimate():
+    short = estimate_airtime(_erp1(b"\x01"))
+    long = estimate_airtime(_erp1(b"\x01" * 8))
+    assert 0 < short < long
+    assert (
+        estimate_airtime(ESP3Packet(ESP3PacketType.COMMON_COMMAND, b"\x08", b"")) == 0.0
+    )
+
+
+def test_addressed_telegram_needs_more_airtime(device_address):
+    assert estimate_airtime(_erp1(b"\x01", device_address)) > estimate_airtime(
+        _erp1(b"\x01")
+    )
+
+
+def test_pacing_within_sliding_window():
+    clock = _Clock()
+    packet = _erp1(b"\x01")
+    airtime = estimate_airtime(packet)
+    # budget for exactly three packets per 10 s window
+    limiter = DutyCycleLimiter(duty_cycle=3 * airtime / 10.0, window=10.0, clock=clock)
+
+    for t in (0.0, 1.0, 2.0):
+        clock.now = t
+        assert limiter.delay(packet) == 0.0
+        limiter.record(packet)
+
+    clock.now = 3.0
+    assert limiter.delay(packet) == 7.0  # the first packet leaves the window at t=10
+
+    clock.now = 10.0
+    assert limiter.delay(packet) == 0.0
+
+
+def test_resync_after_lock():
+    clock = _Clock()
+    packet = _erp1(b"\x01")
+    limiter = DutyCycleLimiter(duty_cycle=0.01, window=3600.0, clock=clock)
+    limiter.record(packet)
+    assert limiter.delay(packet) == 0.0
+
+    limiter.resync()
+    assert limiter.locks == 1
+    assert limiter.used > estimate_airtime(packet)
+    assert limiter.delay(packet) == DutyCycleLimiter.LOCK_HOLD
+
+    limiter.resync()
+    assert limiter.delay(packet) == 2 * DutyCycleLimiter.LOCK_HOLD
+
+    clock.now = 10.0
+    assert limiter.delay(packet) == 0.0
+
+
+def test_correction_decays_without_locks():
+    clock = _Clock()
+    limiter = DutyCycleLimiter(duty_cycle=0.01, window=100.0, clock=clock)
+    limiter.resync()
+    assert limiter.scale == DutyCycleLimiter.MAX_SCALE
+
+    clock.now = 50.0
+    assert limiter.scale == pytest.approx(1.0 + (DutyCycleLimiter.MAX_SCALE - 1.0) / 2)
+    limiter.resync()  # another lock raises it again
+    assert limiter.scale == DutyCycleLimiter.MAX_SCALE
+
+    clock.now = 150.0
+    assert limiter.scale == 1.0
+    packet = _erp1(b"\x01")
+    limiter.record(packet)
+    assert limiter.used == pytest.approx(estimate_airtime(packet))
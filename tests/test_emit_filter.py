@@ -0,0 +1,87 @@
+"""Tests for EmitFilter and its use in ScalarObserver.
+
+Covers:
+- first value is always emitted
+- exact repetitions are suppressed by the default filter
+- absolute and relative deadbands
+- minimum emit interval
+- forced heartbeat emission of unchanged values
+- ScalarObserver without a filter emits every telegram
+"""
+
+import asyncio
+
+from enocean_async.eep.message import EEPMessage, EntityValue
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.filter import EmitFilter
+from enocean_async.semantics.observers.scalar import ScalarObserver
+
+
+def _make_msg(sender, temperature: float) -> EEPMessage:
+    return EEPMessage(
+        sender=sender,
+        entities={Observable.TEMPERATURE: EntityValue(value=temperature, unit="°C")},
+    )
+
+
+class TestEmitFilterPolicy:
+    def test_first_value_is_emitted(self):
+        assert EmitFilter().should_emit(21.3, 0.0, None, None)
+
+    def test_repetition_is_suppressed(self):
+        assert not EmitFilter().should_emit(21.3, 10.0, 21.3, 0.0)
+
+    def test_change_is_emitted(self):
+        assert EmitFilter().should_emit(21.4, 10.0, 21.3, 0.0)
+
+    def test_absolute_deadband(self):
+        f = EmitFilter(deadband=0.5)
+        assert not f.should_emit(21.7, 10.0, 21.3, 0.0)
+        assert f.should_emit(21.9, 10.0, 21.3, 0.0)
+
+    def test_relative_deadband(self):
+        f = EmitFilter(relative_deadband=0.1)
+        assert not f.should_emit(105.0, 10.0, 100.0, 0.0)
+        assert f.should_emit(111.0, 10.0, 100.0, 0.0)
+
+    def test_min_interval(self):
+        f = EmitFilter(min_interval=5.0)
+        assert not f.should_emit(30.0, 4.0, 20.0, 0.0)
+        assert f.should_emit(30.0, 5.0, 20.0, 0.0)
+
+    def test_heartbeat_forces_unchanged_value(self):
+        f = EmitFilter(heartbeat=600.0)
+        assert not f.should_emit(21.3, 599.0, 21.3, 0.0)
+        assert f.should_emit(21.3, 600.0, 21.3, 0.0)
+
+    def test_non_numeric_values_compare_by_equality(self):
+        f = EmitFilter(deadband=1.0)
+        assert not f.should_emit("open", 10.0, "open", 0.0)
+        assert f.should_emit("closed", 10.0, "open", 0.0)
+
+
+class TestScalarObserverFiltering:
+    async def test_without_filter_every_telegram_is_emitted(self, device_address):
+        received = []
+        observer = ScalarObserver(
+            device_address=device_address,
+            on_observation=received.append,
+            observable=Observable.TEMPERATURE,
+        )
+        for _ in range(3):
+            observer.decode(_make_msg(device_address, 21.3))
+        await asyncio.sleep(0)
+        assert len(received) == 3
+
+    async def test_filter_suppresses_repetitions(self, device_address):
+        received = []
+        observer = ScalarObserver(
+            device_address=device_address,
+            on_observation=received.append,
+            observable=Observable.TEMPERATURE,
+            emit_filter=EmitFilter(),
+        )
+        for value in (21.3, 21.3, 21.4, 21.4):
+            observer.decode(_make_msg(device_address, value))
+        await asyncio.sleep(0)
+        assert [o.values[Observable.TEMPERATURE] for o in received] == [21.3, 21.4]
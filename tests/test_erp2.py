@@ -0,0 +1,197 @@
+"""Tests for ERP2 telegrams.
+
+Covers:
+- parsing of RADIO_ERP2 packets into ERP1 telegrams (24/32 bit originator, destination, extended header)
+- T21 and NU status bits of RPS telegrams
+- rejection of unsupported address controls and truncated telegrams
+- conversion of RADIO_ERP1 packets to RADIO_ERP2 and back
+- in ERP2 mode, the gateway sends telegrams without ERP2 telegram type as ERP1
+- in ERP2 mode, the duty-cycle budget is paced and charged with the ERP2 airtime
+- on-air size of ERP1 and ERP2 telegrams
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.address import EURID, BaseAddress, BroadcastAddress
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.erp1.rorg import RORG
+from enocean_async.protocol.erp1.telegram import ERP1Telegram
+from enocean_async.protocol.erp2.telegram import (
+    ERP2ParseError,
+    erp2_from_erp1,
+    parse_erp2,
+)
+from enocean_async.protocol.esp3.common_command import RadioMode
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.protocol.esp3.response import ResponseCode
+from enocean_async.transmit.duty_cycle import estimate_airtime, radio_telegram_size
+
+
+def _erp2(data: bytes, optional: bytes = b"\x01\x2d") -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.RADIO_ERP2, data, optional)
+
+
+class _Module:
+    """Fake serial transport recording the written frames and answering each with RET_OK."""
+
+    def __init__(self, gateway: Gateway) -> None:
+        self.gateway = gateway
+        self.frames: list[bytes] = []
+
+    def write(self, frame: bytes) -> None:
+        self.frames.append(frame)
+        response = ESP3Packet(ESP3PacketType.RESPONSE, bytes([ResponseCode.OK]), b"")
+        asyncio.get_running_loop().call_soon(self.gateway.process_esp3_packet, response)
+
+    def close(self) -> None:
+        pass
+
+
+def _erp2_gateway(**kwargs) -> tuple[Gateway, _Module]:
+    """A gateway with a fake module in ERP2 mode."""
+    gateway = Gateway("/dev/null", **kwargs)
+    module = _Module(gateway)
+    gateway._Gateway__transport = module
+    gateway._Gateway__radio_mode = RadioMode.ADVANCED
+    return gateway, module
+
+
+def test_parse_4bs_with_32_bit_originator():
+    erp1 = parse_erp2(_erp2(bytes.fromhex("22 01234567 08284B80")))
+    assert erp1.rorg == RORG.RORG_4BS
+    assert erp1.sender == EURID.from_string("01:23:45:67")
+    assert erp1.telegram_data == bytes.fromhex("08284B80")
+    assert erp1.destination is None
+    assert erp1.sub_tel_num == 1
+    assert erp1.rssi == 0x2D
+
+
+def test_parse_24_bit_originator_and_base_id():
+    erp1 = parse_erp2(_erp2(bytes.fromhex("00 234567 30")))
+    assert erp1.rorg == RORG.RORG_RPS
+    assert erp1.sender == EURID.from_string("00:23:45:67")
+
+    erp1 = parse_erp2(_erp2(bytes.fromhex("20 FF800001 30")))
+    assert erp1.sender == BaseAddress.from_string("FF:80:00:01")
+
+
+@pytest.mark.parametrize(
+    ("data", "status"),
+    [
+        ("30", 0x30),  # button pressed: T21, N-message
+        ("00", 0x20),  # released: T21, U-message
+    ],
+)
+def test_rps_status_bits(device_address, data, status):
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_RPS,
+        telegram_data=bytes.fromhex(data),
+        sender=device_address,
+        status=status,
+    )
+    assert parse_erp2(_erp2(bytes.fromhex("20 01234567" + data))).status == status
+    assert parse_erp2(erp2_from_erp1(telegram.to_esp3())).status == status
+
+
+def test_parse_destination_and_extended_header():
+    # addressed VLD telegram, repeated twice, with one byte of optional data
+    erp1 = parse_erp2(_erp2(bytes.fromhex("54 21 FF800001 0189ABCD 0160 AA")))
+    assert erp1.rorg == RORG.RORG_VLD
+    assert erp1.sender == BaseAddress.from_string("FF:80:00:01")
+    assert erp1.destination == EURID.from_string("01:89:AB:CD")
+    assert erp1.repeater_count == 2
+    assert erp1.telegram_data == bytes.fromhex("0160")
+
+    erp1 = parse_erp2(_erp2(bytes.fromhex("4F 03 01234567 FFFFFFFF 40000F")))
+    assert erp1.rorg == RORG.RORG_CDM
+    assert erp1.destination == BroadcastAddress()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        bytes.fromhex("22"),  # no originator
+        bytes.fromhex("22 01234567"),  # no data
+        bytes.fromhex("62 0123456789AB 08284B80"),  # 48 bit originator
+        bytes.fromhex("27 01234567 08"),  # reserved telegram type
+    ],
+)
+def test_parse_rejects_invalid_telegrams(data):
+    with pytest.raises(ERP2ParseError):
+        parse_erp2(_erp2(data))
+
+
+@pytest.mark.parametrize(
+    "destination",
+    [None, BroadcastAddress(), EURID.from_string("01:89:AB:CD")],
+)
+def test_conversion_round_trip(destination):
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_VLD,
+        telegram_data=bytes.fromhex("0160"),
+        sender=BaseAddress.from_string("FF:80:00:01"),
+        destination=destination,
+    )
+    packet = erp2_from_erp1(telegram.to_esp3())
+    assert packet.packet_type == ESP3PacketType.RADIO_ERP2
+
+    erp1 = parse_erp2(packet)
+    assert erp1.rorg == telegram.rorg
+    assert erp1.telegram_data == telegram.telegram_data
+    assert erp1.sender == telegram.sender
+    if isinstance(destination, EURID):
+        assert erp1.destination == destination
+
+
+def test_conversion_rejects_unsupported_rorg(device_address):
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_ADT_VLD, telegram_data=b"\x00", sender=device_address
+    )
+    with pytest.raises(ValueError):
+        erp2_from_erp1(telegram.to_esp3())
+
+
+async def test_gateway_falls_back_to_erp1(device_address):
+    gateway, module = _erp2_gateway()
+    for rorg in (RORG.RORG_VLD, RORG.RORG_ADT_VLD):
+        telegram = ERP1Telegram(rorg=rorg, telegram_data=b"\x00", sender=device_address)
+        result = await gateway.send_esp3_packet(telegram.to_esp3())
+        assert result.response.return_code == ResponseCode.OK
+
+    # the packet type follows the sync byte and the header (data and optional length)
+    assert [frame[4] for frame in module.frames] == [
+        ESP3PacketType.RADIO_ERP2,
+        ESP3PacketType.RADIO_ERP1,
+    ]
+
+
+async def test_duty_cycle_uses_erp2_airtime(device_address):
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_VLD,
+        telegram_data=bytes.fromhex("0160"),
+        sender=BaseAddress.from_string("FF:80:00:01"),
+        destination=device_address,
+    ).to_esp3()
+    airtime = estimate_airtime(erp2_from_erp1(telegram))
+    assert airtime < estimate_airtime(telegram)
+
+    # the budget fits the ERP2 telegram, but not the ERP1 telegram
+    gateway, _ = _erp2_gateway(duty_cycle=airtime * 1.01 / 3600)
+    await asyncio.wait_for(gateway.send_esp3_packet(telegram), 1.0)
+    assert gateway.duty_cycle.used == pytest.approx(airtime)
+
+
+def test_on_air_size():
+    telegram = ERP1Telegram(
+        rorg=RORG.RORG_VLD,
+        telegram_data=bytes.fromhex("0160"),
+        sender=BaseAddress.from_string("FF:80:00:01"),
+        destination=EURID.from_string("01:89:AB:CD"),
+    )
+    erp1 = telegram.to_esp3()
+    # RORG + data + sender + status + CRC, plus ADT (RORG + destination)
+    assert radio_telegram_size(erp1) == 1 + 2 + 4 + 1 + 1 + 5
+    # length + header + originator + destination + data + CRC
+    assert radio_telegram_size(erp2_from_erp1(erp1)) == 1 + 1 + 4 + 4 + 2 + 1
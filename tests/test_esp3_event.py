@@ -0,0 +1,57 @@
+"""Tests for ESP3 EVENT packets.
+
+Covers:
+- parsing of event code, data and optional data
+- wakeup cause of CO_READY and failure reason of CO_TRANSMIT_FAILED
+- rejection of packets that are not (valid) events
+- SendResult outcome of packets that failed to go out by radio
+"""
+
+import pytest
+
+from enocean_async.protocol.esp3.event import (
+    EventCode,
+    EventTelegram,
+    TransmitFailure,
+    WakeupCause,
+)
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.protocol.esp3.response import ResponseTelegram
+from enocean_async.transmit.result import SendOutcome, SendResult
+
+
+def test_co_ready():
+    event = EventTelegram.from_esp3_packet(
+        ESP3Packet(ESP3PacketType.EVENT, bytes([0x04, 0x02]), b"\x00")
+    )
+    assert event.event_code == EventCode.CO_READY
+    assert event.wakeup_cause == WakeupCause.WATCHDOG
+    assert event.optional_data == b"\x00"
+    assert event.transmit_failure is None
+
+
+def test_transmit_failed():
+    event = EventTelegram.from_esp3_packet(
+        ESP3Packet(ESP3PacketType.EVENT, bytes([0x07, 0x01]), b"")
+    )
+    assert event.event_code == EventCode.CO_TRANSMIT_FAILED
+    assert event.transmit_failure == TransmitFailure.NO_ACK
+    assert event.wakeup_cause is None
+
+
+def test_invalid_events_are_rejected():
+    with pytest.raises(ValueError):
+        EventTelegram.from_esp3_packet(
+            ESP3Packet(ESP3PacketType.RESPONSE, b"\x00", b"")
+        )
+    with pytest.raises(ValueError):
+        EventTelegram.from_esp3_packet(ESP3Packet(ESP3PacketType.EVENT, b"", b""))
+    with pytest.raises(ValueError):
+        EventTelegram.from_esp3_packet(ESP3Packet(ESP3PacketType.EVENT, b"\x7f", b""))
+
+
+def test_send_result_reports_radio_outcome():
+    ok = ResponseTelegram()
+    assert SendResult(ok, 2.0).outcome == SendOutcome.SUCCESS
+    assert SendResult(ok, 2.0, transmitted=True).outcome == SendOutcome.SUCCESS
+    assert SendResult(ok, 2.0, transmitted=False).outcome == SendOutcome.TRANSMIT_FAILED
@@ -0,0 +1,52 @@
+"""Tests for device registration on the Gateway.
+
+Covers:
+- bulk registration via add_devices() (plain tuples and DeviceRegistration)
+- validation of all entries before any device is registered
+- lazy creation of observers on the first telegram of a bulk-registered device
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.device import DeviceRegistration
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.semantics.observable import Observable
+
+TEMPERATURE_SENSOR = EEP.from_string("A5-02-05")
+
+
+def test_add_devices_returns_number_of_supported_devices(device_address, base_address):
+    gateway = Gateway("/dev/null")
+    count = gateway.add_devices(
+        [
+            (device_address, TEMPERATURE_SENSOR),
+            DeviceRegistration(base_address, EEP(0xA5, 0x7F, 0x7F), name="unknown"),
+        ]
+    )
+    assert count == 1
+    assert set(gateway.entities()) == {device_address}
+
+
+def test_add_devices_rejects_invalid_entries(device_address):
+    gateway = Gateway("/dev/null")
+    with pytest.raises(ValueError):
+        gateway.add_devices(
+            [(device_address, TEMPERATURE_SENSOR), ("01:02:03:04", TEMPERATURE_SENSOR)]
+        )
+    assert gateway.entities() == {}
+
+
+async def test_observers_are_created_on_first_telegram(device_address, make_4bs_erp1):
+    gateway = Gateway("/dev/null")
+    received = []
+    gateway.add_observation_callback(received.append)
+    gateway.add_devices([(device_address, TEMPERATURE_SENSOR)])
+
+    gateway.process_esp3_packet(make_4bs_erp1(b"\x00\x00\x80\x08").to_esp3())
+    await asyncio.sleep(0.01)
+
+    temperatures = [o for o in received if Observable.TEMPERATURE in o.values]
+    assert len(temperatures) == 1
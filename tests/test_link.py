@@ -0,0 +1,55 @@
+"""Tests for the serial link statistics and the baud rate command.
+
+Covers:
+- utilisation relative to the link capacity, per direction
+- samples leave the sliding window
+- encoding of CO_SET_BAUDRATE and rejection of unsupported rates
+"""
+
+import pytest
+
+from enocean_async.link import LinkMonitor
+from enocean_async.protocol.esp3.common_command import (
+    CommonCommandCode,
+    CommonCommandTelegram,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_utilisation_per_direction():
+    clock = _Clock()
+    monitor = LinkMonitor(57600, window=10.0, clock=clock)
+    monitor.record_sent(5760)  # 1 s of link capacity at 10 bits per byte
+    monitor.record_received(2880)
+
+    stats = monitor.stats()
+    assert stats.bytes_sent == 5760 and stats.bytes_received == 2880
+    assert stats.tx_utilisation == pytest.approx(0.1)
+    assert stats.rx_utilisation == pytest.approx(0.05)
+
+
+def test_samples_leave_the_window():
+    clock = _Clock()
+    monitor = LinkMonitor(115200, window=10.0, clock=clock)
+    monitor.record_sent(1000)
+    clock.now += 5
+    monitor.record_sent(1000)
+    clock.now += 6
+
+    stats = monitor.stats()
+    assert stats.tx_utilisation == pytest.approx(1000 / 115200)
+    assert stats.bytes_sent == 2000
+
+
+def test_set_baudrate_command():
+    packet = CommonCommandTelegram.CO_SET_BAUDRATE(460800).to_esp3_packet()
+    assert packet.data == bytes([CommonCommandCode.CO_SET_BAUDRATE, 3])
+    with pytest.raises(ValueError):
+        CommonCommandTelegram.CO_SET_BAUDRATE(9600)
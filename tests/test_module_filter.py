@@ -0,0 +1,59 @@
+"""Tests for the ESP3 filter commands.
+
+Covers:
+- encoding of CO_WR_FILTER_ADD / DEL / DEL_ALL / ENABLE and CO_RD_FILTER
+- parsing of the CO_RD_FILTER response
+"""
+
+from enocean_async.protocol.esp3.common_command import (
+    CommonCommandCode,
+    CommonCommandTelegram,
+    FilterKind,
+    FilterOperator,
+    FilterType,
+    parse_filters,
+)
+from enocean_async.protocol.esp3.packet import ESP3PacketType
+
+
+def test_filter_add_and_delete(device_address):
+    number = device_address.to_number()
+    add = CommonCommandTelegram.CO_WR_FILTER_ADD(FilterType.SOURCE_ID, number)
+    packet = add.to_esp3_packet()
+    assert packet.packet_type == ESP3PacketType.COMMON_COMMAND
+    assert packet.data == bytes([CommonCommandCode.CO_WR_FILTER_ADD, 0]) + bytes(
+        device_address.to_bytelist()
+    ) + bytes([FilterKind.APPLY])
+
+    delete = CommonCommandTelegram.CO_WR_FILTER_DEL(FilterType.SOURCE_ID, number)
+    assert delete.to_esp3_packet().data == bytes(
+        [CommonCommandCode.CO_WR_FILTER_DEL, 0]
+    ) + bytes(device_address.to_bytelist())
+
+
+def test_filter_enable_and_delete_all():
+    assert CommonCommandTelegram.CO_WR_FILTER_ENABLE(
+        True, FilterOperator.AND
+    ).to_esp3_packet().data == bytes([CommonCommandCode.CO_WR_FILTER_ENABLE, 1, 1])
+    assert CommonCommandTelegram.CO_WR_FILTER_ENABLE(
+        False
+    ).to_esp3_packet().data == bytes([CommonCommandCode.CO_WR_FILTER_ENABLE, 0, 0])
+    assert CommonCommandTelegram.CO_WR_FILTER_DEL_ALL().to_esp3_packet().data == bytes(
+        [CommonCommandCode.CO_WR_FILTER_DEL_ALL]
+    )
+    assert CommonCommandTelegram.CO_RD_FILTER().to_esp3_packet().data == bytes(
+        [CommonCommandCode.CO_RD_FILTER]
+    )
+
+
+def test_parse_filters(device_address):
+    data = (
+        bytes([FilterType.SOURCE_ID])
+        + bytes(device_address.to_bytelist())
+        + bytes([FilterType.RORG, 0, 0, 0, 0xF6])
+    )
+    assert parse_filters(data) == [
+        (FilterType.SOURCE_ID, device_address.to_number()),
+        (FilterType.RORG, 0xF6),
+    ]
+    assert parse_filters(b"") == []
@@ -0,0 +1,53 @@
+"""Tests for the module information cache.
+
+Covers:
+- round trip of version info, base ID, remaining write cycles and baud rate
+- entries are kept per port
+- missing or foreign files yield no cached information
+"""
+
+from enocean_async.address import EURID, BaseAddress
+from enocean_async.module_info import ModuleInfo, read_module_info, write_module_info
+from enocean_async.protocol.version import VersionIdentifier, VersionInfo
+
+
+def _info(eurid: str, base_id: str) -> ModuleInfo:
+    return ModuleInfo(
+        version=VersionInfo(
+            app_version=VersionIdentifier(2, 11, 1, 0),
+            api_version=VersionIdentifier(2, 6, 3, 0),
+            eurid=EURID.from_string(eurid),
+            device_version=1,
+            app_description="GATEWAYCTRL",
+        ),
+        base_id=BaseAddress.from_string(base_id),
+        base_id_remaining_write_cycles=9,
+        baudrate=230400,
+    )
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "modules.json"
+    info = _info("01:23:45:67", "FF:80:00:00")
+    write_module_info(path, "/dev/ttyUSB0", info)
+    assert read_module_info(path, "/dev/ttyUSB0") == info
+
+
+def test_entries_per_port(tmp_path):
+    path = tmp_path / "modules.json"
+    write_module_info(path, "/dev/ttyUSB0", _info("01:23:45:67", "FF:80:00:00"))
+    write_module_info(path, "/dev/ttyUSB1", _info("01:23:45:68", "FF:80:00:80"))
+    assert read_module_info(path, "/dev/ttyUSB0").eurid == EURID.from_string(
+        "01:23:45:67"
+    )
+    assert read_module_info(path, "/dev/ttyUSB1").base_id == BaseAddress.from_string(
+        "FF:80:00:80"
+    )
+    assert read_module_info(path, "/dev/ttyUSB2") is None
+
+
+def test_missing_or_invalid_file(tmp_path):
+    path = tmp_path / "modules.json"
+    assert read_module_info(path, "/dev/ttyUSB0") is None
+    path.write_text("[1, 2, 3]")
+    assert read_module_info(path, "/dev/ttyUSB0") is None
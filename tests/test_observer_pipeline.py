@@ -0,0 +1,75 @@
+"""Tests for ObserverPipeline.
+
+Covers:
+- scalar observers are only selected when their observable is present
+- observers without declared inputs are selected for every message
+- message-type restrictions (CoverObserver only handles message type 4)
+- observers with several inputs are selected once
+"""
+
+from enocean_async.eep.message import EEPMessage, EEPMessageType, EntityValue
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.cover import CoverObserver
+from enocean_async.semantics.observers.metadata import MetaDataObserver
+from enocean_async.semantics.observers.pipeline import ObserverPipeline
+from enocean_async.semantics.observers.scalar import ScalarObserver
+
+
+def _msg(sender, *observables: Observable, message_type_id: int | None = None):
+    return EEPMessage(
+        sender=sender,
+        entities={o: EntityValue(value=1, unit=None) for o in observables},
+        message_type=EEPMessageType(id=message_type_id, description="")
+        if message_type_id is not None
+        else None,
+    )
+
+
+def _pipeline():
+    metadata = MetaDataObserver(None, None)
+    switch = ScalarObserver(None, observable=Observable.SWITCH_STATE)
+    energy = ScalarObserver(None, observable=Observable.ENERGY)
+    power = ScalarObserver(None, observable=Observable.POWER)
+    cover = CoverObserver(None)
+    return (
+        ObserverPipeline([metadata, switch, energy, power, cover]),
+        metadata,
+        switch,
+        energy,
+        power,
+        cover,
+    )
+
+
+def test_only_observers_of_present_observables_are_selected(device_address):
+    pipeline, metadata, switch, energy, power, _ = _pipeline()
+    assert pipeline.select(_msg(device_address, Observable.SWITCH_STATE)) == [
+        metadata,
+        switch,
+    ]
+    assert pipeline.select(
+        _msg(device_address, Observable.ENERGY, Observable.POWER)
+    ) == [metadata, energy, power]
+
+
+def test_observers_without_inputs_always_selected(device_address):
+    pipeline, metadata, *_ = _pipeline()
+    assert pipeline.select(_msg(device_address)) == [metadata]
+
+
+def test_message_type_restriction(device_address):
+    pipeline, metadata, *_, cover = _pipeline()
+    assert pipeline.select(
+        _msg(device_address, Observable.POSITION, message_type_id=3)
+    ) == [metadata]
+    assert pipeline.select(
+        _msg(device_address, Observable.POSITION, message_type_id=4)
+    ) == [metadata, cover]
+
+
+def test_multi_input_observer_selected_once(device_address):
+    pipeline, metadata, *_, cover = _pipeline()
+    message = _msg(
+        device_address, Observable.POSITION, Observable.ANGLE, message_type_id=4
+    )
+    assert pipeline.select(message) == [metadata, cover]
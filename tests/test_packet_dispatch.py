@@ -0,0 +1,62 @@
+"""Tests for the dispatch of received ESP3 packets by packet type.
+
+Covers:
+- handlers are called per packet type; registering twice requires replace=True
+- received / handled / failed / ignored counters
+- runtime registration of a handler on the gateway
+"""
+
+import pytest
+
+from enocean_async.dispatch import PacketDispatcher
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+
+
+def _packet(packet_type: ESP3PacketType, data: bytes = b"\x00") -> ESP3Packet:
+    return ESP3Packet(packet_type, data, b"")
+
+
+def test_dispatch_and_counters():
+    handled = []
+
+    def handler(packet: ESP3Packet) -> None:
+        if not packet.data:
+            raise ValueError("empty packet")
+        handled.append(packet)
+
+    dispatcher = PacketDispatcher()
+    dispatcher.register(ESP3PacketType.RADIO_SUB_TEL, handler)
+    with pytest.raises(ValueError):
+        dispatcher.register(ESP3PacketType.RADIO_SUB_TEL, handler)
+
+    dispatcher.dispatch(_packet(ESP3PacketType.RADIO_SUB_TEL))
+    dispatcher.dispatch(_packet(ESP3PacketType.RADIO_SUB_TEL, b""))
+    dispatcher.dispatch(_packet(ESP3PacketType.RADIO_ERP2))
+
+    stats = dispatcher.stats()
+    assert len(handled) == 1
+    assert stats.keys() == {ESP3PacketType.RADIO_SUB_TEL, ESP3PacketType.RADIO_ERP2}
+    sub_tel = stats[ESP3PacketType.RADIO_SUB_TEL]
+    assert (sub_tel.received, sub_tel.handled, sub_tel.failed) == (2, 1, 1)
+    assert stats[ESP3PacketType.RADIO_ERP2].ignored == 1
+
+    assert dispatcher.unregister(ESP3PacketType.RADIO_SUB_TEL) is handler
+    dispatcher.dispatch(_packet(ESP3PacketType.RADIO_SUB_TEL))
+    assert dispatcher.stats()[ESP3PacketType.RADIO_SUB_TEL].ignored == 1
+
+
+async def test_gateway_handler_registration():
+    gateway = Gateway("/dev/null")
+    received = []
+    with pytest.raises(ValueError):
+        gateway.register_packet_handler(ESP3PacketType.RADIO_ERP1, received.append)
+
+    gateway.register_packet_handler(ESP3PacketType.REMOTE_MAN_COMMAND, received.append)
+    gateway.process_esp3_packet(_packet(ESP3PacketType.REMOTE_MAN_COMMAND))
+    gateway.process_esp3_packet(_packet(ESP3PacketType.RESPONSE, b"\xff"))
+
+    assert len(received) == 1
+    stats = gateway.packet_stats()
+    assert stats[ESP3PacketType.REMOTE_MAN_COMMAND].handled == 1
+    assert stats[ESP3PacketType.RESPONSE].failed == 1
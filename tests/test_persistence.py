@@ -0,0 +1,88 @@
+"""Tests for state snapshot files.
+
+Covers:
+- round trip of entity state (all supported value kinds, timestamps, addresses)
+- round trip of observer internals (cover, metadata, push button)
+- rejection of files that are not snapshots
+"""
+
+import pytest
+
+from enocean_async.address import BaseAddress
+from enocean_async.persistence import SnapshotFormatError, read_snapshot, write_snapshot
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.cover import CoverObserver
+from enocean_async.semantics.observers.metadata import MetaDataObserver
+from enocean_async.semantics.observers.push_button import F6_02_01_02PushButtonObserver
+from enocean_async.state import StateStore
+
+
+def test_entity_state_round_trip(tmp_path, device_address, base_address):
+    store = StateStore()
+    store.set((device_address, "temperature", Observable.TEMPERATURE), 21.3, 1.0)
+    store.set((device_address, "0", Observable.SWITCH_STATE), "on", 2.0)
+    store.set((device_address, "telegram_count", Observable.TELEGRAM_COUNT), 42, 3.0)
+    store.set((base_address, "motion", Observable.MOTION), True, 4.0)
+    store.set((base_address, "cover", Observable.COVER_STATE), None, 5.0)
+
+    path = tmp_path / "state.bin"
+    write_snapshot(path, store, {})
+
+    restored = StateStore()
+    restored.restore(read_snapshot(path).entities)
+
+    assert restored.snapshot().keys() == store.snapshot().keys()
+    for key, state in store.snapshot().items():
+        restored_state = restored.get(*key)
+        assert restored_state.value == state.value
+        assert type(restored_state.value) is type(state.value)
+        assert restored_state.last_changed == state.last_changed
+    assert isinstance(
+        next(k for k in restored if k[2] == Observable.MOTION)[0], BaseAddress
+    )
+
+
+def test_observer_state_round_trip(tmp_path, device_address):
+    cover = CoverObserver(device_address=device_address)
+    cover._state(device_address).previous_position = 40
+    cover._state(device_address).cover_state = "closing"
+    metadata = MetaDataObserver(device_address, None)
+    metadata._states[device_address] = 17
+    button = F6_02_01_02PushButtonObserver(device_address=device_address)
+    button._state(device_address).pressed["a0"] = 100.0
+    button._state(device_address).held["a0"] = True
+
+    path = tmp_path / "state.bin"
+    write_snapshot(
+        path,
+        None,
+        {
+            device_address: [
+                (type(o).__name__, o.snapshot_state())
+                for o in (metadata, cover, button)
+            ]
+        },
+    )
+
+    states = read_snapshot(path).observers[device_address]
+    restored = (
+        MetaDataObserver(device_address, None),
+        CoverObserver(device_address=device_address),
+        F6_02_01_02PushButtonObserver(device_address=device_address),
+    )
+    for observer, (name, state) in zip(restored, states):
+        assert name == type(observer).__name__
+        observer.restore_state(state)
+
+    assert restored[0]._states[device_address] == 17
+    assert restored[1]._state(device_address).previous_position == 40
+    assert restored[1]._state(device_address).cover_state == "closing"
+    assert restored[2]._state(device_address).pressed == {"a0": 100.0}
+    assert restored[2]._state(device_address).held == {"a0": True}
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "state.bin"
+    path.write_bytes(b"definitely not a snapshot")
+    with pytest.raises(SnapshotFormatError):
+        read_snapshot(path)
@@ -0,0 +1,59 @@
+"""Tests for receive timestamps.
+
+Covers:
+- packets read by the serial protocol carry the time of the read
+- the receive time is passed on to telegrams, EEP messages and observations (whose timestamp it becomes)
+- receive latency histograms per processing stage
+"""
+
+import asyncio
+
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.esp3.protocol import EnOceanSerialProtocol3
+from enocean_async.semantics.observable import Observable
+from enocean_async.timing.clock import VirtualClock
+from enocean_async.timing.latency import ReceiveStage
+
+TEMPERATURE_SENSOR = EEP.from_string("A5-02-05")
+
+
+async def test_receive_time_end_to_end(device_address, make_4bs_erp1):
+    clock = VirtualClock(epoch=1000.0)
+    gateway = Gateway("/dev/null", clock=clock)
+    protocol = EnOceanSerialProtocol3(gateway)
+    packets, telegrams, messages, observations = [], [], [], []
+    gateway.add_esp3_received_callback(packets.append)
+    gateway.add_erp1_received_callback(telegrams.append)
+    gateway.add_eep_message_received_callback(messages.append)
+    gateway.add_observation_callback(observations.append)
+    gateway.add_device(device_address, TEMPERATURE_SENSOR)
+
+    frame = make_4bs_erp1(b"\x00\x00\x80\x08").to_esp3().to_bytes()
+    clock.advance(5.0)
+    protocol.data_received(frame[:4])  # frame completed by the second read
+    clock.advance(1.0)
+    protocol.data_received(frame[4:])
+    clock.advance(1.0)
+    await asyncio.sleep(0.01)
+
+    received = packets[0].received
+    assert received.time == 1006.0
+    assert received.monotonic == 6.0
+    assert telegrams[0].received == received
+    assert messages[0].received == received
+    temperature = next(o for o in observations if Observable.TEMPERATURE in o.values)
+    assert temperature.received == received
+    assert temperature.timestamp == 1006.0
+
+    histograms = gateway.receive_latency.histograms()
+    assert set(histograms) == set(ReceiveStage)
+    assert histograms[ReceiveStage.TELEGRAM].max_ms == 0.0
+    assert histograms[ReceiveStage.OBSERVATION].max_ms == 1000.0
+    gateway.stop()
+
+
+def test_locally_created_packets_have_no_receive_time(make_4bs_erp1):
+    telegram = make_4bs_erp1(b"\x00\x00\x80\x08")
+    assert telegram.received is None
+    assert telegram.to_esp3().received is None
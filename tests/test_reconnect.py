@@ -0,0 +1,135 @@
+"""Tests for reconnecting and sending while disconnected.
+
+Covers:
+- exponential and fixed-interval reconnect delays
+- a paused send queue holds packets and sends them in order on resume
+- packets not sent within their time-to-live expire and leave the queue
+- the gateway's offline buffer is bounded and reports dropped packets
+- packets are not buffered without a pending reconnect, and buffered packets fail when reconnecting gives up
+"""
+
+import asyncio
+
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.reconnect import ReconnectPolicy
+from enocean_async.transmit.result import SendOutcome, SendResult
+from enocean_async.transmit.scheduler import SendScheduler
+
+
+def _packet(n: int) -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.COMMON_COMMAND, bytes([n]), b"")
+
+
+def test_reconnect_delays():
+    policy = ReconnectPolicy(initial_delay=1.0, max_delay=10.0, jitter=0)
+    assert [policy.delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 8.0, 10.0]
+    fixed = ReconnectPolicy(initial_delay=5.0, multiplier=1.0, jitter=0)
+    assert fixed.delay(1) == fixed.delay(100) == 5.0
+
+
+async def test_paused_queue_is_flushed_in_order():
+    sent = []
+
+    async def transmit(packet: ESP3Packet) -> SendResult:
+        sent.append(packet.data[0])
+        return SendResult(None, 1.0)
+
+    scheduler = SendScheduler(transmit)
+    scheduler.pause()
+    futures = [scheduler.submit(_packet(n)) for n in range(3)]
+    await asyncio.sleep(0.01)
+    assert sent == [] and scheduler.depth == 3
+
+    scheduler.resume()
+    await asyncio.gather(*futures)
+    assert sent == [0, 1, 2]
+
+
+async def test_packets_expire_after_ttl():
+    async def transmit(packet: ESP3Packet) -> SendResult:
+        return SendResult(None, 1.0)
+
+    scheduler = SendScheduler(transmit)
+    scheduler.pause()
+    result = await scheduler.submit(_packet(0), ttl=0.01)
+    assert result.outcome == SendOutcome.EXPIRED
+    (result,) = await asyncio.gather(*scheduler.submit_batch([_packet(1)], ttl=0.01))
+    assert result.outcome == SendOutcome.EXPIRED
+
+
+async def test_expired_packets_leave_the_queue():
+    sent = []
+
+    async def transmit(packet: ESP3Packet) -> SendResult:
+        sent.append(packet.data[0])
+        return SendResult(None, 1.0)
+
+    scheduler = SendScheduler(transmit)
+    scheduler.pause()
+    expiring = [
+        scheduler.submit(_packet(0), coalesce_key=("a", 0), ttl=0.01),
+        *scheduler.submit_batch([_packet(1), _packet(2)], ttl=0.01),
+    ]
+    kept = scheduler.submit(_packet(3))
+    assert scheduler.depth == 4
+
+    await asyncio.gather(*expiring)
+    assert scheduler.depth == 1
+
+    # the expired job no longer absorbs packets with its coalesce key
+    scheduler.submit(_packet(4), coalesce_key=("a", 0))
+    scheduler.resume()
+    await kept
+    await asyncio.sleep(0.01)
+    assert sent == [3, 4]
+
+
+async def test_offline_buffer_is_bounded():
+    gateway = Gateway(
+        "/dev/null",
+        reconnect_policy=ReconnectPolicy(initial_delay=10.0),
+        offline_buffer=1,
+        offline_ttl=0.01,
+    )
+    gateway.connection_lost(None)
+
+    results = await asyncio.gather(
+        gateway.send_esp3_packet(_packet(0)), gateway.send_esp3_packet(_packet(1))
+    )
+
+    assert [r.outcome for r in results] == [
+        SendOutcome.EXPIRED,
+        SendOutcome.NOT_CONNECTED,
+    ]
+    stats = gateway.connection_stats()
+    assert (stats.outages, stats.buffered, stats.dropped_expired) == (1, 1, 1)
+    assert stats.dropped_overflow == 1
+    gateway.stop()
+
+
+async def test_no_buffering_without_auto_reconnect():
+    gateway = Gateway("/dev/null", offline_buffer=5)
+    gateway.auto_reconnect = False
+    gateway.connection_lost(None)
+
+    result = await gateway.send_esp3_packet(_packet(0))
+
+    assert result.outcome == SendOutcome.NOT_CONNECTED
+    assert gateway.connection_stats().buffered == 0
+
+
+async def test_buffer_is_dropped_when_reconnect_gives_up():
+    gateway = Gateway(
+        "/dev/null", reconnect_policy=ReconnectPolicy(max_duration=0), offline_buffer=5
+    )
+    gateway.connection_lost(None)
+
+    # queued while the reconnect task is pending, failed once it gives up
+    result = await gateway.send_esp3_packet(_packet(0))
+
+    assert result.outcome == SendOutcome.NOT_CONNECTED
+    assert gateway.connection_stats().buffered == 1
+    result = await gateway.send_esp3_packet(_packet(1))
+    assert result.outcome == SendOutcome.NOT_CONNECTED
+    assert gateway.connection_stats().buffered == 1
@@ -0,0 +1,137 @@
+"""Tests for LatencyTracker.
+
+Covers:
+- latency histogram percentiles
+- the specification's timeout until enough samples were seen
+- adaptive timeout derived from observed latencies, per packet type and command code
+- timeouts and late responses widen the timeout
+- a response arriving after its packet timed out is not taken for the next packet's response
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.protocol.esp3.response import ResponseCode
+from enocean_async.transmit.latency import (
+    SPEC_TIMEOUT,
+    LatencyHistogram,
+    LatencyTracker,
+)
+from enocean_async.transmit.result import SendOutcome
+
+RADIO = ESP3Packet(ESP3PacketType.RADIO_ERP1, b"\xf6\x50\x01\x02\x03\x04\x30", b"")
+READ_VERSION = ESP3Packet(ESP3PacketType.COMMON_COMMAND, b"\x03", b"")
+
+
+def _tracker(latency_ms: float, packet: ESP3Packet = RADIO) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(tracker.min_samples):
+        tracker.record(packet, latency_ms)
+    return tracker
+
+
+def test_histogram_percentile():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    for ms in (3.5, 4.2, 4.8, 7.0, 90.0):
+        histogram.add(ms)
+    assert histogram.percentile(0.5) == 5.0
+    assert histogram.percentile(1.0) == 100.0
+    assert histogram.max_ms == 90.0
+
+
+def test_spec_timeout_until_enough_samples():
+    tracker = LatencyTracker()
+    tracker.record(RADIO, 5.0)
+    assert tracker.timeout(RADIO) == SPEC_TIMEOUT
+
+
+def test_adaptive_timeout_per_packet_type():
+    tracker = _tracker(7.5)
+    assert tracker.timeout(RADIO) == pytest.approx(0.032)
+    assert tracker.timeout(READ_VERSION) == SPEC_TIMEOUT
+    assert _tracker(0.5).timeout(RADIO) == tracker.min_timeout
+
+
+def test_timeouts_widen_the_timeout():
+    tracker = _tracker(7.5)
+    tracker.record_timeout(RADIO)
+    assert tracker.timeout(RADIO) == pytest.approx(0.064)
+    tracker.record(RADIO, 7.5)
+    assert tracker.timeout(RADIO) == pytest.approx(0.032)
+    assert tracker.histograms()[(ESP3PacketType.RADIO_ERP1, None)].timeouts == 1
+
+
+def test_late_response_raises_timeout_to_maximum():
+    tracker = _tracker(7.5)
+    tracker.record_timeout(RADIO)
+    tracker.record_late_response()
+    assert tracker.timeout(RADIO) == SPEC_TIMEOUT
+    assert tracker.late_responses == 1
+
+
+class _Transport:
+    """Fake serial transport recording the written frames."""
+
+    def __init__(self):
+        self.frames: list[bytes] = []
+
+    def write(self, frame: bytes) -> None:
+        self.frames.append(frame)
+
+    def close(self) -> None:
+        pass
+
+
+def _response(code: ResponseCode) -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.RESPONSE, bytes([code]), b"")
+
+
+async def _wait_for_frames(transport: _Transport, count: int) -> None:
+    while len(transport.frames) < count:
+        await asyncio.sleep(0.001)
+
+
+def _gateway(**kwargs) -> tuple[Gateway, _Transport]:
+    """A gateway with a fake transport, whose module has always answered within 5 ms."""
+    gateway = Gateway("/dev/null", **kwargs)
+    transport = _Transport()
+    gateway._Gateway__transport = transport
+    for _ in range(gateway.response_latency.min_samples):
+        gateway.response_latency.record(READ_VERSION, 5.0)
+    return gateway, transport
+
+
+async def test_late_response_is_not_taken_for_the_next():
+    gateway, transport = _gateway(retry_policy=None)
+
+    first = await gateway.send_esp3_packet(READ_VERSION)
+    assert first.outcome == SendOutcome.TIMEOUT
+
+    # the next packet is held back until the late response arrived
+    second = asyncio.create_task(gateway.send_esp3_packet(READ_VERSION))
+    await asyncio.sleep(0.01)
+    assert len(transport.frames) == 1
+    gateway.process_esp3_packet(_response(ResponseCode.NOT_SUPPORTED))
+    await _wait_for_frames(transport, 2)
+    gateway.process_esp3_packet(_response(ResponseCode.OK))
+
+    assert (await second).response.return_code == ResponseCode.OK
+    assert gateway.response_latency.late_responses == 1
+
+
+async def test_lost_response_does_not_discard_the_next():
+    gateway, transport = _gateway()
+
+    sending = asyncio.create_task(gateway.send_esp3_packet(READ_VERSION))
+    # the response to the first attempt is lost; the retry is written once the module can no longer answer it
+    await _wait_for_frames(transport, 2)
+    gateway.process_esp3_packet(_response(ResponseCode.OK))
+
+    result = await sending
+    assert result.response.return_code == ResponseCode.OK
+    assert result.attempts == 2
+    assert gateway.response_latency.late_responses == 0
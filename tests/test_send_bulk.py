@@ -0,0 +1,74 @@
+"""Tests for sending one command to many devices.
+
+Covers:
+- a batch keeps its place in the queue, but higher-priority packets may be sent in between
+- Gateway.send_commands_bulk() validates all targets before anything is sent
+- per-target results when not connected
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.address import EURID
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.semantics.instructions.switch import SetSwitchOutput
+from enocean_async.transmit.result import SendOutcome, SendResult
+from enocean_async.transmit.scheduler import SendPriority, SendScheduler
+
+RELAY = EEP.from_string("D2-01-00")
+
+
+def _packet(n: int) -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.COMMON_COMMAND, bytes([n]), b"")
+
+
+async def test_batch_is_sent_in_order_and_yields_to_higher_priority():
+    sent: list[int] = []
+    scheduler: SendScheduler
+
+    async def transmit(packet: ESP3Packet) -> SendResult:
+        sent.append(packet.data[0])
+        if packet.data[0] == 1:
+            scheduler.submit(_packet(9), SendPriority.TEACH_IN)
+        await asyncio.sleep(0)
+        return SendResult(None, 1.0)
+
+    scheduler = SendScheduler(transmit)
+    futures = scheduler.submit_batch([_packet(n) for n in range(4)])
+    scheduler.submit(_packet(8), SendPriority.COMMAND)
+    assert scheduler.stats()[SendPriority.COMMAND].depth == 5
+
+    await asyncio.gather(*futures)
+    await asyncio.sleep(0.01)
+    assert sent == [0, 1, 9, 2, 3, 8]
+
+
+async def test_bulk_validates_all_targets_first(device_address, base_address):
+    gateway = Gateway("/dev/null")
+    gateway.add_device(device_address, RELAY, sender=base_address)
+    with pytest.raises(ValueError):
+        await gateway.send_commands_bulk(
+            [device_address, EURID.from_string("AA:BB:CC:DD")],
+            SetSwitchOutput(output_value=0),
+        )
+
+
+async def test_bulk_reports_result_per_target(base_address):
+    gateway = Gateway("/dev/null")
+    targets = [EURID(n) for n in range(1, 4)]
+    gateway.add_devices((target, RELAY, base_address) for target in targets)
+    streamed = []
+
+    result = await gateway.send_commands_bulk(
+        targets + targets[:1],
+        SetSwitchOutput(output_value=0),
+        on_result=lambda target, r: streamed.append(target),
+    )
+
+    assert list(result.results) == targets
+    assert streamed == targets
+    assert (result.succeeded, result.failed) == (0, 3)
+    assert all(r.outcome == SendOutcome.NOT_CONNECTED for r in result.results.values())
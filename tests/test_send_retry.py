@@ -0,0 +1,71 @@
+"""Tests for retries in SendScheduler.
+
+Covers:
+- transient error responses are retried until the packet succeeds
+- timeouts are only retried for idempotent packets
+- an exhausted retry budget returns the last error
+- idempotency of dimming instructions
+"""
+
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.protocol.esp3.response import ResponseCode, ResponseTelegram
+from enocean_async.semantics.instructions.dimmer import Dim
+from enocean_async.transmit.result import SendOutcome, SendResult
+from enocean_async.transmit.retry import TIMEOUT, RetryPolicy
+from enocean_async.transmit.scheduler import SendPriority, SendScheduler
+
+_POLICY = RetryPolicy(base_delay=0)
+
+
+def _packet() -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.COMMON_COMMAND, b"\x08", b"")
+
+
+class _Module:
+    """Fake transmit function answering with the given sequence (None = timeout)."""
+
+    def __init__(self, *answers: ResponseCode | None):
+        self.answers = list(answers)
+        self.attempts = 0
+
+    async def transmit(self, packet: ESP3Packet) -> SendResult:
+        code = self.answers[min(self.attempts, len(self.answers) - 1)]
+        self.attempts += 1
+        if code is None:
+            raise TimeoutError
+        return SendResult(ResponseTelegram(code), 1.0)
+
+
+async def test_error_response_is_retried():
+    module = _Module(ResponseCode.NO_FREE_BUFFER, ResponseCode.OK)
+    scheduler = SendScheduler(module.transmit, retry_policy=_POLICY)
+    result = await scheduler.submit(_packet())
+    assert (result.attempts, result.outcome) == (2, SendOutcome.SUCCESS)
+    assert scheduler.stats()[SendPriority.COMMAND].retried == 1
+
+
+async def test_timeout_retried_only_if_idempotent():
+    module = _Module(None, ResponseCode.OK)
+    scheduler = SendScheduler(module.transmit, retry_policy=_POLICY)
+    result = await scheduler.submit(_packet(), idempotent=False)
+    assert (result.attempts, result.outcome) == (1, SendOutcome.TIMEOUT)
+
+    module = _Module(None, ResponseCode.OK)
+    scheduler = SendScheduler(module.transmit, retry_policy=_POLICY)
+    result = await scheduler.submit(_packet())
+    assert (result.attempts, result.outcome) == (2, SendOutcome.SUCCESS)
+
+
+async def test_exhausted_budget_returns_last_error():
+    module = _Module(ResponseCode.DUTY_CYCLE_LOCK)
+    policy = RetryPolicy(retries={ResponseCode.DUTY_CYCLE_LOCK: 2, TIMEOUT: 0})
+    scheduler = SendScheduler(module.transmit, retry_policy=policy)
+    result = await scheduler.submit(_packet())
+    assert result.attempts == 3
+    assert result.outcome == SendOutcome.REJECTED
+    assert result.response.return_code == ResponseCode.DUTY_CYCLE_LOCK
+
+
+def test_relative_dimming_is_not_idempotent():
+    assert Dim(dim_value=50).idempotent
+    assert not Dim(dim_value=10, relative=True).idempotent
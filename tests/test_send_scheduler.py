@@ -0,0 +1,113 @@
+"""Tests for SendScheduler.
+
+Covers:
+- packets are sent one at a time, highest priority first
+- queued packets with the same coalesce key are superseded by the newest one
+- a packet with a different key for the same target, or a non-idempotent packet, acts as a coalescing barrier
+- per-class queue statistics
+- close() fails queued packets and the packet being sent
+"""
+
+import asyncio
+
+import pytest
+
+from enocean_async.protocol.esp3.packet import ESP3Packet, ESP3PacketType
+from enocean_async.transmit.result import SendResult
+from enocean_async.transmit.scheduler import SendPriority, SendScheduler
+
+
+def _packet(n: int) -> ESP3Packet:
+    return ESP3Packet(ESP3PacketType.COMMON_COMMAND, bytes([n]), b"")
+
+
+class _Module:
+    """Fake transmit function recording the sent packets; blocks until released."""
+
+    def __init__(self):
+        self.sent: list[int] = []
+        self.release = asyncio.Event()
+
+    async def transmit(self, packet: ESP3Packet) -> SendResult:
+        await self.release.wait()
+        self.sent.append(packet.data[0])
+        return SendResult(None, 1.0)
+
+
+async def test_priority_order():
+    module = _Module()
+    scheduler = SendScheduler(module.transmit)
+    futures = [scheduler.submit(_packet(0), SendPriority.COMMAND)]
+    await asyncio.sleep(0)  # packet 0 is now being transmitted
+    futures += [
+        scheduler.submit(_packet(1), SendPriority.POLLING),
+        scheduler.submit(_packet(2), SendPriority.COMMAND),
+        scheduler.submit(_packet(3), SendPriority.TEACH_IN),
+    ]
+    module.release.set()
+    await asyncio.gather(*futures)
+    assert module.sent == [0, 3, 2, 1]
+
+
+async def test_coalescing_sends_only_newest():
+    module = _Module()
+    scheduler = SendScheduler(module.transmit)
+    key = ("dev", "cover", "set_cover_position")
+    blocker = scheduler.submit(_packet(0))
+    await asyncio.sleep(0)
+    futures = [scheduler.submit(_packet(n), coalesce_key=key) for n in (1, 2, 3)]
+    module.release.set()
+    results = await asyncio.gather(blocker, *futures)
+
+    assert module.sent == [0, 3]
+    assert results[1] is results[3]
+    stats = scheduler.stats()[SendPriority.COMMAND]
+    assert (stats.sent, stats.coalesced, stats.depth) == (2, 2, 0)
+
+
+async def test_other_action_is_a_coalescing_barrier():
+    module = _Module()
+    scheduler = SendScheduler(module.transmit)
+    position = ("dev", "cover", "set_cover_position")
+    stop = ("dev", "cover", "stop_cover")
+    blocker = scheduler.submit(_packet(0))
+    await asyncio.sleep(0)
+    futures = [
+        scheduler.submit(_packet(1), coalesce_key=position),
+        scheduler.submit(_packet(2), coalesce_key=stop),
+        scheduler.submit(_packet(3), coalesce_key=position),
+    ]
+    module.release.set()
+    await asyncio.gather(blocker, *futures)
+    assert module.sent == [0, 1, 2, 3]
+
+
+async def test_non_idempotent_packet_is_a_coalescing_barrier():
+    module = _Module()
+    scheduler = SendScheduler(module.transmit)
+    dim = ("dev", "light", "dim")
+    blocker = scheduler.submit(_packet(0))
+    await asyncio.sleep(0)
+    futures = [
+        scheduler.submit(_packet(1), coalesce_key=dim),  # absolute
+        scheduler.submit(_packet(2), coalesce_key=dim, idempotent=False),  # relative
+        scheduler.submit(_packet(3), coalesce_key=dim, idempotent=False),
+        scheduler.submit(_packet(4), coalesce_key=dim),
+        scheduler.submit(_packet(5), coalesce_key=dim),
+    ]
+    module.release.set()
+    await asyncio.gather(blocker, *futures)
+    assert module.sent == [0, 1, 2, 3, 5]
+
+
+async def test_close_fails_queued_packets():
+    module = _Module()
+    scheduler = SendScheduler(module.transmit)
+    in_flight = scheduler.submit(_packet(0))
+    await asyncio.sleep(0)
+    queued = scheduler.submit(_packet(1))
+    scheduler.close()
+    with pytest.raises(ConnectionError):
+        await queued
+    with pytest.raises(ConnectionError):
+        await in_flight
@@ -0,0 +1,62 @@
+"""Tests for SenderIdAllocator.
+
+Covers:
+- allocation of the lowest unused offset, skipping reserved offsets
+- stable assignment per device and reverse lookup
+- claiming specific sender IDs, conflicts and release
+- senders of registered devices are marked as used by the gateway
+"""
+
+import pytest
+
+from enocean_async.address import EURID, BaseAddress
+from enocean_async.eep.id import EEP
+from enocean_async.gateway import Gateway
+from enocean_async.sender import BASE_ID_RANGE, SenderIdAllocator
+
+
+def test_allocates_lowest_unused_offset(base_address):
+    allocator = SenderIdAllocator(base_address)
+    first = allocator.allocate(EURID(1))
+    assert first == BaseAddress(base_address.to_number() + 1)
+    assert allocator.allocate(EURID(1)) == first
+    assert allocator.allocate(EURID(2)) == BaseAddress(base_address.to_number() + 2)
+    assert allocator.owner(first) == EURID(1)
+    assert allocator.owner(base_address) is None
+
+
+def test_claim_and_release(base_address):
+    allocator = SenderIdAllocator(base_address)
+    sender = BaseAddress(base_address.to_number() + 1)
+    allocator.claim(EURID(1), sender)
+    with pytest.raises(ValueError):
+        allocator.claim(EURID(2), sender)
+    with pytest.raises(ValueError):
+        allocator.claim(EURID(2), BaseAddress(base_address.to_number() + 200))
+
+    assert allocator.allocate(EURID(2)) == BaseAddress(base_address.to_number() + 2)
+    assert allocator.release(EURID(1)) == sender
+    assert allocator.allocate(EURID(3)) == sender
+    assert len(allocator) == 2
+
+
+def test_exhausted_range(base_address):
+    allocator = SenderIdAllocator(base_address)
+    for n in range(1, BASE_ID_RANGE):
+        allocator.allocate(EURID(n))
+    with pytest.raises(ValueError):
+        allocator.allocate(EURID(BASE_ID_RANGE))
+
+
+async def test_gateway_marks_registered_senders_as_used(device_address, base_address):
+    gateway = Gateway("/dev/null")
+    gateway._Gateway__base_id = base_address  # as if read from the module
+    sender = BaseAddress(base_address.to_number() + 1)
+    gateway.add_device(device_address, EEP.from_string("D2-05-00"), sender=sender)
+
+    allocator = await gateway.sender_allocator
+    assert allocator.owner(sender) == device_address
+    assert allocator.allocate(EURID(1)) != sender
+
+    gateway.remove_device(device_address)
+    assert allocator.owner(sender) is None
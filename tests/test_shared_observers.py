@@ -0,0 +1,100 @@
+"""Tests for observers shared between devices (device_address=None).
+
+Covers:
+- per-device state of a shared observer is kept separately per sender
+- emitted observations carry the sender's address
+- per-device emit filters on a shared ScalarObserver
+- forget() drops the state of a single device
+- the gateway shares one observer list between all devices of an EEP
+"""
+
+import asyncio
+
+from enocean_async.address import EURID
+from enocean_async.eep.id import EEP
+from enocean_async.eep.message import EEPMessage, EEPMessageType, EntityValue
+from enocean_async.gateway import Gateway
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.cover import CoverObserver
+from enocean_async.semantics.observers.filter import EmitFilter
+from enocean_async.semantics.observers.metadata import MetaDataObserver
+from enocean_async.semantics.observers.scalar import ScalarObserver
+
+OTHER = EURID.from_string("AA:BB:CC:DD")
+
+
+def _cover_msg(sender, position: int) -> EEPMessage:
+    return EEPMessage(
+        sender=sender,
+        entities={Observable.POSITION: EntityValue(value=position, unit="%")},
+        values={"dummy": None},
+        message_type=EEPMessageType(id=4, description="reply"),
+    )
+
+
+def _temperature_msg(sender, temperature: float) -> EEPMessage:
+    return EEPMessage(
+        sender=sender,
+        entities={Observable.TEMPERATURE: EntityValue(value=temperature, unit="°C")},
+    )
+
+
+async def test_shared_cover_observer_tracks_devices_separately(device_address):
+    received = []
+    observer = CoverObserver(device_address=None, on_observation=received.append)
+
+    observer.decode(_cover_msg(device_address, 50))
+    observer.decode(_cover_msg(OTHER, 20))
+    observer.decode(_cover_msg(device_address, 60))
+    observer.decode(_cover_msg(OTHER, 10))
+    await asyncio.sleep(0)
+
+    states = {
+        (o.device_id, o.values.get(Observable.COVER_STATE))
+        for o in received
+        if Observable.COVER_STATE in o.values
+    }
+    assert states == {(device_address, "closing"), (OTHER, "opening")}
+    observer.stop()
+
+
+async def test_shared_metadata_observer_counts_per_device(device_address):
+    received = []
+    observer = MetaDataObserver(None, received.append)
+    for sender in (device_address, OTHER, device_address):
+        observer.decode(EEPMessage(sender=sender))
+    await asyncio.sleep(0)
+
+    assert observer.snapshot_state(device_address) == {"telegram_count": 2}
+    assert observer.snapshot_state(OTHER) == {"telegram_count": 1}
+
+    observer.forget(OTHER)
+    assert observer.snapshot_state(OTHER) is None
+
+
+async def test_per_device_emit_filter(device_address):
+    received = []
+    observer = ScalarObserver(
+        device_address=None,
+        on_observation=received.append,
+        observable=Observable.TEMPERATURE,
+    )
+    observer.set_device_emit_filter(device_address, EmitFilter())
+
+    for sender in (device_address, device_address, OTHER, OTHER):
+        observer.decode(_temperature_msg(sender, 21.3))
+    await asyncio.sleep(0)
+
+    assert [o.device_id for o in received] == [device_address, OTHER, OTHER]
+
+
+def test_gateway_shares_observers_per_eep(device_address):
+    gateway = Gateway("/dev/null")
+    received = []
+    gateway.add_observation_callback(received.append)
+    eep = EEP.from_string("A5-02-05")
+    gateway.add_device(device_address, eep)
+    gateway.add_device(OTHER, eep)
+
+    first, second = (gateway._Gateway__devices[a] for a in (device_address, OTHER))
+    assert first.capabilities is second.capabilities
@@ -0,0 +1,87 @@
+"""Tests for StateStore.
+
+Covers:
+- point lookups after updates from Observations (multi-value observations)
+- last_changed vs. last_updated timestamps
+- full snapshots
+- change-sequence numbers and changed_since()
+- removal of all state of a device
+"""
+
+from enocean_async.address import EURID
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observation import Observation
+from enocean_async.state import StateStore
+
+
+def _obs(device, entity_id, values, timestamp) -> Observation:
+    return Observation(
+        device_id=device, entity_id=entity_id, values=values, timestamp=timestamp
+    )
+
+
+def test_lookup_after_update(device_address):
+    store = StateStore()
+    store.update(
+        _obs(
+            device_address,
+            "cover",
+            {Observable.POSITION: 75, Observable.ANGLE: 0},
+            1.0,
+        )
+    )
+    state = store.get(device_address, "cover", Observable.POSITION)
+    assert state.value == 75
+    assert state.unit == "%"
+    assert store.get(device_address, "cover", Observable.ANGLE).value == 0
+    assert store.get(device_address, "cover", Observable.COVER_STATE) is None
+    assert len(store) == 2
+
+
+def test_last_changed_only_moves_on_change(device_address):
+    store = StateStore()
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.3}, 1))
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.3}, 2))
+    state = store.get(device_address, "temperature", Observable.TEMPERATURE)
+    assert (state.last_changed, state.last_updated) == (1, 2)
+
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.5}, 3))
+    state = store.get(device_address, "temperature", Observable.TEMPERATURE)
+    assert (state.last_changed, state.last_updated) == (3, 3)
+
+
+def test_snapshot(device_address):
+    store = StateStore()
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.3}, 1))
+    store.update(_obs(device_address, "humidity", {Observable.HUMIDITY: 40.0}, 2))
+    snapshot = store.snapshot()
+    assert snapshot[(device_address, "humidity", Observable.HUMIDITY)].value == 40.0
+    assert len(snapshot) == 2
+
+
+def test_changed_since(device_address):
+    store = StateStore()
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.3}, 1))
+    store.update(_obs(device_address, "humidity", {Observable.HUMIDITY: 40.0}, 2))
+    checkpoint = store.sequence
+
+    assert store.changed_since(checkpoint) == {}
+
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.4}, 3))
+    changed = store.changed_since(checkpoint)
+    assert list(changed) == [(device_address, "temperature", Observable.TEMPERATURE)]
+    assert len(store.changed_since(0)) == 2
+
+
+def test_remove_device(device_address):
+    other = EURID.from_string("AA:BB:CC:DD")
+    store = StateStore()
+    store.update(_obs(device_address, "temperature", {Observable.TEMPERATURE: 21.3}, 1))
+    store.update(_obs(other, "temperature", {Observable.TEMPERATURE: 18.0}, 1))
+    store.update(_obs(device_address, "humidity", {Observable.HUMIDITY: 40.0}, 1))
+
+    store.remove_device(device_address)
+
+    assert len(store) == 1
+    assert store.get(other, "temperature", Observable.TEMPERATURE).value == 18.0
+    assert store.get(device_address, "temperature", Observable.TEMPERATURE) is None
@@ -0,0 +1,125 @@
+"""Tests for the timing wheel driving observer timers.
+
+Covers:
+- timers fire in deadline order, never early and at most one resolution late
+- cancelled timers do not fire, also when cancelled by an earlier timer due at the same time
+- deadlines beyond one turn of the wheel, and jumps over several turns
+- the loop callback fires timers in real time and stops when no timer is pending
+- the cover watchdog of an observer runs on the wheel
+"""
+
+import asyncio
+
+from enocean_async.eep.message import EEPMessage, EEPMessageType, EntityValue
+from enocean_async.semantics.observable import Observable
+from enocean_async.semantics.observers.cover import (
+    COVER_WATCHDOG_TIMEOUT,
+    CoverObserver,
+)
+from enocean_async.timing.wheel import TimingWheel
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_fires_in_deadline_order():
+    clock = _Clock()
+    wheel = TimingWheel(resolution=0.1, slots=8, clock=clock)
+    fired = []
+    wheel.schedule(0.35, fired.append, "b")
+    wheel.schedule(0.3, fired.append, "a")
+    wheel.schedule(1.0, fired.append, "c")
+    assert len(wheel) == 3
+
+    clock.now = 0.3
+    assert (
+        wheel.advance() == 0
+    )  # never early: 0.3 is only due in the slot ending at 0.4
+    clock.now = 0.4
+    assert wheel.advance() == 2
+    assert fired == ["a", "b"]
+    clock.now = 1.0
+    wheel.advance()
+    assert fired == ["a", "b", "c"]
+    assert len(wheel) == 0
+    wheel.close()
+
+
+async def test_cancel():
+    clock = _Clock()
+    wheel = TimingWheel(resolution=0.1, slots=8, clock=clock)
+    fired = []
+    first = wheel.schedule(0.2, fired.append, "first")
+    second = wheel.schedule(0.25, fired.append, "second")
+    first.cancel()
+    first.cancel()
+    assert first.cancelled()
+    assert len(wheel) == 1
+
+    # a timer cancelled by another timer due in the same advance() does not fire
+    wheel.schedule(0.22, second.cancel)
+    clock.now = 1.0
+    wheel.advance()
+    assert fired == []
+    assert second.cancelled()
+    wheel.close()
+
+
+async def test_long_deadlines_and_jumps():
+    clock = _Clock()
+    wheel = TimingWheel(resolution=0.1, slots=8, clock=clock)
+    fired = []
+    wheel.schedule(30.0, fired.append, "release")
+    wheel.schedule(0.4, fired.append, "hold")
+
+    clock.now = 0.5
+    wheel.advance()
+    assert fired == ["hold"]
+    clock.now = 29.0
+    wheel.advance()
+    assert fired == ["hold"]
+    clock.now = 100.0
+    wheel.advance()
+    assert fired == ["hold", "release"]
+    wheel.close()
+
+
+async def test_loop_callback():
+    wheel = TimingWheel(resolution=0.01)
+    fired = asyncio.Event()
+    wheel.schedule(0.02, fired.set)
+    await asyncio.wait_for(fired.wait(), 1.0)
+    assert len(wheel) == 0
+    assert wheel.fired == 1
+    await asyncio.sleep(0.03)  # the loop callback stops once nothing is pending
+    wheel.close()
+
+
+async def test_cover_watchdog_on_wheel(device_address):
+    clock = _Clock()
+    wheel = TimingWheel(resolution=0.1, clock=clock)
+    received = []
+    observer = CoverObserver(None, received.append, timers=wheel)
+
+    for position in (30, 50):
+        observer.decode(
+            EEPMessage(
+                sender=device_address,
+                entities={Observable.POSITION: EntityValue(value=position, unit="%")},
+                values={"dummy": None},
+                message_type=EEPMessageType(id=4, description="reply"),
+            )
+        )
+    assert len(wheel) == 1
+
+    clock.now = COVER_WATCHDOG_TIMEOUT + 0.1
+    wheel.advance()
+    await asyncio.sleep(0)
+    assert received[-1].values == {Observable.COVER_STATE: "stopped"}
+    assert len(wheel) == 0
+    wheel.close()